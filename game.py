@@ -1,15 +1,71 @@
 import threading
 import tkinter as tk
 import os
-from time import sleep
+from time import sleep, perf_counter
 import sys
 
 import modules.level as level
 import modules.sprite as sprite
 import modules.entity as entity
+import modules.profiler as profiler
+import modules.clock as clock
+import modules.replay as replay
+import modules.trace as trace
+import modules.memory as memory
+import modules.work_queue as work_queue
 
 tkinter_thread_id_counter = 1 # only modified internally, do not change
 
+class LevelsDict (dict):
+    """
+    Levels of the game by their file's name.
+    A level's file is imported and its level object created the first time it is accessed, the game loads the
+    remaining ones in a background thread once the first frame is shown.
+    """
+
+    def __init__(self, game_instance: object) -> None:
+        super().__init__()
+
+        self.game_instance = game_instance
+        self.lock = threading.RLock() # a level can access another one while being initialized
+
+    def add_level_file(self, file_name: str) -> None:
+        """Declares a level file (in the levels folder), without importing it."""
+
+        super().__setitem__(file_name, None)
+
+    def __getitem__(self, file_name: str) -> object:
+        level_object = super().__getitem__(file_name)
+        if not level_object is None: return level_object
+
+        with self.lock:
+            level_object = super().__getitem__(file_name)
+            if level_object is None:
+                with profiler.section("import", file_name):
+                    level_imported = __import__(file_name)
+
+                with profiler.section("level_init", file_name):
+                    level_object = level_imported.CLevel(self.game_instance)
+
+                super().__setitem__(file_name, level_object)
+
+        return level_object
+
+    def get(self, file_name: str, default: object = None) -> object:
+        return self[file_name] if file_name in self else default
+
+    def values(self) -> list:
+        return [self[file_name] for file_name in self]
+
+    def items(self) -> list:
+        return [(file_name, self[file_name]) for file_name in self]
+
+    def load_all(self) -> None:
+        """Imports every level that hasn't been accessed yet."""
+
+        for file_name in list(self):
+            self[file_name]
+
 class Game:
     """
     Parent class of the game instance.
@@ -46,15 +102,39 @@ class Game:
         self.frame_size = frame_size
 
         self.current_level = None
+        self.loading_level = None # level being prepared in the background, if one
         self.is_running = True
         self.is_ingame = False
 
-        self.internal_tk_exec_queue = []
+        self.recorder = None # Recorder of the session, if it is recorded (see modules/replay.py)
+        self.replayer = None # Replayer of the session being replayed, if one
+        self.quit_after_replay = False
+        self.replay_summary = None # frame stats of the last replay
+
+        self.trace_path = None # file in which the trace is exported, if traced (see modules/trace.py)
+        self.long_frame_threshold = None
+        self.trace_export_thread = None
+
+        self.level_change_memory = None # tracemalloc differences of the last level change (see modules/memory.py)
+
+        # idle mode: on the menus, the tkinter thread waits for a queued function or a tkinter event instead of
+        # running a frame every 50 ms (see self.wait_for_work)
+        self.idle_mode = True
+        self.idle_poll_interval = 0.05 # time in seconds between checks of the queued functions, if they can't wake the thread
+        self.is_waiting = False # if the tkinter thread is waiting for work
+        self.wake_event = threading.Event()
+        self.wake_pipe = None # (read, write) file descriptors of the pipe waking tkinter's event wait, if supported
+
+        # functions executed in the tkinter thread, by priority class (see modules/work_queue.py)
+        self.internal_tk_exec_queue = work_queue.WorkQueue("input", self.wake)
         self.internal_tk_exec_queue_availible = False
 
-        self.internal_tk_exec_queue_postprocess = []
+        # executed after the functions of the same priority of the other queues
+        self.internal_tk_exec_queue_postprocess = work_queue.WorkQueue("render", self.wake)
         self.internal_tk_exec_queue_postprocess_availible = False
 
+        self.frame_budget = 0.03 # time in seconds given to the queued functions at each frame, except the "input" ones
+
         self.tkinter_thread_id = tkinter_thread_id_counter
         self.tkinter_render_thread = threading.Thread(name = "game_instance_{}_tkinter_thread".format(tkinter_thread_id_counter), target = self.update_frame)
         tkinter_thread_id_counter += 1
@@ -64,8 +144,8 @@ class Game:
 
         while self.temp_stop: sleep(0.001) # waits for the tkinter thread to initialize before proceiding
 
-        # imports the levels
-        self.levels = {}
+        # finds the levels, they are imported on first access (see LevelsDict)
+        self.levels = LevelsDict(self)
 
         sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/levels") # allows import from the levels folder
         for file_data in os.listdir("levels/"):
@@ -79,9 +159,7 @@ class Game:
 
             # levels are identified in the dict by their file's name, because two files
             # can't have the same name (= uniqueness constraint)
-            level_imported = __import__(file_name)
-            level_object = level_imported.CLevel(self)
-            self.levels[file_name] = level_object 
+            self.levels.add_level_file(file_name)
 
     def __init__(self) -> None:
         """
@@ -94,15 +172,19 @@ class Game:
         self.draw_menu()
 
 
-    def queue_function(self, function: object) -> None:
-        """Executes a function inside of the tkinter thread (internal queue)."""
+    def queue_function(self, function: object, priority: str = "input") -> None:
+        """
+        Executes a function inside of the tkinter thread (internal queue).
 
-        self.internal_tk_exec_queue += [function]
+        priority: str, priority class of the function (see modules/work_queue.py)
+        """
+
+        self.internal_tk_exec_queue.add(function, priority)
 
-    def queue_function_postprocess(self, function: object) -> None:
-        """Executes a function inside of the tkinter thread (internal postprocess queue)."""
+    def queue_function_postprocess(self, function: object, priority: str = "render") -> None:
+        """Executes a function inside of the tkinter thread (internal postprocess queue), after the sprites' updates."""
 
-        self.internal_tk_exec_queue_postprocess += [function]
+        self.internal_tk_exec_queue_postprocess.add(function, priority)
 
 
     def create_menu_canvas(self, name: str, x: int, y: int, width: int, height: int) -> object:
@@ -121,6 +203,10 @@ class Game:
             canvas = level.LevelCanvas(self.frame, width, height)
             canvas.place(x = x, y = y, anchor = "nw")
 
+            canvas.name = name # target of the recorded events
+            canvas.menu_position = (x, y) # used by self.show_menu_canvas
+            canvas.is_menu_shown = True
+
             return canvas
         
         if not threading.get_ident() == self.tkinter_render_thread.ident: # if this func is not executed inside of the tkinter thread
@@ -151,6 +237,42 @@ class Game:
         else:
             return False
 
+    def show_menu_canvas(self, name: str) -> bool:
+        """
+        Shows a menu canvas hidden by self.hide_menu_canvas, on top of the other widgets.
+        Its items are kept while it's hidden, so showing it again doesn't recreate anything.
+
+        returns: if the canvas exists (a menu has to be built the first time)
+        """
+
+        if not name in self.menu_objects: return False
+
+        canvas = self.menu_objects[name]
+        if canvas.is_menu_shown: return True
+        canvas.is_menu_shown = True
+
+        def show_canvas(): # ghost func
+            canvas.place(x = canvas.menu_position[0], y = canvas.menu_position[1], anchor = "nw")
+            canvas.lift()
+
+        self.queue_function(show_canvas)
+
+        return True
+
+    def hide_menu_canvas(self, name: str) -> None:
+        """Hides a menu canvas (with all of its items) without destroying it."""
+
+        if not name in self.menu_objects: return
+
+        canvas = self.menu_objects[name]
+        if not canvas.is_menu_shown: return
+        canvas.is_menu_shown = False
+
+        self.queue_function(canvas.place_forget)
+
+    def is_menu_canvas_shown(self, name: str) -> bool:
+        return name in self.menu_objects and self.menu_objects[name].is_menu_shown
+
     def assign_menu_widget_queued(self, name: str, function: object) -> None:
         """
         Executed in the tkinter main thread. Assigns self.menu_objects[name] to what's returned by the given function.
@@ -194,6 +316,16 @@ class Game:
 
         pass
 
+    def on_shutdown(self) -> None:
+        """
+        Overridable function.
+
+        Executed in the tkinter thread once the game loop has stopped, before the window is destroyed: stops the
+        game's own workers (processes, executors...).
+        """
+
+        pass
+
 
     def add_bind(self, command: str, callback) -> bool:
         """
@@ -212,10 +344,127 @@ class Game:
         if command in self.binds: return False
         
         self.binds[command] = callback
-        self.frame.bind(command, callback)
+        self.frame.bind(command, lambda event: self.window_event_handler(event, command))
 
         return True
 
+    def window_event_handler(self, event: object, command: str) -> None:
+        """Internal function, calls the bind of the window (and records the event if the session is recorded)."""
+
+        replay.record_event("window", command, event)
+
+        if command in self.binds: self.binds[command](event)
+
+    def dispatch_event(self, target: str, command: str, event: object) -> None:
+        """Internal function, gives a replayed event to its target: "window", "level" or the name of a menu canvas."""
+
+        if target == "window":
+            if command in self.binds: self.binds[command](event)
+            return
+
+        if target == "level": canvas = None if self.current_level is None else self.current_level.frame
+        else: canvas = self.menu_objects.get(target)
+
+        if not canvas is None and command in canvas.binds: canvas.event_handler(event, command)
+
+
+    def start_recording(self, path: str) -> None:
+        """
+        Starts recording the session (input events and frames durations) in the given file, see modules/replay.py.
+        Has to be called at the same point of the game as the replays (usually right after self.initialize).
+        """
+
+        replay.reset_ids()
+
+        self.recorder = replay.Recorder(path, self.frame_size)
+        replay.current_recorder = self.recorder
+
+    def stop_recording(self) -> dict:
+        """Stops the recording, returns the frame stats of the session."""
+
+        if self.recorder is None: return None
+
+        recorder = self.recorder
+        self.recorder = None
+        replay.current_recorder = None
+
+        recorder.close()
+
+        return recorder.stats.get_summary()
+
+    def start_replay(self, path: str, quit_after: bool = False) -> None:
+        """
+        Replays a recorded session: the frames use the recorded durations (virtual clock) and aren't paced,
+        the recorded events are given back to their targets.
+
+        quit_after: bool, if the game stops at the end of the replay (benchmark runs)
+        """
+
+        replay.reset_ids()
+
+        self.replayer = replay.Replayer(path)
+        self.quit_after_replay = quit_after
+
+        clock.set_clock(self.replayer.clock)
+
+    def start_trace(self, path: str, long_frame_threshold: float = None, buffer_size: int = trace.default_buffer_size) -> None:
+        """
+        Starts tracing the frames and the threads' activity (see modules/trace.py), the trace is exported in the given
+        file when stop_trace is called or when the game stops.
+
+        long_frame_threshold: float, duration in seconds, if given the trace is also exported after each frame
+        longer than it (the buffer then contains the last events before the long frame)
+        buffer_size: int, max number of events kept
+        """
+
+        self.trace_path = path
+        self.long_frame_threshold = long_frame_threshold
+
+        trace.start(buffer_size)
+
+    def stop_trace(self) -> None:
+        """Stops tracing and exports the trace."""
+
+        if self.trace_path is None: return
+
+        trace.stop()
+        trace.export(self.trace_path)
+
+        self.trace_path = None
+
+    def export_long_frame_trace(self, frame_duration: float) -> None:
+        """Internal function, exports the trace from another thread after a long frame."""
+
+        trace.instant("long frame", "frame", {"frame": self.frames_counter, "duration_ms": frame_duration * 1000})
+
+        if not self.trace_export_thread is None and self.trace_export_thread.is_alive(): return # still exporting
+
+        self.trace_export_thread = threading.Thread(target = trace.export, args = (self.trace_path,), name = "trace_export", daemon = True)
+        self.trace_export_thread.start()
+
+    def get_memory_report(self, include_canvases: bool = False) -> dict:
+        """Returns the memory report of the game (see modules/memory.py), include_canvases requires the tkinter thread."""
+
+        return memory.get_report(self, include_canvases)
+
+    def print_memory_report(self) -> None:
+        """Prints the memory report, computed in the tkinter thread to count the canvases' items."""
+
+        self.queue_function(lambda: print(memory.format_report(memory.get_report(self, True))), "background")
+
+    def stop_replay(self) -> None:
+        """Stops the replay, its frame stats are kept in self.replay_summary."""
+
+        if self.replayer is None: return
+
+        self.replay_summary = self.replayer.stats.get_summary()
+        self.replayer = None
+
+        clock.set_clock(clock.RealClock())
+
+        if self.debug or self.quit_after_replay: print("Replay finished: {}".format(self.replay_summary))
+        if self.quit_after_replay: self.is_running = False
+
     def remove_bind(self, command: str) -> bool:
         """
         Removes a bind from the main window.
@@ -244,8 +493,8 @@ class Game:
 
         tkinter_thread_id = self.tkinter_thread_id # used to avoid constant repetitions
 
-        level.funcs_exec_queue[tkinter_thread_id] = []
-        sprite.funcs_exec_queue[self.tkinter_thread_id] = []
+        level.funcs_exec_queue[tkinter_thread_id] = work_queue.WorkQueue("render", self.wake)
+        sprite.funcs_exec_queue[self.tkinter_thread_id] = work_queue.WorkQueue("render", self.wake)
 
 
         self.frame = tk.Tk()
@@ -256,49 +505,40 @@ class Game:
         self.frame.geometry("{}x{}".format(x, y))
         self.frame.resizable(width = False, height = False)
 
+        self.create_wake_pipe()
+
         self.temp_stop = False
         
-        def exec_queue(queues_original: list, debug_names: list):
-            """Executes each function of the given queue."""
-            queues = []
-            for element in queues_original:
-                queues += [element.copy()]
-
-            tot_count = 0
-            for queue_index in range(len(queues)):
-                queue = queues[queue_index]
-
-                func_index = -1 # ensures that even if the queue is empty the var will still be initialized
-                #try:
-                for func_index in range(len(queue)):
-                    if self.debug: print(queue[func_index])
-
-                    queue[func_index]()
+        if self.debug: print("TKinter thread {} initialized, starting requests execution.\n".format(self.tkinter_render_thread.ident))
 
-                #except:
-                #    print("////////// Error during last frame ({}), queue exited prematurely.".format(self.frames_counter))
+        self.frames_counter = 0
+        self.frame_time = perf_counter() # start time of the current frame, in seconds
+        self.frame_dt = 0 # time elapsed since the previous frame, in seconds
+        first_frame_shown = False # if a frame with the menu or a level has been shown
+        while self.is_running and bool(self.frame.winfo_exists()):
+            self.frames_counter += 1
+            if self.debug: has_executed = False
 
-                if func_index != -1:
-                    # ensures that unexecuted functions will be pushed back in the queue may triggers errors but it at least
-                    # ensures that the program won't instantly crash at the first encountered error tho it isn't a reason to
-                    # intentionnaly make some
-                    for _ in range(func_index + 1):
-                        queues_original[queue_index].pop(0)
+            new_frame_time = perf_counter()
+            self.frame_dt = new_frame_time - self.frame_time
+            self.frame_time = new_frame_time
 
-                    tot_count += func_index + 1
+            replayer = self.replayer
+            replayed_events = []
+            if not replayer is None: # the recorded duration replaces the measured one
+                replayed_frame = replayer.next_frame()
 
-                    if self.debug: print("End of {} queue ({} requests executed).".format(debug_names[queue_index], func_index + 1))
+                if replayed_frame is None: self.stop_replay()
+                else: self.frame_dt, replayed_events = replayed_frame
 
-            if self.debug and tot_count != 0:
-                print("Finished executing frame {}, {} requests executed.\n".format(self.frames_counter, tot_count))
+            recorder = self.recorder
+            if not recorder is None: recorder.begin_frame(self.frame_dt)
 
+            # ---------- logic tick ----------
 
-        if self.debug: print("TKinter thread {} initialized, starting requests execution.\n".format(self.tkinter_render_thread.ident))
-
-        self.frames_counter = 0
-        while self.is_running and bool(self.frame.winfo_exists()):
-            self.frames_counter += 1
-            if self.debug: has_executed = False
+            current_level = self.current_level # the level can be changed by another thread during the frame
+            if self.is_ingame and not current_level is None:
+                with trace.span("tick", "frame"): current_level.tick(self.frame_dt)
 
             # ---------- queues executions ----------
 
@@ -309,40 +549,226 @@ class Game:
                 self.internal_tk_exec_queue_postprocess
             ]
 
-            exec_queue(requests, ["internal execution", "sprites", "levels", "internal postprocess"])
+            if trace.enabled: trace.counter("queued functions", {priority: sum(queue.count(priority) for queue in requests) for priority in work_queue.priorities})
 
-            self.frame.update()
-            sleep(0.05)
+            executed_count = work_queue.execute(requests, self.frame_budget, self.debug)
+
+            if self.debug and executed_count != 0:
+                print("Finished executing frame {}, {} requests executed.\n".format(self.frames_counter, executed_count))
+
+            for target, command, event in replayed_events: # given back at the point where tkinter handled them
+                self.dispatch_event(target, command, event)
+
+            with trace.span("tkinter update", "frame"): self.frame.update() # redraw and input events
+
+            if trace.enabled:
+                frame_end = perf_counter()
+                trace.complete("frame", "frame", new_frame_time, frame_end, {"frame": self.frames_counter})
+
+                if not self.long_frame_threshold is None and frame_end - new_frame_time > self.long_frame_threshold:
+                    self.export_long_frame_trace(frame_end - new_frame_time)
+
+            if not recorder is None:
+                recorder.end_frame()
+                recorder.stats.add(perf_counter() - new_frame_time)
+            elif not replayer is None:
+                replayer.stats.add(perf_counter() - new_frame_time)
+
+            if self.frames_counter == 1: profiler.mark("window shown")
+
+            if not first_frame_shown and (len(self.menu_objects) != 0 or self.is_ingame): # time to first frame, see modules/profiler.py
+                first_frame_shown = True
+                profiler.mark("first frame")
+                if self.debug: profiler.print_report()
+
+                if self.replayer is None: # replays import the levels when they're accessed, at the same frames
+                    threading.Thread(target = self.levels.load_all, name = "levels_loading", daemon = True).start()
+
+            if not self.replayer is None: continue # replays aren't paced
+
+            if not (self.idle_mode and self.is_idle() and self.wait_for_work(requests)): sleep(0.05)
+
+        self.is_running = False # the window may have been closed, stops the threads waiting for the tkinter thread
+
+        self.stop_trace()
+        self.close_wake_pipe()
+
+        summary = self.stop_recording()
+        if self.debug and not summary is None: print("Recording finished: {}".format(summary))
 
         if not self.current_level is None: self.current_level.destroy()
 
+        self.on_shutdown()
+
         self.frame.destroy()
 
 
-    def change_level(self, new_level_filename: str) -> bool:
+    def create_wake_pipe(self) -> None:
+        """
+        Internal function, creates the pipe used to wake tkinter's event wait when a function is queued (Unix only,
+        tkinter's file handlers don't exist on Windows: the idle thread then checks the events periodically).
+        """
+
+        if os.name == "nt" or not hasattr(self.frame.tk, "createfilehandler"): return
+
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False) # wake is called by any thread, it never blocks
+
+        def drain_wake_pipe(fd, mask): # ghost func
+            try: os.read(read_fd, 4096)
+            except BlockingIOError: pass
+
+        try:
+            self.frame.tk.createfilehandler(read_fd, tk.READABLE, drain_wake_pipe)
+        except (RuntimeError, tk.TclError): # not supported by this build of tkinter
+            os.close(read_fd)
+            os.close(write_fd)
+            return
+
+        self.wake_pipe = (read_fd, write_fd)
+
+    def close_wake_pipe(self) -> None:
+        """Internal function, removes the wake pipe."""
+
+        if self.wake_pipe is None: return
+
+        read_fd, write_fd = self.wake_pipe
+        self.wake_pipe = None
+
+        self.frame.tk.deletefilehandler(read_fd)
+        os.close(read_fd)
+        os.close(write_fd)
+
+    def wake(self) -> None:
+        """Wakes the tkinter thread if it's waiting for work, called when a function is queued."""
+
+        if not self.is_waiting: return
+        self.is_waiting = False # the following calls don't write in the pipe again
+
+        self.wake_event.set()
+
+        wake_pipe = self.wake_pipe
+        if not wake_pipe is None:
+            try: os.write(wake_pipe[1], b"\0")
+            except OSError: pass # pipe full or closed, the thread is awake anyway
+
+    def is_idle(self) -> bool:
+        """Returns if the game can wait for work between frames: on the menus, no level loading and no replay."""
+
+        return not self.is_ingame and self.loading_level is None and self.replayer is None
+
+    def wait_for_work(self, queues: list) -> bool:
+        """
+        Internal function, blocks the tkinter thread until a function is queued, a tkinter event (input, timer)
+        arrives or the window is closed.
+
+        returns: False if there was work left (functions delayed by the frame budget), without waiting
+        """
+
+        self.wake_event.clear()
+        self.is_waiting = True # set before checking the queues, a function queued after the check wakes the thread
+
+        if any(len(queue) != 0 for queue in queues) or not self.is_running:
+            self.is_waiting = False
+            return False
+
+        with trace.span("idle", "frame"):
+            if self.wake_pipe is None: self.wait_for_event()
+            else: self.frame.tk.dooneevent(0) # returns once an event has been handled, including the wake pipe's
+
+        self.is_waiting = False
+
+        return True
+
+    def wait_for_event(self) -> None:
+        """
+        Internal function of wait_for_work without the wake pipe: tkinter's event wait is interrupted by a timer to
+        check the queued functions, without running a frame. Returns once a tkinter event (other than the timer) has
+        been handled or a function has been queued.
+        """
+
+        poll_interval = int(self.idle_poll_interval * 1000)
+
+        while not self.wake_event.is_set() and self.is_running:
+            timer_fired = []
+            timer = self.frame.after(poll_interval, lambda: timer_fired.append(True))
+
+            self.frame.tk.dooneevent(0) # handles one event (input, window closed, ...) or the timer
+
+            if timer_fired: continue
+
+            self.frame.after_cancel(timer)
+            return
+
+    def change_level(self, new_level_filename: str, background: bool = True) -> bool:
         """
         Changes the current level.
-        If a level is ongoing, destroys it, otherwise destroys the main menu.
+        The new level is prepared (assets decoding) and created off-screen in a background thread while the current
+        level or menu keeps running, then both are swapped in a single frame. If a level is ongoing, destroys it,
+        otherwise destroys the main menu.
 
         new_level_filename: str, name of the new level's file
+        background: bool, if False the level is prepared and created in the calling thread (always the case while
+        a session is replayed: the level is then created in the same frame as in the recording)
 
-        returns: if the level was created
+        returns: if the level's loading has started
         """
         if not new_level_filename in self.levels:
             if self.debug: print("Level \"{}\" not found.".format(new_level_filename))
             return False
 
-        if self.is_ingame: self.exit_level()
-        else: self.exit_menu()
+        if not self.loading_level is None:
+            if self.debug: print("Level \"{}\" is already loading.".format(self.loading_level.name))
+            return False
 
-        self.is_ingame = True
+        new_level = self.levels[new_level_filename]
+        self.loading_level = new_level
+
+        snapshot_before = memory.take_snapshot() # None unless tracemalloc is tracing (see memory.start_tracking)
 
         if self.debug: print("Changing level to {}....".format(new_level_filename))
 
-        self.current_level = self.levels[new_level_filename]
-        self.current_level.create()
+        def swap_levels(): # ghost func, executed in the tkinter thread once the new level's items are created
+            if self.is_ingame: self.exit_level()
+            else: self.exit_menu()
+
+            new_level.show_render_frame()
+
+            self.current_level = new_level
+            self.is_ingame = True
+            self.loading_level = None
+
+            if self.debug: print("Level created succesfully.")
+
+            if not snapshot_before is None: # allocations of the new level minus the ones freed with the previous one
+                self.level_change_memory = memory.compare_snapshots(snapshot_before, memory.take_snapshot())
+                if self.debug: print("Memory allocated by the level change:\n" + "\n".join(self.level_change_memory))
+
+        def load_level(): # ghost func
+            try:
+                new_level.prepare()
+
+                new_level.offscreen_creation = True
+                new_level.create()
+
+            except Exception as exception: # the current level/menu keeps running, another level can be loaded
+                print("Level \"{}\" couldn't be loaded: {}: {}".format(new_level_filename, type(exception).__name__, exception))
+
+                try: new_level.destroy() # removes what was created before the error
+                except Exception: pass
+
+                self.loading_level = None
+                return
+
+            # postprocess: executed after the sprites queued during the creation in the same frame
+            self.queue_function_postprocess(swap_levels, "load")
+
+        if background and self.replayer is None:
+            threading.Thread(name = "level_loading_{}".format(new_level_filename), target = load_level, daemon = True).start()
+        else:
+            load_level()
 
-        if self.debug: print("Level created succesfully.")
         return True
 
     def exit_level(self)-> bool:
@@ -1,24 +1,36 @@
-from PIL import Image, ImageDraw, ImageOps, ImageFont
+import hashlib
+import os
+from functools import lru_cache
+from PIL import Image
+
+from modules import assets, files, profiler
+from modules.text import draw_text
 
 
 main_buttons_font = ("levels/images/menu/pixelart.TTF", 175)
 settings_buttons_font = ("levels/images/menu/pixelart.TTF", 100)
 
-main_button_img_idle_base = Image.open("levels/images/menu/button_main_idle.png").resize((1000, 400))
-main_button_img_hover_base = Image.open("levels/images/menu/button_main_hover.png").resize((1000, 400))
+buttons_cache_path = "infold/data/cache/buttons" # rendered buttons, the folder is created when the first one is written
+buttons_cache_version = 2 # increment it when the rendering changes, invalidates the buttons written on the disk
+
+button_idle_texture = "levels/images/menu/button_main_idle.png"
+button_hover_texture = "levels/images/menu/button_main_hover.png"
+
+main_button_img_idle_base = assets.LazyImage(button_idle_texture, (1000, 400))
+main_button_img_hover_base = assets.LazyImage(button_hover_texture, (1000, 400))
 
-settings_button_img_idle_base = Image.open("levels/images/menu/button_main_idle.png").resize((1000, 200))
-settings_button_img_hover_base = Image.open("levels/images/menu/button_main_hover.png").resize((1000, 200))
+settings_button_img_idle_base = assets.LazyImage(button_idle_texture, (1000, 200))
+settings_button_img_hover_base = assets.LazyImage(button_hover_texture, (1000, 200))
 
-menu_models = { # preloads all the models
-    "background": {"images": {"main": Image.open("levels/images/menu/background.png")}, "sequences": {}},
-    "banner": {"images": {"main": Image.open("levels/images/menu/banner.png")}, "sequences": {}},
-    "cross": {"images": {"main": Image.open("levels/images/menu/croix.png")}, "sequences": {}},
-    "gear": {"images": {"main": Image.open("levels/images/menu/engrenage.png")}, "sequences": {}},
+menu_models = { # images are loaded on first use (see modules/assets.py)
+    "background": {"images": {"main": assets.LazyImage("levels/images/menu/background.png", (504, 504))}, "sequences": {}},
+    "banner": {"images": {"main": assets.LazyImage("levels/images/menu/banner.png", (500, 150))}, "sequences": {}},
+    "cross": {"images": {"main": assets.LazyImage("levels/images/menu/croix.png")}, "sequences": {}},
+    "gear": {"images": {"main": assets.LazyImage("levels/images/menu/engrenage.png")}, "sequences": {}},
 
     "flags": {
-        "EN": {"images": {"main": Image.open("levels/images/menu/flags/EN.png")}, "sequences": {}},
-        "FR": {"images": {"main": Image.open("levels/images/menu/flags/FR.png")}, "sequences": {}},
+        "EN": {"images": {"main": assets.LazyImage("levels/images/menu/flags/EN.png")}, "sequences": {}},
+        "FR": {"images": {"main": assets.LazyImage("levels/images/menu/flags/FR.png")}, "sequences": {}},
     }
 }
 
@@ -30,6 +42,13 @@ def generate_filled_image(width: int, height: int, fill: tuple):
     return Image.new("RGBA", (width, height), fill)
 
 
+@lru_cache(maxsize = None)
+def get_file_hash(path: str) -> str:
+    """Returns the hash of a file's content (fonts and textures used by the rendered buttons)."""
+
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
 def generate_text_image(image: object, text: str, x: int, y: int, font: tuple, color: tuple):
     """
     Generates a text on the given image.
@@ -44,7 +63,6 @@ def generate_text_image(image: object, text: str, x: int, y: int, font: tuple, c
 
     im_w, im_h = image.size
     im_w, im_h = im_w * 1.1, im_h * 1.2 # gives us some wiggle room for texts sizes 
-    image_draw = ImageDraw.Draw(image)
 
     size = font[1]
     if size * len(text) > im_w:
@@ -52,78 +70,94 @@ def generate_text_image(image: object, text: str, x: int, y: int, font: tuple, c
     if size > im_h:
         size = im_h * 0.8
 
-    font = ImageFont.truetype(font[0], int(size))
-    _, _, w, h = image_draw.textbbox((0, 0), text, font = font)
-    image_draw.text((x - w/2, y - h/2), text, font = font, fill = color)
+    draw_text(image, text, x, y, (font[0], int(size)), color) # rendered with the glyph atlas (see modules/text.py)
+
+# buttons of the menus: model name -> (text entry, base images (idle, hover), texture size, text y, font)
+menu_buttons = {
+    "play": ("play", (main_button_img_idle_base, main_button_img_hover_base), (1000, 400), 180, main_buttons_font),
+    "levels": ("levels", (main_button_img_idle_base, main_button_img_hover_base), (1000, 400), 180, main_buttons_font),
+    "pseudonyme": ("username", (settings_button_img_idle_base, settings_button_img_hover_base), (1000, 200), 90, settings_buttons_font),
+    "reset_progression": ("reset_progression", (settings_button_img_idle_base, settings_button_img_hover_base), (1000, 200), 90, settings_buttons_font),
+    "all_access": ("all_access", (settings_button_img_idle_base, settings_button_img_hover_base), (1000, 200), 90, settings_buttons_font)
+}
+button_text_color = (220, 220, 220)
+
+rendered_buttons = {} # rendered buttons' cache key -> PIL image, shared by the languages using the same text
+language_models = {} # language -> buttons' models of the language
+
+def get_button_cache_key(text: str, texture: str, texture_size: tuple, y: int, font: tuple) -> str:
+    """Returns the key of a rendered button, depends on everything used to render it (including the files' content)."""
+
+    data = repr((buttons_cache_version, get_file_hash(texture), texture_size, get_file_hash(font[0]), font[1], text, y, button_text_color))
+
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+def render_button(base_image: object, texture: str, text: str, texture_size: tuple, y: int, font: tuple) -> object:
+    """
+    Returns the image of a button with its text, from the memory/disk cache if it has already been rendered.
+
+    base_image: Image, image of the button without text
+    texture: str, path of the base image's file
+    text: str
+    texture_size: tuple of 2 ints, size of the base image
+    y: int, y coordinate of the text's center
+    font: tuple, containing a path to the ttf file and its size
+    """
+
+    key = get_button_cache_key(text, texture, texture_size, y, font)
+    if key in rendered_buttons: return rendered_buttons[key]
+
+    path = os.path.join(buttons_cache_path, key + ".png")
 
-def generate_menu_models(texts: dict):
+    try:
+        image = Image.open(path)
+        image.load()
+
+    except (OSError, ValueError): # not rendered yet, or unreadable file
+        with profiler.section("asset", "menu buttons rendering"):
+            image = base_image.copy()
+            generate_text_image(image, text, texture_size[0] // 2, y, font, button_text_color)
+
+        try:
+            os.makedirs(buttons_cache_path, exist_ok = True)
+
+            files.write_atomically(path, lambda file: image.save(file, "PNG"), binary = True)
+
+        except OSError: pass # the cache is optional, the button is rendered again next time
+
+    rendered_buttons[key] = image
+
+    return image
+
+def generate_menu_models(texts: dict, language: str = None):
     """
     Updates the menu_models dict buttons by replacing their texts with the corresponding game language.
+    The buttons of each language are generated once, the rendered images are also cached on the disk
+    (in buttons_cache_path) so that they aren't rendered again at the next startup.
+
+    language: str, key of the language's models in the memory cache, the models aren't kept if None
     """
     global menu_models
-    global main_buttons_font, main_button_img_idle_base, main_button_img_hover_base
-    global settings_buttons_font, settings_button_img_idle_base, settings_button_img_hover_base
-
-    # ----- main menu buttons -----
-    main_button_play_idle = main_button_img_idle_base.copy()
-    generate_text_image(main_button_play_idle, texts["play"], 500, 180, main_buttons_font, (220, 220, 220))
-    main_button_play_hover = main_button_img_hover_base.copy()
-    generate_text_image(main_button_play_hover, texts["play"], 500, 180, main_buttons_font, (220, 220, 220))
-
-    main_button_levels_idle = main_button_img_idle_base.copy()
-    generate_text_image(main_button_levels_idle, texts["levels"], 500, 180, main_buttons_font, (220, 220, 220))
-    main_button_levels_hover = main_button_img_hover_base.copy()
-    generate_text_image(main_button_levels_hover, texts["levels"], 500, 180, main_buttons_font, (220, 220, 220))
-
-    # ----- settings button -----
-    settings_button_username_idle = settings_button_img_idle_base.copy()
-    generate_text_image(settings_button_username_idle, texts["username"], 500, 90, settings_buttons_font, (220, 220, 220))
-    settings_button_username_hover = settings_button_img_hover_base.copy()
-    generate_text_image(settings_button_username_hover, texts["username"], 500, 90, settings_buttons_font, (220, 220, 220))
-
-    settings_button_reset_progression_idle = settings_button_img_idle_base.copy()
-    generate_text_image(settings_button_reset_progression_idle, texts["reset_progression"], 500, 90, settings_buttons_font, (220, 220, 220))
-    settings_button_reset_progression_hover = settings_button_img_hover_base.copy()
-    generate_text_image(settings_button_reset_progression_hover, texts["reset_progression"], 500, 90, settings_buttons_font, (220, 220, 220))
-
-    settings_button_all_access_idle = settings_button_img_idle_base.copy()
-    generate_text_image(settings_button_all_access_idle, texts["all_access"], 500, 90, settings_buttons_font, (220, 220, 220))
-    settings_button_all_access_hover = settings_button_img_hover_base.copy()
-    generate_text_image(settings_button_all_access_hover, texts["all_access"], 500, 90, settings_buttons_font, (220, 220, 220))
-
-
-    menu_models["play"] = {
-        "images": {
-            "idle": main_button_play_idle,
-            "hover": main_button_play_hover
-        },
-        "sequences": {}
-    }
-    menu_models["levels"] = {
-        "images": {
-            "idle": main_button_levels_idle,
-            "hover": main_button_levels_hover
-        },
-        "sequences": {}
-    }
-    menu_models["pseudonyme"] = {
-        "images": {
-            "idle": settings_button_username_idle,
-            "hover": settings_button_username_hover
-        },
-        "sequences": {}
-    }
-    menu_models["reset_progression"] = {
-        "images": {
-            "idle": settings_button_reset_progression_idle,
-            "hover": settings_button_reset_progression_hover
-        },
-        "sequences": {}
-    }
-    menu_models["all_access"] = {
-        "images": {
-            "idle": settings_button_all_access_idle,
-            "hover": settings_button_all_access_hover
-        },
-        "sequences": {}
-    }
\ No newline at end of file
+
+    models = language_models.get(language)
+
+    if models is None:
+        models = {}
+
+        for model_name, (text_name, base_images, texture_size, y, font) in menu_buttons.items():
+            idle_image, hover_image = (
+                render_button(base_image, texture, texts[text_name], texture_size, y, font)
+                for base_image, texture in zip(base_images, (button_idle_texture, button_hover_texture))
+            )
+
+            models[model_name] = {
+                "images": {
+                    "idle": idle_image,
+                    "hover": hover_image
+                },
+                "sequences": {}
+            }
+
+        if not language is None: language_models[language] = models
+
+    menu_models.update(models)
@@ -1,8 +1,17 @@
+import atexit
+import threading
 from json import dumps, loads
+from time import monotonic, sleep
+
+from modules import files
 
 current_settings = {} # holds the data of the settings file at any moment during game execution
 
+settings_path = "infold/data/settings.json"
+settings_version = 1 # version of the settings' schema, stored in the file
+
 settings_base = { # set containing the default settings when the file hasn't been created/is corrupted
+    "version": settings_version,
     "language": "FR",
     "username": "Jean-Louis Jacques du Père, 3e du nom",
     "progression": "LNiveau1",
@@ -10,22 +19,142 @@ settings_base = { # set containing the default settings when the file hasn't bee
     "has_selected_username": False
 }
 
+save_delay = 0.5 # seconds without any change before the settings are written, coalesces bursts of changes
+save_max_delay = 2 # seconds after the first unwritten change at which the settings are written, even if changes continue
+save_retry_delay = 5 # seconds before the writer thread tries again after a failed write
+
+save_condition = threading.Condition() # protects the requests' times, notified when a save is requested
+save_requested_time = None # time of the last save request not written yet, None if there's nothing to write
+save_first_request_time = None # time of the first save request not written yet
+write_lock = threading.Lock() # held while the file is written, so that an older state can't replace a newer one
+writer_thread = None
+
+
+def migrate_0_to_1(settings: dict) -> dict:
+    """Files written before the schema was versioned, adds the missing keys."""
+
+    for key, value in settings_base.items():
+        settings.setdefault(key, value)
+
+    return settings
+
+# migration functions by the version they upgrade from, each one returns the settings at the next version
+migrations = {
+    0: migrate_0_to_1
+}
+
+def migrate_settings(settings: dict) -> dict:
+    """Upgrades settings read from an older file to the current schema version."""
+
+    version = settings.get("version", 0)
+
+    while version < settings_version:
+        settings = migrations[version](settings)
+        version += 1
+        settings["version"] = version
+
+    return settings
+
+
 def read_settings():
     global current_settings
 
     try:
-        with open("infold/data/settings.json", "r") as file:
-            current_settings = loads(file.read()) # loads the content of the file into the current_settings value
+        with open(settings_path, "r") as file:
+            loaded_settings = loads(file.read()) # loads the content of the file
+
+        needs_save = loaded_settings.get("version", 0) != settings_version
+        if needs_save: loaded_settings = migrate_settings(loaded_settings)
 
     except: # settings file doesn't exist or is corrupted, loads the base data and creates the file
-        current_settings = dict(settings_base)
+        loaded_settings = dict(settings_base)
+        needs_save = True
+
+    # the dict is updated instead of replaced, other modules keep a reference to it (see main.py)
+    current_settings.clear()
+    current_settings.update(loaded_settings)
+
+    if needs_save: save_settings()
 
-        save_settings()
+def write_settings_file(data: str):
+    """Writes the file atomically and flushes it to the disk: a crash during the write leaves the previous file intact."""
+
+    files.write_atomically(settings_path, lambda file: file.write(data), sync = True)
+
+def write_pending_settings():
+    """
+    Writes the settings if a save has been requested, the caller has to hold write_lock.
+    If the write fails, the request is kept (the next write saves the changes) and the OSError is raised.
+    """
+    global save_requested_time, save_first_request_time
+
+    with save_condition:
+        if save_requested_time is None: return
+
+        requested_time, first_request_time = save_requested_time, save_first_request_time
+        save_requested_time = None
+        save_first_request_time = None
+        data = dumps(current_settings)
+
+    try: write_settings_file(data)
+    except OSError:
+        with save_condition:
+            if save_requested_time is None: save_requested_time = requested_time # unless changed during the write
+            if save_first_request_time is None: save_first_request_time = first_request_time
+        raise
+
+def writer_loop():
+    """
+    Executed by the writer thread, writes the settings once no change has been requested for save_delay, or
+    save_max_delay after the first unwritten change.
+    """
+
+    def get_remaining() -> float: # ghost func, called with save_condition held
+        if save_requested_time is None: return 0 # written by flush_settings
+
+        return min(save_requested_time + save_delay, save_first_request_time + save_max_delay) - monotonic()
+
+    while True:
+        with save_condition:
+            while save_requested_time is None:
+                save_condition.wait()
+
+            remaining = get_remaining()
+            while remaining > 0: # new requests during the wait push the write back, up to save_max_delay
+                save_condition.wait(remaining)
+                remaining = get_remaining()
+
+        try:
+            with write_lock:
+                write_pending_settings()
+
+        except OSError as exception: # missing folder, disk full... the changes are kept and written later
+            print("Settings couldn't be saved: {}".format(exception))
+            sleep(save_retry_delay)
 
 def save_settings():
-    global current_settings
+    """
+    Requests the settings to be saved, returns immediately.
+    The file is written by a background thread once the changes stop (see save_delay), and when the game exits.
+    """
+    global save_requested_time, save_first_request_time, writer_thread
+
+    with save_condition:
+        save_requested_time = monotonic()
+        if save_first_request_time is None: save_first_request_time = save_requested_time
+
+        if writer_thread is None or not writer_thread.is_alive():
+            writer_thread = threading.Thread(target = writer_loop, name = "settings_writer", daemon = True)
+            writer_thread.start()
+
+        save_condition.notify()
+
+def flush_settings():
+    """Writes the pending changes right away, in the calling thread."""
+
+    with write_lock:
+        write_pending_settings()
 
-    with open("infold/data/settings.json", "w") as file:
-        file.write(dumps(current_settings))
+atexit.register(flush_settings) # the writer thread is a daemon, the last changes are written before exiting
 
-read_settings() # loads the data of the settings file
\ No newline at end of file
+read_settings() # loads the data of the settings file
@@ -5,7 +5,7 @@ sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 from PIL import Image
 from time import sleep
 
-from modules import entity, level, sprite as entity, level, sprite
+from modules import assets, entity, level, sprite as entity, level, sprite
 
 from levels.translations import TNiveau1 as texts
 
@@ -22,20 +22,26 @@ class CLevel (level.Level):
         self.name = "Niveau 1"
         self.description = "No description."
     
+    def prepare(self):
+        main_image = assets.LazyImage("levels/images/samples/clash.png", (500, 500)) # decoded at the sprite's size
+        assets.load_all([main_image]) # decodes the level's images in parallel in the loading thread
+
+        self.model = {
+            "images": {
+                "main": main_image,
+                "hidden": Image.new("RGBA", (1, 1), (0, 0, 0, 0))
+            },
+            "sequences": {
+                "loop": [True, ("main", (0, 0)), 1000, ("hidden", (0, 0)), 1000]
+            }
+        }
+
     def create(self):
         self.create_render_frame()
         
         self.val = sprite.Sprite(
             self.frame,
-            {
-                "images": {
-                    "main": Image.open("levels/images/samples/clash.png"),
-                    "hidden": Image.new("RGBA", (1, 1), (0, 0, 0, 0))
-                },
-                "sequences": {
-                    "loop": [True, ("main", (0, 0)), 1000, ("hidden", (0, 0)), 1000]
-                }
-            },
+            self.model,
             "main",
             (0, 0),
             (500, 500)
@@ -1,17 +1,27 @@
-from PIL import Image, ImageTk
-from json import dumps, loads
-from time import sleep
-import tkinter
-import threading
-
-import game
-import modules.level as level
-import modules.sprite as sprite
-import modules.entity as entity
-
-from infold.data.menu_models import menu_models, generate_filled_image, generate_menu_models
-import infold.data.translations as translations
-import infold.settings as settings
+import modules.profiler as profiler # imported first, starts the startup clock
+
+with profiler.section("import", "PIL/tkinter"):
+    from PIL import Image, ImageTk
+    from json import dumps, loads
+    from time import sleep
+    import tkinter
+    import threading
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+with profiler.section("import", "engine"):
+    import game
+    import modules.level as level
+    import modules.sprite as sprite
+    import modules.entity as entity
+    import modules.thumbnails as thumbnails
+    import modules.memory as memory
+    import modules.assets as assets
+
+with profiler.section("import", "menus/settings"):
+    from infold.data.menu_models import menu_models, generate_filled_image, generate_menu_models
+    import infold.data.translations as translations
+    import infold.settings as settings
 
 
 class Infold(game.Game):
@@ -26,15 +36,38 @@ class Infold(game.Game):
         self.text_font = ("Cascadia Code", 15)
         self.sub_text_font = ("Cascadia Code", 12)
 
-        if self.settings["language"] in self.texts:
-            generate_menu_models(self.texts[self.settings["language"]])
-        else:
-            generate_menu_models(self.texts["EN"])
+        assets.preload_models(menu_models) # decoded by the loaders' pool while the buttons are generated
+
+        with profiler.section("menu", "buttons generation"):
+            if self.settings["language"] in self.texts:
+                generate_menu_models(self.texts[self.settings["language"]], self.settings["language"])
+            else:
+                generate_menu_models(self.texts["EN"], "EN")
         self.menu_models = menu_models
 
-        self.initialize("Inf'Old: A new start", debug = True) # also initializes the levels
+        # objects displaying a translated text, updated when the language changes (see self.update_menu_texts)
+        self.menu_text_sprites = {} # name in self.menu_objects -> name of the model in self.menu_models
+        self.menu_text_items = [] # tuples (canvas, item id, text name)
+
+        self.initialize("Inf'Old: A new start", debug = "--debug" in sys.argv) # also initializes the levels
         self.levels_roadmap = ["Niveau 1", "Niveau 2", "Niveau 3", "Niveau 4", "Niveau 5", "EasterEgg"]
 
+        # level select screen, only the entries of the current page exist (see self.show_levels_page)
+        self.thumbnails = thumbnails.ThumbnailGenerator(self, "infold/data/cache/thumbnails", (120, 90))
+        self.levels_page = 0
+        self.levels_slots = [] # dicts describing the entries of a page, reused for each page
+        self.levels_page_executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "levels_page") # see self.show_levels_page
+
+        # performance runs: "--record <path>" records the session, "--replay <path>" replays it and quits
+        if "--record" in sys.argv: self.start_recording(sys.argv[sys.argv.index("--record") + 1])
+        elif "--replay" in sys.argv: self.start_replay(sys.argv[sys.argv.index("--replay") + 1], quit_after = True)
+
+        # "--trace <path>" exports a trace of the frames (see modules/trace.py) at the end and after each frame over 100 ms
+        if "--trace" in sys.argv: self.start_trace(sys.argv[sys.argv.index("--trace") + 1], long_frame_threshold = 0.1)
+
+        # "--memory" takes tracemalloc snapshots around the level changes (see modules/memory.py)
+        if "--memory" in sys.argv: memory.start_tracking()
+
         self.draw_menu()
 
 
@@ -70,20 +103,48 @@ class Infold(game.Game):
         settings.save_settings()
 
         if new_lang in self.texts:
-            generate_menu_models(self.texts[new_lang])
+            generate_menu_models(self.texts[new_lang], new_lang)
         else:
-            generate_menu_models(self.texts["EN"])
-        if "main_canvas" in self.menu_objects:
-            self.exit_menu()
-            self.draw_menu()
-        self.queue_function(self.open_settings)
+            generate_menu_models(self.texts["EN"], "EN")
+        self.update_menu_texts()
 
         return True
 
+    def update_menu_texts(self) -> None:
+        """Swaps the images and texts of the built menus with the ones of the current language."""
+
+        for object_name, model_name in self.menu_text_sprites.items():
+            menu_sprite = self.menu_objects[object_name]
+            menu_sprite.set_model(self.menu_models[model_name], menu_sprite.current_image_name)
+
+        def update_texts(): # ghost func
+            for canvas, item_id, text_name in self.menu_text_items:
+                canvas.itemconfigure(item_id, text = self.get_text(text_name))
+
+        self.queue_function(update_texts)
+
+    def create_menu_text(self, canvas: object, x: int, y: int, text_name: str, font: tuple) -> int:
+        """
+        Creates a translated text on a menu canvas, updated when the language changes.
+        Has to be executed in the tkinter thread.
+
+        returns: the id of the canvas item
+        """
+
+        item_id = canvas.create_text(x, y, text = self.get_text(text_name), fill = "white", font = font, anchor = "nw")
+        canvas.add_to_layer([item_id], "ui")
+        self.menu_text_items += [(canvas, item_id, text_name)]
+
+        return item_id
+
     
     # -------------------- MAIN MENU --------------------
 
     def draw_menu(self) -> None: 
+        """Shows the main menu, built the first time, hidden by self.exit_menu."""
+
+        if self.show_menu_canvas("main_canvas"): return
+
         # creates the canvas for the buttons/background, made a bit larger than the window to ensure no border
         main_canvas = self.create_menu_canvas("main_canvas", -2, -2, self.frame_size[0]+4, self.frame_size[1]+4)
 
@@ -93,7 +154,8 @@ class Infold(game.Game):
             self.menu_models["background"],
             "main",
             (0, 0),
-            (504, 504)
+            (504, 504),
+            layer = "background"
         )
 
         self.menu_objects["banner"] = sprite.Sprite(
@@ -137,6 +199,7 @@ class Infold(game.Game):
             lambda: self.menu_objects["play_button"].set_current_image("idle")
         )
         self.menu_objects["play_button"].set_click_callback(lambda: self.change_level(self.settings["progression"]))
+        self.menu_text_sprites["play_button"] = "play"
 
         self.menu_objects["levels_button"] = sprite.Sprite(
             main_canvas,
@@ -149,17 +212,24 @@ class Infold(game.Game):
             lambda: self.menu_objects["levels_button"].set_current_image("hover"),
             lambda: self.menu_objects["levels_button"].set_current_image("idle")
         )
+        self.menu_objects["levels_button"].set_click_callback(self.open_levels_menu)
+        self.menu_text_sprites["levels_button"] = "levels"
 
 
     # -------------------- SETTINGS MENU --------------------
 
     def open_settings(self):
-        """Functions used by the settings button in the main menu."""
+        """
+        Functions used by the settings button in the main menu.
+        The settings menu is built the first time, then only hidden/shown.
+        """
 
-        if "settings_canvas" in self.menu_objects: return # if the settings are already open
+        if self.is_menu_canvas_shown("settings_canvas"): return # if the settings are already open
         if "main_canvas" in self.menu_objects:
-            self.queue_function(self.menu_objects["quit_button"].hide)
-            self.queue_function(self.menu_objects["settings_button"].hide)
+            self.menu_objects["quit_button"].hide(keep_item = True)
+            self.menu_objects["settings_button"].hide(keep_item = True)
+
+        if self.show_menu_canvas("settings_canvas"): return
 
         settings_canvas = self.create_menu_canvas("settings_canvas", 30, 30, 440, 440)
 
@@ -168,18 +238,20 @@ class Infold(game.Game):
             self.menu_models["background"],
             "main",
             (-32, -32),
-            (504, 504)
+            (504, 504),
+            layer = "background"
         )
 
-        def draw_decorations(): # ghost func to be executed in postprocess
+        def draw_decorations(): # ghost func, the decorations are in the "ui" layer, above the background
             ids = []
 
-            ids += [settings_canvas.create_text(30, 3, text = self.get_text("settings"), fill = "white", font = self.text_font, anchor = "nw")]
+            ids += [self.create_menu_text(settings_canvas, 30, 3, "settings", self.text_font)]
             ids += [settings_canvas.create_rectangle(407, 0, 450, 35, outline = "white")]
             ids += [settings_canvas.create_rectangle(0, 0, 450, 35, outline = "white")]
+            settings_canvas.add_to_layer(ids[1:], "ui")
 
-            return ids
-        self.assign_menu_widget_queued_postprocess("settings_decorations", draw_decorations) # used to make sure the background isn't hiding it
+            self.menu_objects["settings_decorations"] = ids
+        self.queue_function(draw_decorations)
 
         self.menu_objects["settings_quit_button"] = sprite.Sprite(
             settings_canvas,
@@ -203,6 +275,7 @@ class Infold(game.Game):
             lambda: self.menu_objects["settings_username_button"].set_current_image("hover"),
             lambda: self.menu_objects["settings_username_button"].set_current_image("idle")
         )
+        self.menu_text_sprites["settings_username_button"] = "pseudonyme"
 
         self.menu_objects["settings_reset_progression_button"] = sprite.Sprite(
             settings_canvas,
@@ -218,6 +291,7 @@ class Infold(game.Game):
             lambda: self.menu_objects["settings_reset_progression_button"].set_current_image("hover"),
             lambda: self.menu_objects["settings_reset_progression_button"].set_current_image("idle")
         )
+        self.menu_text_sprites["settings_reset_progression_button"] = "reset_progression"
 
         self.menu_objects["settings_all_access_button"] = sprite.Sprite(
             settings_canvas,
@@ -233,6 +307,7 @@ class Infold(game.Game):
             lambda: self.menu_objects["settings_all_access_button"].set_current_image("hover"),
             lambda: self.menu_objects["settings_all_access_button"].set_current_image("idle")
         )
+        self.menu_text_sprites["settings_all_access_button"] = "all_access"
 
         self.menu_objects["settings_FR_flag"] = sprite.Sprite(
             settings_canvas,
@@ -259,15 +334,170 @@ class Infold(game.Game):
             self.menu_objects["quit_button"].show()
             self.menu_objects["settings_button"].show()
 
-        self.delete_menu_widget_queued("settings_canvas")
+        self.hide_menu_canvas("settings_canvas")
+
+
+    # -------------------- LEVEL SELECT MENU --------------------
+
+    def open_levels_menu(self) -> None:
+        """Opens the level select screen, built the first time, then only hidden/shown."""
+
+        if self.is_menu_canvas_shown("levels_canvas"): return
+        if self.is_menu_canvas_shown("settings_canvas"): return
+        if "main_canvas" in self.menu_objects:
+            self.menu_objects["quit_button"].hide(keep_item = True)
+            self.menu_objects["settings_button"].hide(keep_item = True)
+
+        if self.show_menu_canvas("levels_canvas"):
+            self.show_levels_page(self.levels_page)
+            return
+
+        levels_canvas = self.create_menu_canvas("levels_canvas", 30, 30, 440, 440)
+
+        self.menu_objects["levels_background"] = sprite.Sprite(
+            levels_canvas,
+            self.menu_models["background"],
+            "main",
+            (-32, -32),
+            (504, 504),
+            layer = "background"
+        )
+
+        self.menu_objects["levels_quit_button"] = sprite.Sprite(
+            levels_canvas,
+            self.menu_models["cross"],
+            "main",
+            (415, 10),
+            (20, 20)
+        )
+        self.menu_objects["levels_quit_button"].set_click_callback(self.close_levels_menu)
+
+        def create_tkinter_objects(): # ghost func, the items are in the "ui" layer, above the background
+            self.create_menu_text(levels_canvas, 30, 3, "levels", self.text_font)
+            ids = [
+                levels_canvas.create_rectangle(407, 0, 450, 35, outline = "white"),
+                levels_canvas.create_rectangle(0, 0, 450, 35, outline = "white")
+            ]
+
+            # 2 columns of 3 entries, the same items display the entries of every page
+            for index in range(6):
+                x = 40 + 200 * (index % 2)
+                y = 50 + 125 * (index // 2)
+
+                self.levels_slots += [{
+                    "file_name": None,
+                    "box": (x, y, x + 160, y + 115),
+                    "image_id": levels_canvas.create_image(x + 20, y, anchor = "nw"),
+                    "text_id": levels_canvas.create_text(x + 80, y + 100, fill = "white", font = self.sub_text_font),
+                    "tk_image": None
+                }]
+
+            self.menu_objects["levels_previous_page"] = levels_canvas.create_text(20, 415, text = "<", fill = "white", font = self.text_font)
+            self.menu_objects["levels_next_page"] = levels_canvas.create_text(420, 415, text = ">", fill = "white", font = self.text_font)
+            self.menu_objects["levels_page_text"] = levels_canvas.create_text(220, 415, fill = "white", font = self.sub_text_font)
+
+            ids += [item for slot in self.levels_slots for item in (slot["image_id"], slot["text_id"])]
+            ids += [self.menu_objects[name] for name in ("levels_previous_page", "levels_next_page", "levels_page_text")]
+            levels_canvas.add_to_layer(ids, "ui")
+
+            self.show_levels_page(0)
+
+        self.queue_function(create_tkinter_objects)
+
+        def on_click(event): # ghost func
+            if not levels_canvas.is_menu_shown: return
+
+            if event.y >= 400: # page arrows
+                if event.x <= 40: self.show_levels_page(self.levels_page - 1)
+                elif event.x >= 400: self.show_levels_page(self.levels_page + 1)
+                return
+
+            for slot in self.levels_slots:
+                x0, y0, x1, y1 = slot["box"]
+                if x0 <= event.x <= x1 and y0 <= event.y <= y1 and not slot["file_name"] is None:
+                    self.close_levels_menu()
+                    self.change_level(slot["file_name"])
+                    return
+
+        levels_canvas.bind("<Button-1>", on_click, "levels_menu")
+
+    def close_levels_menu(self) -> None:
+        """Closes the level select screen."""
+
+        if "main_canvas" in self.menu_objects:
+            self.menu_objects["quit_button"].show()
+            self.menu_objects["settings_button"].show()
+
+        self.hide_menu_canvas("levels_canvas")
+
+    def show_levels_page(self, page: int) -> None:
+        """
+        Displays a page of the level select screen. Only the levels of this page are accessed (imported if they
+        weren't yet) and only their thumbnails are requested, the ones of the next page are generated in advance.
+        """
+
+        levels_canvas = self.menu_objects["levels_canvas"]
+        level_files = sorted(self.levels)
+        page_size = len(self.levels_slots)
+
+        pages_count = max((len(level_files) + page_size - 1) // page_size, 1)
+        page = min(max(page, 0), pages_count - 1)
+        self.levels_page = page
+
+        page_files = level_files[page * page_size:(page + 1) * page_size]
+
+        def set_thumbnail(slot: dict, file_name: str, image: object): # ghost func
+            if slot["file_name"] != file_name or image is None: return # the page changed in the meantime
+
+            slot["tk_image"] = ImageTk.PhotoImage(image = image)
+            levels_canvas.itemconfigure(slot["image_id"], image = slot["tk_image"], state = "normal")
+
+        def fill_page(slots: list, prefetch: bool): # ghost func, executed by a worker: accessing a level can import it
+            for slot, file_name in slots:
+                self.thumbnails.request( # hashes the level's file
+                    file_name,
+                    lambda file_name, image, slot = slot: self.queue_function(lambda: set_thumbnail(slot, file_name, image), "background")
+                )
+
+            for slot, file_name in slots:
+                level_name = self.levels[file_name].name
+
+                if slot["file_name"] == file_name:
+                    self.queue_function(lambda slot = slot, level_name = level_name: levels_canvas.itemconfigure(slot["text_id"], text = level_name))
+
+            if prefetch: # not while replaying (the thumbnails' workers run on real time)
+                for file_name in level_files[(page + 1) * page_size:(page + 2) * page_size]:
+                    self.thumbnails.request(file_name, lambda file_name, image: None)
+
+        slots = []
+        for index, slot in enumerate(self.levels_slots):
+            file_name = page_files[index] if index < len(page_files) else None
+
+            slot["file_name"] = file_name
+            slot["tk_image"] = None
+            levels_canvas.itemconfigure(slot["image_id"], state = "hidden")
+            levels_canvas.itemconfigure(slot["text_id"], text = "" if file_name is None else file_name)
+
+            if not file_name is None: slots += [(slot, file_name)]
+
+        levels_canvas.itemconfigure(self.menu_objects["levels_page_text"], text = "{}/{}".format(page + 1, pages_count))
+
+        self.levels_page_executor.submit(fill_page, slots, self.replayer is None) # pages are filled one after the other
 
 
     # -------------------- USERNAME MENU --------------------
 
     def open_username_menu(self) -> None:
-        """Opens the username menu."""
+        """Opens the username menu, built the first time, then only hidden/shown."""
 
-        if "username_canvas" in self.menu_objects: return # if the menu is already open
+        if self.is_menu_canvas_shown("username_canvas"): return # if the menu is already open
+
+        if self.show_menu_canvas("username_canvas"):
+            def update_username(): # ghost func, the username may have changed since the menu was built
+                self.menu_objects["username_canvas"].itemconfigure(self.menu_objects["username_decorations"][3], text = self.settings["username"])
+            self.queue_function(update_username)
+
+            return
 
         username_canvas = self.create_menu_canvas("username_canvas", 150, 175, 200, 150)
 
@@ -276,7 +506,8 @@ class Infold(game.Game):
             self.menu_models["background"],
             "main",
             (-152, -180),
-            (504, 504)
+            (504, 504),
+            layer = "background"
         )
 
         def create_tkinter_objects(): # ghost function, creating tkinter elements inside of the canvas
@@ -294,7 +525,7 @@ class Infold(game.Game):
             background_transparent = ImageTk.PhotoImage(image = generate_filled_image(200, 200, (200, 200, 200, 255)))
             ids += [username_canvas.create_image(0, 0, image = background_transparent, anchor = "nw")]
 
-            ids += [username_canvas.create_text(30, 3, text = self.get_text("username"), fill = "white", font = self.text_font, anchor = "nw")]
+            ids += [self.create_menu_text(username_canvas, 30, 3, "username", self.text_font)]
             ids += [username_canvas.create_rectangle(0, 0, 200, 35, outline = "white")]
 
             ids += [username_canvas.create_text(
@@ -305,25 +536,30 @@ class Infold(game.Game):
                 font = self.sub_text_font,
                 anchor = "nw"
             )]
-            ids += [username_canvas.create_text(
-                10,
-                65,
-                text = self.get_text("new_username"),
-                fill = "white",
-                font = self.sub_text_font,
-                anchor = "nw"
-            )]
+            ids += [self.create_menu_text(username_canvas, 10, 65, "new_username", self.sub_text_font)]
 
+            username_canvas.background_image = background_transparent # keeps a reference, the canvas only has its name
+            username_canvas.add_to_layer(ids, "ui") # above the background, in creation order
             self.menu_objects["username_decorations"] = ids
 
-        self.queue_function_postprocess(create_tkinter_objects)
+        self.queue_function(create_tkinter_objects)
 
 
     def exit_menu(self) -> None:
-        self.delete_menu_widget_queued("main_canvas")
-        self.delete_menu_widget_queued("settings_canvas")
-        self.delete_menu_widget_queued("username_canvas")
+        """Hides the menus, they are kept built for when they are shown again."""
+
+        self.hide_menu_canvas("main_canvas")
+        self.hide_menu_canvas("settings_canvas")
+        self.hide_menu_canvas("username_canvas")
+        self.hide_menu_canvas("levels_canvas")
+
+    def on_shutdown(self) -> None:
+        """Stops the thumbnails' worker processes and the level select screen's worker."""
+
+        self.thumbnails.shutdown()
+        self.levels_page_executor.shutdown(wait = False, cancel_futures = True)
 
     # ----------  BIND FUNCTIONS ----------
         
-game_instance = Infold()
\ No newline at end of file
+if __name__ == "__main__": # the thumbnails' worker processes may import this file
+    game_instance = Infold()
\ No newline at end of file
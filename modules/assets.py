@@ -0,0 +1,122 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from PIL import Image
+
+from modules import profiler
+
+
+"""
+Lazy assets: a LazyImage can be put in a model in place of a PIL image, its file is only opened and decoded the
+first time the image is used (see Sprite.set_current_image). Modules declaring their assets at import time
+(menus, levels) don't slow down the startup anymore.
+
+Images known to be needed soon can be preloaded: they are decoded in parallel by a pool of threads (PIL releases
+the GIL while decoding). Decoding is size-aware when a LazyImage has a target size: JPEG files are decoded with
+PIL's draft mode close to that size, other formats are decoded once and only the resized image is kept.
+"""
+
+loader_workers = os.cpu_count() or 2
+loader_executor = None # created on the first preload
+loader_executor_lock = threading.Lock()
+
+def decode_image(path: str, size: tuple = None) -> object:
+    """
+    Opens and decodes an image file.
+
+    size: tuple of 2 ints, size of the returned image (not resized if None)
+    """
+
+    image = Image.open(path)
+
+    if not size is None and image.format == "JPEG": # decodes at the smallest 1/2, 1/4, 1/8 scale still larger than size
+        image.draft(image.mode, tuple(size))
+
+    image.load()
+
+    if not size is None and image.size != tuple(size):
+        image = image.resize(tuple(size), reducing_gap = 3.0) # large reductions are first done by fast pixel binning
+
+    return image
+
+class LazyImage:
+    """Proxy of a PIL image loaded from its file on first use, attributes are forwarded to the loaded image."""
+
+    def __init__(self, path: str, size: tuple = None) -> None:
+        """
+        path: str, path of the image's file
+        size: tuple of 2 ints, the image is resized to it once loaded (not resized if None)
+        """
+
+        self.path = path
+        self.size_on_load = size
+
+        self.image = None
+        self.lock = threading.Lock() # the image can be used by several threads at once
+
+    def get(self) -> object:
+        """Returns the PIL image, loads it the first time."""
+
+        if self.image is None:
+            with self.lock:
+                if self.image is None:
+                    with profiler.section("asset", self.path):
+                        self.image = decode_image(self.path, self.size_on_load)
+
+        return self.image
+
+    def is_loaded(self) -> bool:
+        return not self.image is None
+
+    def __getattr__(self, name: str) -> object: # only called for the attributes that LazyImage doesn't have
+        # own attributes missing (instance created without __init__ by copy/pickle) and special methods aren't
+        # forwarded, looking them up on the loaded image would call __getattr__ again
+        if name in ("path", "size_on_load", "image", "lock") or (name.startswith("__") and name.endswith("__")):
+            raise AttributeError(name)
+
+        return getattr(self.get(), name)
+
+
+def get_image(image: object) -> object:
+    """Returns the PIL image of the given image or LazyImage."""
+
+    return image.get() if isinstance(image, LazyImage) else image
+
+def get_loader_executor() -> ThreadPoolExecutor:
+    global loader_executor
+
+    with loader_executor_lock:
+        if loader_executor is None:
+            loader_executor = ThreadPoolExecutor(max_workers = loader_workers, thread_name_prefix = "asset_loading")
+
+        return loader_executor
+
+def get_lazy_images(models: object) -> list:
+    """Returns the LazyImages of a model, of a dict of models or of nested dicts of models (see modules/sprite.py)."""
+
+    if isinstance(models, LazyImage): return [models]
+    if not isinstance(models, dict): return []
+    if "images" in models: return [image for image in models["images"].values() if isinstance(image, LazyImage)]
+
+    return [image for value in models.values() for image in get_lazy_images(value)]
+
+def preload(images: list) -> list:
+    """
+    Starts decoding the given LazyImages (those not loaded yet) in the loaders' pool, returns the futures.
+    A sprite using one of them before it's decoded waits for it (see LazyImage.get).
+    """
+
+    executor = get_loader_executor()
+
+    return [executor.submit(image.get) for image in images if not image.is_loaded()]
+
+def preload_models(models: object) -> list:
+    """Preloads the LazyImages of the given models (see get_lazy_images), returns the futures."""
+
+    return preload(get_lazy_images(models))
+
+def load_all(images: list) -> None:
+    """Decodes the given LazyImages in parallel and waits until all of them are loaded (raises the first error)."""
+
+    for future in wait(preload(images)).done:
+        future.result()
@@ -0,0 +1,158 @@
+import threading
+
+
+"""
+A camera is the viewport of a level on its canvas.
+
+The canvas holds the whole world (its scrollregion is the size of the level), and the camera scrolls it with a
+single view transform instead of moving every item. Sprites are stored in a spatial hash (cells of the world) so
+that moving the camera only checks the sprites of the cells around the viewport: sprites outside of it are culled,
+they keep their state but have no canvas item and their sequence is paused.
+"""
+
+class Camera:
+    """Viewport of a level, scrolls its canvas and culls the sprites that aren't visible."""
+
+    def __init__(self, canvas: object, world_size: tuple, view_size: tuple, cell_size: tuple = None) -> None:
+        """
+        canvas: LevelCanvas, canvas on which the level's sprites are drawn
+        world_size: tuple of 2 ints, size of the whole level in pixels
+        view_size: tuple of 2 ints, size of the viewport (usually the size of the window)
+        cell_size: tuple of 2 ints, size of the cells of the spatial hash, defaults to the size of the viewport
+        """
+
+        self.canvas = canvas
+        self.world_size = world_size
+        self.view_size = view_size
+        self.cell_size = view_size if cell_size is None else cell_size
+
+        self.pos = (0, 0) # top left corner of the viewport in world coordinates
+
+        self.cells = {} # (cell x, cell y) -> set of the sprites overlapping the cell
+        self.sprites_cells = {} # sprite -> range of cells (x0, y0, x1, y1) it overlaps
+
+        self.lock = threading.Lock() # sprites are moved from sequence threads as well as from the tkinter one
+
+        self.canvas.camera = self
+        self.canvas.set_scroll_region(world_size)
+
+
+    def get_cells_range(self, x0: float, y0: float, x1: float, y1: float) -> tuple:
+        """Returns the range of cells (x0, y0, x1, y1) overlapped by the given rectangle."""
+
+        c_w, c_h = self.cell_size
+
+        return (int(x0 // c_w), int(y0 // c_h), int(x1 // c_w), int(y1 // c_h))
+
+    def get_view_cells_range(self) -> tuple:
+        """Returns the range of cells overlapped by the viewport."""
+
+        x, y = self.pos
+        v_w, v_h = self.view_size
+
+        return self.get_cells_range(x, y, x + v_w, y + v_h)
+
+    def is_visible(self, x0: float, y0: float, x1: float, y1: float) -> bool:
+        """Returns whether the given rectangle (world coordinates) overlaps the viewport."""
+
+        x, y = self.pos
+        v_w, v_h = self.view_size
+
+        return x1 >= x and x0 <= x + v_w and y1 >= y and y0 <= y + v_h
+
+    def is_sprite_visible(self, sprite: object) -> bool:
+        """Returns whether the given sprite overlaps the viewport."""
+
+        s_x, s_y = sprite.composed_coordinates
+        ss_x, ss_y = sprite.scale
+
+        return self.is_visible(s_x, s_y, s_x + ss_x, s_y + ss_y)
+
+
+    def update_sprite(self, sprite: object) -> None:
+        """
+        Updates the cells of the sprite after it moved and its culled state.
+        Doesn't refresh the image of the sprite, the caller (Sprite.move) already does it.
+        """
+
+        s_x, s_y = sprite.composed_coordinates
+        ss_x, ss_y = sprite.scale
+        new_range = self.get_cells_range(s_x, s_y, s_x + ss_x, s_y + ss_y)
+
+        with self.lock:
+            old_range = self.sprites_cells.get(sprite)
+
+            if old_range != new_range:
+                if not old_range is None: self.remove_from_cells(sprite, old_range)
+
+                self.sprites_cells[sprite] = new_range
+                for cell_x in range(new_range[0], new_range[2] + 1):
+                    for cell_y in range(new_range[1], new_range[3] + 1):
+                        self.cells.setdefault((cell_x, cell_y), set()).add(sprite)
+
+            culled = not self.is_sprite_visible(sprite)
+
+        sprite.set_culled(culled, refresh = False)
+
+    def remove_from_cells(self, sprite: object, cells_range: tuple) -> None:
+        """Internal function, removes the sprite from the given cells (the lock has to be held)."""
+
+        for cell_x in range(cells_range[0], cells_range[2] + 1):
+            for cell_y in range(cells_range[1], cells_range[3] + 1):
+                cell = self.cells.get((cell_x, cell_y))
+                if cell is None: continue
+
+                cell.discard(sprite)
+                if len(cell) == 0: del self.cells[(cell_x, cell_y)]
+
+    def remove_sprite(self, sprite: object) -> None:
+        """Stops tracking the given sprite (when it is destroyed)."""
+
+        with self.lock:
+            cells_range = self.sprites_cells.pop(sprite, None)
+            if not cells_range is None: self.remove_from_cells(sprite, cells_range)
+
+
+    def move_to(self, new_pos: tuple) -> None:
+        """
+        Moves the top left corner of the viewport to the given world coordinates (clamped to the world's size).
+        Only the sprites of the cells around the old and new viewports are checked.
+
+        new_pos: tuple of 2 ints
+        """
+
+        w_w, w_h = self.world_size
+        v_w, v_h = self.view_size
+        x = min(max(new_pos[0], 0), max(w_w - v_w, 0))
+        y = min(max(new_pos[1], 0), max(w_h - v_h, 0))
+
+        if (x, y) == self.pos: return
+
+        with self.lock:
+            old_range = self.get_view_cells_range()
+            self.pos = (x, y)
+            new_range = self.get_view_cells_range()
+
+            candidates = set()
+            for cells_range in (old_range, new_range):
+                for cell_x in range(cells_range[0], cells_range[2] + 1):
+                    for cell_y in range(cells_range[1], cells_range[3] + 1):
+                        cell = self.cells.get((cell_x, cell_y))
+                        if not cell is None: candidates |= cell
+
+            changes = [(sprite, not self.is_sprite_visible(sprite)) for sprite in candidates]
+
+        self.canvas.scroll_to((x, y))
+
+        for sprite, culled in changes:
+            sprite.set_culled(culled)
+
+    def move(self, delta: tuple) -> None:
+        """Moves the viewport by the given amount of pixels (tuple of 2 ints)."""
+
+        self.move_to((self.pos[0] + delta[0], self.pos[1] + delta[1]))
+
+    def center_on(self, pos: tuple) -> None:
+        """Centers the viewport on the given world coordinates (tuple of 2 ints)."""
+
+        self.move_to((int(pos[0] - self.view_size[0] / 2), int(pos[1] - self.view_size[1] / 2)))
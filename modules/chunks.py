@@ -0,0 +1,252 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+"""
+Chunk streaming, used by levels too large to keep all of their objects alive.
+
+The grid of the level is split in chunks (rectangles of tiles). Only the chunks around a focus point (usually the
+player) are loaded: their objects are created with the creation function of the level. Chunks getting far from the
+focus point are unloaded: the state of their objects (see Entity/Sprite.get_state) is serialized and their sprites
+are released. When a chunk is loaded again, its objects are recreated and their saved state is restored.
+
+The objects are created, restored and destroyed in the tkinter thread (queued with the "load" priority, see
+modules/work_queue.py), as the level's logic tick (ECS world, tweens) runs there. Worker threads only serialize the
+states and read/write the chunks stored on the disk.
+
+Memory is bounded: only the chunks within the load radius are alive, and only the most recent serialized chunks are
+kept in memory, the older ones are written to a temporary folder.
+"""
+
+class ChunkStreamer:
+    """Loads/unloads the chunks of a level around a focus point."""
+
+    def __init__(self, level_instance: object, create_function: object, chunk_size: tuple = (16, 16), load_radius: int = 1, max_stored_chunks: int = 64, workers: int = 2) -> None:
+        """
+        level_instance: Level
+        create_function: function called with the rect of a chunk (x0, y0, x1, y1 tiles coordinates, x1 and y1
+        excluded) in the tkinter thread, returns the list of the created objects (see Level.create_from_data)
+        chunk_size: tuple of 2 ints, size of a chunk in tiles
+        load_radius: int, chunks at this distance (in chunks) of the focus' chunk are loaded
+        max_stored_chunks: int, max number of serialized chunks kept in memory
+        workers: int, number of worker threads
+        """
+
+        self.level_instance = level_instance
+        self.create_function = create_function
+        self.chunk_size = chunk_size
+        self.load_radius = load_radius
+        self.max_stored_chunks = max_stored_chunks
+
+        g_w, g_h = level_instance.grid_dimensions
+        self.chunks_count = ((g_w + chunk_size[0] - 1) // chunk_size[0], (g_h + chunk_size[1] - 1) // chunk_size[1])
+
+        self.loaded = {} # chunk -> list of its objects
+        self.pending = set() # chunks being loaded/unloaded
+        self.wanted = set() # chunks around the focus point
+
+        self.stored = OrderedDict() # chunk -> serialized states, most recent last
+        self.stored_on_disk = set() # chunks written in self.storage_path
+        self.storage_path = None # temporary folder, created when the first chunk is written
+
+        self.lock = threading.Lock()
+        self.disk_lock = threading.Lock() # held while chunks are written/read, always taken after self.lock
+        self.executor = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "chunk_streaming")
+        self.is_running = True
+
+
+    def get_chunk_rect(self, chunk: tuple) -> tuple:
+        """Returns the tiles rect (x0, y0, x1, y1, x1 and y1 excluded) of the given chunk."""
+
+        c_w, c_h = self.chunk_size
+        g_w, g_h = self.level_instance.grid_dimensions
+
+        return (chunk[0] * c_w, chunk[1] * c_h, min((chunk[0] + 1) * c_w, g_w), min((chunk[1] + 1) * c_h, g_h))
+
+    def get_chunks_around(self, chunk: tuple, radius: int) -> set:
+        """Returns the chunks at the given distance (or less) of the given one, inside of the level."""
+
+        chunks = set()
+        for x in range(max(chunk[0] - radius, 0), min(chunk[0] + radius + 1, self.chunks_count[0])):
+            for y in range(max(chunk[1] - radius, 0), min(chunk[1] + radius + 1, self.chunks_count[1])):
+                chunks.add((x, y))
+
+        return chunks
+
+
+    def queue_function(self, function: object) -> None:
+        """Executes a function in the tkinter thread, after the render work of the frame."""
+
+        self.level_instance.game_instance.queue_function(function, "load")
+
+    def set_focus(self, tile_pos: tuple) -> None:
+        """
+        Moves the focus point, loads the chunks that are now close to it and unloads the ones too far.
+        The work is queued, this function returns immediately.
+
+        tile_pos: tuple of 2 ints, coordinates of a tile
+        """
+
+        if not self.is_running: return
+
+        focus_chunk = (tile_pos[0] // self.chunk_size[0], tile_pos[1] // self.chunk_size[1])
+
+        with self.lock:
+            self.wanted = self.get_chunks_around(focus_chunk, self.load_radius)
+
+            # chunks are only unloaded one chunk further than the load radius, so that going back and forth
+            # between two chunks doesn't reload them each time
+            kept = self.get_chunks_around(focus_chunk, self.load_radius + 1)
+
+            to_load = [chunk for chunk in self.wanted if not chunk in self.loaded and not chunk in self.pending]
+            to_unload = [chunk for chunk in self.loaded if not chunk in kept and not chunk in self.pending]
+
+            self.pending.update(to_load)
+            self.pending.update(to_unload)
+
+        for chunk in to_load:
+            self.executor.submit(self.load_chunk, chunk)
+        for chunk in to_unload:
+            self.queue_function(lambda chunk = chunk: self.unload_chunk(chunk))
+
+
+    def load_chunk(self, chunk: tuple) -> None:
+        """Internal function executed by a worker, reads the saved states of a chunk and queues its creation."""
+
+        if not self.is_running: return
+
+        states = self.take_stored_states(chunk)
+
+        self.queue_function(lambda: self.create_chunk(chunk, states))
+
+    def create_chunk(self, chunk: tuple, states: list) -> None:
+        """Internal function executed in the tkinter thread, creates the objects of a chunk and restores their state."""
+
+        if not self.is_running: return
+
+        objects = self.create_function(self.get_chunk_rect(chunk))
+
+        if not states is None:
+            for obj, state in zip(objects, states):
+                obj.set_state(state)
+
+        with self.lock:
+            self.loaded[chunk] = objects
+            self.pending.discard(chunk)
+
+            unwanted = not chunk in self.wanted # the focus moved away during the loading
+            if unwanted: self.pending.add(chunk)
+
+        if unwanted: self.unload_chunk(chunk)
+
+    def unload_chunk(self, chunk: tuple) -> None:
+        """Internal function executed in the tkinter thread, saves the state of a chunk's objects and releases them."""
+
+        if not self.is_running: return # the level destroys its objects
+
+        with self.lock:
+            objects = self.loaded.pop(chunk, None)
+
+        if objects is None:
+            with self.lock: self.pending.discard(chunk)
+            return
+
+        states = [obj.get_state() for obj in objects]
+        self.release_objects(objects)
+
+        self.executor.submit(self.store_chunk, chunk, states)
+
+    def store_chunk(self, chunk: tuple, states: list) -> None:
+        """Internal function executed by a worker, serializes the states of an unloaded chunk."""
+
+        self.store_states(chunk, states)
+
+        with self.lock:
+            self.pending.discard(chunk)
+
+            wanted = chunk in self.wanted and self.is_running # the focus came back during the unloading
+            if wanted: self.pending.add(chunk)
+
+        if wanted: self.load_chunk(chunk)
+
+    def release_objects(self, objects: list) -> None:
+        """Destroys the given objects and removes them from the level and its grid."""
+
+        level_instance = self.level_instance
+
+        for obj in objects:
+            if obj.type == "entity":
+                x, y = obj.pos
+                tile = level_instance.grid_map[y][x]
+                if obj in tile: tile.remove(obj)
+
+            obj.destroy()
+
+        level_instance.remove_objects(objects)
+
+
+    def store_states(self, chunk: tuple, states: list) -> None:
+        """Serializes the states of a chunk's objects, the oldest serialized chunks are written on the disk."""
+
+        data = pickle.dumps(states, protocol = pickle.HIGHEST_PROTOCOL)
+
+        with self.lock:
+            self.stored[chunk] = data
+            self.stored.move_to_end(chunk)
+
+            spilled = []
+            while len(self.stored) > self.max_stored_chunks:
+                spilled += [self.stored.popitem(last = False)]
+
+            if len(spilled) == 0: return
+
+            if self.storage_path is None: self.storage_path = tempfile.mkdtemp(prefix = "infold_chunks_")
+
+            for spilled_chunk, _ in spilled:
+                self.stored_on_disk.add(spilled_chunk)
+
+            self.disk_lock.acquire() # taken before self.lock is released, a reader can't get the file before it's written
+
+        try:
+            for spilled_chunk, spilled_data in spilled:
+                with open(self.get_chunk_file(spilled_chunk), "wb") as file:
+                    file.write(spilled_data)
+        finally:
+            self.disk_lock.release()
+
+    def take_stored_states(self, chunk: tuple) -> list:
+        """Returns (and forgets) the saved states of a chunk's objects, None if the chunk has never been unloaded."""
+
+        with self.lock:
+            data = self.stored.pop(chunk, None)
+            on_disk = data is None and chunk in self.stored_on_disk
+            if on_disk: self.stored_on_disk.discard(chunk)
+
+        if on_disk:
+            path = self.get_chunk_file(chunk)
+
+            with self.disk_lock:
+                with open(path, "rb") as file:
+                    data = file.read()
+                os.remove(path)
+
+        return None if data is None else pickle.loads(data)
+
+    def get_chunk_file(self, chunk: tuple) -> str:
+        return os.path.join(self.storage_path, "{}_{}.chunk".format(chunk[0], chunk[1]))
+
+
+    def shutdown(self) -> None:
+        """Stops the workers and deletes the chunks written on the disk, the queued creations/unloadings are ignored."""
+
+        self.is_running = False
+        self.executor.shutdown(wait = True)
+
+        if not self.storage_path is None:
+            shutil.rmtree(self.storage_path, ignore_errors = True)
+            self.storage_path = None
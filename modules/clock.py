@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+"""
+Clock of the game: the frame loop and the sprites' sequences get the time and sleep through it instead of using
+the time module directly.
+
+The real clock follows the wall-clock time. The virtual clock only moves when the game advances it (once per
+frame, when a recorded session is replayed, see modules/replay.py): sleeping threads wake up when the virtual time
+reaches the end of their sleep, so a replay runs as fast as the frames can be computed.
+"""
+
+class RealClock:
+    """Wall-clock time."""
+
+    def now(self) -> float:
+        """Returns the current time in seconds."""
+
+        return time.perf_counter()
+
+    def sleep(self, duration: float) -> None:
+        time.sleep(duration)
+
+class VirtualClock:
+    """Time advanced manually by the game."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.time = start
+        self.condition = threading.Condition()
+
+    def now(self) -> float:
+        return self.time
+
+    def sleep(self, duration: float) -> None:
+        """Blocks the calling thread until the virtual time has advanced by the given duration (in seconds)."""
+
+        with self.condition:
+            end = self.time + duration
+            while self.time < end:
+                self.condition.wait()
+
+    def advance(self, duration: float) -> None:
+        """Advances the virtual time and wakes up the threads whose sleep is over."""
+
+        with self.condition:
+            self.time += duration
+            self.condition.notify_all()
+
+
+current_clock = RealClock()
+
+def set_clock(new_clock: object) -> None:
+    """Replaces the clock used by the game (RealClock or VirtualClock)."""
+    global current_clock
+
+    old_clock = current_clock
+    current_clock = new_clock
+
+    if isinstance(old_clock, VirtualClock): old_clock.advance(float("inf")) # releases the threads sleeping on it
+
+def now() -> float:
+    """Returns the current time of the game's clock in seconds."""
+
+    return current_clock.now()
+
+def sleep(duration: float) -> None:
+    """Sleeps for the given duration (in seconds) of the game's clock."""
+
+    current_clock.sleep(duration)
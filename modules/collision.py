@@ -0,0 +1,186 @@
+from modules import ecs
+
+
+"""
+Collisions of the entities moving in pixels (instead of tile by tile with Entity.set_pos).
+
+Entities get a "body" component: an axis aligned bounding box (x, y = top left corner in world pixels, w, h) and a
+velocity (vx, vy, in pixels per second). Once per logic tick, the collision system:
+- moves every body by its velocity with a swept test against the level's walls_map, one axis after the other,
+  every tile crossed during the tick is checked so fast bodies can't go through thin walls
+- finds the overlapping bodies with a uniform grid broadphase (each body is put in the cells it overlaps, only
+  bodies sharing a cell are tested) and reports each contact pair once
+- optionally refines the contacts with the hit masks of the entities' sprites (pixel accurate collisions)
+"""
+
+BODY_FIELDS = {"x": "d", "y": "d", "w": "d", "h": "d", "vx": "d", "vy": "d"}
+
+class CollisionSystem(ecs.System):
+    """System moving the bodies of a level and reporting their contacts."""
+
+    components = ("body",)
+    order = 100 # executed after the systems changing the velocities
+
+    def __init__(self, level_instance: object, cell_size: tuple = None, sync_sprites: bool = True, pixel_accurate: bool = False) -> None:
+        """
+        level_instance: Level
+        cell_size: tuple of 2 ints, size of the broadphase cells in pixels, defaults to 2x2 tiles
+        sync_sprites: bool, if the sprites of the moved entities are moved with their body
+        pixel_accurate: bool, if the contacts are checked with the hit masks of the entities' sprites
+        """
+
+        self.level_instance = level_instance
+        self.cell_size = cell_size if not cell_size is None else (level_instance.tile_scale[0] * 2, level_instance.tile_scale[1] * 2)
+        self.sync_sprites = sync_sprites
+        self.pixel_accurate = pixel_accurate
+
+        self.contacts = [] # pairs of entities overlapping during the last tick
+        self.wall_contacts = [] # entities stopped by a wall during the last tick
+
+        self.contacts_callback = None # function called with the contacts list at each tick (if not empty)
+
+
+    def is_wall(self, tile_x: int, tile_y: int) -> bool:
+        """Returns whether the tile is a wall, tiles outside of the level are walls."""
+
+        g_w, g_h = self.level_instance.grid_dimensions
+        if tile_x < 0 or tile_y < 0 or tile_x >= g_w or tile_y >= g_h: return True
+
+        return bool(self.level_instance.walls_map[tile_y][tile_x])
+
+    def sweep_axis(self, pos: float, size: float, delta: float, other_start: float, other_size: float, tile_size: int, other_tile_size: int, horizontal: bool) -> tuple:
+        """
+        Moves a box along one axis and stops it against the first wall crossed.
+
+        pos/size: position and size of the box on the moving axis
+        delta: movement on the moving axis
+        other_start/other_size: position and size of the box on the other axis
+        tile_size/other_tile_size: size of a tile on the moving axis and on the other one
+        horizontal: bool, if the moving axis is x
+
+        returns: tuple (new position, if a wall was hit)
+        """
+
+        first_row = int(other_start // other_tile_size)
+        last_row = int((other_start + other_size - 1e-6) // other_tile_size)
+
+        if delta > 0:
+            start = int((pos + size - 1e-6) // tile_size) + 1 # first tile after the leading edge
+            end = int((pos + size + delta - 1e-6) // tile_size)
+            columns = range(start, end + 1)
+        else:
+            start = int(pos // tile_size) - 1
+            end = int((pos + delta) // tile_size)
+            columns = range(start, end - 1, -1)
+
+        for column in columns:
+            for row in range(first_row, last_row + 1):
+                hit = self.is_wall(column, row) if horizontal else self.is_wall(row, column)
+                if not hit: continue
+
+                if delta > 0: return (column * tile_size - size, True)
+                return ((column + 1) * tile_size, True)
+
+        return (pos + delta, False)
+
+
+    def process(self, world: object, entities: list, indexes: dict, dt: float) -> None:
+        columns = world.components["body"].columns
+        xs, ys, ws, hs, vxs, vys = (columns[field] for field in ("x", "y", "w", "h", "vx", "vy"))
+
+        t_w, t_h = self.level_instance.tile_scale
+        sweep_axis = self.sweep_axis # avoids the attribute lookup in the loop
+
+        self.wall_contacts = []
+        moved = []
+
+        # ---------- movement, swept against the walls ----------
+
+        for entity, i in zip(entities, indexes["body"]):
+            dx = vxs[i] * dt
+            dy = vys[i] * dt
+            if dx == 0 and dy == 0: continue
+
+            if dx != 0:
+                xs[i], hit = sweep_axis(xs[i], ws[i], dx, ys[i], hs[i], t_w, t_h, True)
+                if hit:
+                    vxs[i] = 0
+                    self.wall_contacts += [entity]
+
+            if dy != 0:
+                ys[i], hit = sweep_axis(ys[i], hs[i], dy, xs[i], ws[i], t_h, t_w, False)
+                if hit:
+                    vys[i] = 0
+                    if not entity in self.wall_contacts: self.wall_contacts += [entity]
+
+            moved += [(entity, i)]
+
+        # ---------- broadphase, uniform grid ----------
+
+        c_w, c_h = self.cell_size
+        cells = {}
+        for body_index, i in enumerate(indexes["body"]):
+            x0, y0 = xs[i], ys[i]
+            x1, y1 = x0 + ws[i], y0 + hs[i]
+
+            for cell_x in range(int(x0 // c_w), int(x1 // c_w) + 1):
+                for cell_y in range(int(y0 // c_h), int(y1 // c_h) + 1):
+                    cell = cells.get((cell_x, cell_y))
+                    if cell is None: cells[(cell_x, cell_y)] = [body_index]
+                    else: cell.append(body_index)
+
+        # ---------- narrowphase ----------
+
+        body_indexes = indexes["body"]
+        tested = set()
+        contacts = []
+        for cell in cells.values():
+            cell_len = len(cell)
+            if cell_len < 2: continue
+
+            for a in range(cell_len):
+                body_a = cell[a]
+                i = body_indexes[body_a]
+                ax0, ay0 = xs[i], ys[i]
+                ax1, ay1 = ax0 + ws[i], ay0 + hs[i]
+
+                for b in range(a + 1, cell_len):
+                    body_b = cell[b]
+                    pair = (body_a, body_b) if body_a < body_b else (body_b, body_a)
+                    if pair in tested: continue # the pair shares several cells
+                    tested.add(pair)
+
+                    j = body_indexes[body_b]
+                    if xs[j] < ax1 and xs[j] + ws[j] > ax0 and ys[j] < ay1 and ys[j] + hs[j] > ay0:
+                        contacts += [(entities[pair[0]], entities[pair[1]])]
+
+        # ---------- synchronization of the entities ----------
+
+        if self.sync_sprites: self.sync_entities(moved, xs, ys, ws, hs)
+
+        if self.pixel_accurate: # the sprites are at the position of their body, compares their hit masks
+            contacts = [
+                (entity_a, entity_b) for entity_a, entity_b in contacts
+                if entity_a.sprite is None or entity_b.sprite is None or entity_a.sprite.overlaps(entity_b.sprite)
+            ]
+
+        self.contacts = contacts
+        if len(contacts) != 0 and not self.contacts_callback is None: self.contacts_callback(contacts)
+
+    def sync_entities(self, moved: list, xs: object, ys: object, ws: object, hs: object) -> None:
+        """Moves the sprites of the moved entities and updates their tile on the level's grid."""
+
+        level_instance = self.level_instance
+        t_w, t_h = level_instance.tile_scale
+        g_w, g_h = level_instance.grid_dimensions
+
+        for entity, i in moved:
+            # the tile of the entity is the one containing the center of its body
+            tile_x = min(max(int((xs[i] + ws[i] / 2) // t_w), 0), g_w - 1)
+            tile_y = min(max(int((ys[i] + hs[i] / 2) // t_h), 0), g_h - 1)
+
+            if (tile_x, tile_y) != entity.pos:
+                level_instance.move_grid_object(entity, entity.pos, (tile_x, tile_y))
+                entity.pos = (tile_x, tile_y)
+
+            if not entity.sprite is None: entity.sprite.move((xs[i], ys[i]))
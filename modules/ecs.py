@@ -0,0 +1,250 @@
+from array import array
+
+
+"""
+Component storage for the entities of a level, and the systems updating them once per logic tick.
+
+A component is declared with its fields, each field being stored in its own contiguous column (an array of the
+given typecode, or a list for python objects). Columns are kept packed: removing a component moves the last
+element in its place, so systems always iterate over dense data.
+
+A system declares the components it needs and is called once per tick with all the matching entities at once,
+it is meant to process them in batch (loop over the columns) instead of calling a method per entity.
+Systems are executed by order (then by insertion for equal orders).
+"""
+
+class ComponentStorage:
+    """Dense storage of one type of component."""
+
+    def __init__(self, name: str, fields: dict) -> None:
+        """
+        name: str, name of the component
+        fields: dict, typecode (see the array module, "d" for floats, "i" for ints, ...) by field name,
+        None stores the field in a list (python objects)
+        """
+
+        self.name = name
+        self.fields = fields
+
+        self.columns = {field: [] if typecode is None else array(typecode) for field, typecode in fields.items()}
+        self.entities = [] # entity owning the component at each index
+        self.indexes = {} # entity -> index in the columns
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def add(self, entity: object, values: dict) -> None:
+        """Adds (or replaces) the component of the given entity, missing fields default to 0/None."""
+
+        if entity in self.indexes:
+            index = self.indexes[entity]
+            for field, value in values.items():
+                self.columns[field][index] = value
+
+            return
+
+        self.indexes[entity] = len(self.entities)
+        self.entities += [entity]
+
+        for field, column in self.columns.items():
+            column.append(values.get(field, None if self.fields[field] is None else 0))
+
+    def remove(self, entity: object) -> bool:
+        """
+        Removes the component of the given entity, the last component is moved in its place.
+
+        returns: if the entity had the component
+        """
+
+        index = self.indexes.pop(entity, None)
+        if index is None: return False
+
+        last_index = len(self.entities) - 1
+        if index != last_index:
+            last_entity = self.entities[last_index]
+
+            self.entities[index] = last_entity
+            self.indexes[last_entity] = index
+
+            for column in self.columns.values():
+                column[index] = column[last_index]
+
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+
+        return True
+
+    def get(self, entity: object, field: str) -> object:
+        """Returns the value of a field of the entity's component."""
+
+        return self.columns[field][self.indexes[entity]]
+
+    def set(self, entity: object, field: str, value: object) -> None:
+        """Sets the value of a field of the entity's component."""
+
+        self.columns[field][self.indexes[entity]] = value
+
+    def clear(self) -> None:
+        """Removes every component."""
+
+        for column in self.columns.values():
+            del column[:]
+
+        self.entities = []
+        self.indexes = {}
+
+
+class System:
+    """
+    Parent class of the systems, override self.process.
+
+    components: tuple of str, names of the components an entity needs to be processed by the system
+    order: int, systems with a lower order are executed first
+    """
+
+    components = ()
+    order = 0
+
+    def process(self, world: object, entities: list, indexes: dict, dt: float) -> None:
+        """
+        Called once per logic tick with all of the matching entities.
+        Overridable function.
+
+        world: World
+        entities: list of the matching entities
+        indexes: dict, for each component of self.components, the list of the index of each entity in the
+        component's columns (in the same order as entities)
+        dt: float, time elapsed since the last tick in seconds
+        """
+
+        pass
+
+
+class World:
+    """Holds the components of the entities of a level and executes its systems."""
+
+    def __init__(self) -> None:
+        self.components = {} # name -> ComponentStorage
+        self.systems = []
+
+        self.version = 0 # incremented each time an entity gains/loses a component
+        self.queries_cache = {} # tuple of components names -> (version, entities, indexes)
+
+    def register_component(self, name: str, fields: dict) -> ComponentStorage:
+        """
+        Declares a type of component.
+
+        name: str
+        fields: dict, typecode by field name (see ComponentStorage)
+
+        returns: the ComponentStorage
+        """
+
+        if not name in self.components:
+            self.components[name] = ComponentStorage(name, fields)
+
+        return self.components[name]
+
+
+    def add_component(self, entity: object, name: str, values: dict) -> None:
+        """
+        Adds a component to an entity, or updates its values if it already has it.
+
+        entity: Entity
+        name: str, name of a registered component
+        values: dict, values of the fields
+        """
+
+        storage = self.components[name]
+        is_new = not entity in storage.indexes
+
+        storage.add(entity, values)
+
+        if is_new: self.version += 1
+
+    def remove_component(self, entity: object, name: str) -> bool:
+        """returns: if the entity had the component"""
+
+        if not self.components[name].remove(entity): return False
+
+        self.version += 1
+
+        return True
+
+    def remove_entity(self, entity: object) -> None:
+        """Removes every component of the given entity."""
+
+        for name in self.components:
+            self.remove_component(entity, name)
+
+    def has_component(self, entity: object, name: str) -> bool:
+        return entity in self.components[name].indexes
+
+    def get_component(self, entity: object, name: str) -> dict:
+        """Returns the values of an entity's component as a dict (copy), None if it doesn't have it."""
+
+        storage = self.components[name]
+        if not entity in storage.indexes: return None
+
+        index = storage.indexes[entity]
+
+        return {field: column[index] for field, column in storage.columns.items()}
+
+
+    def query(self, names: tuple) -> tuple:
+        """
+        Returns the entities having all of the given components, and their indexes in each component's columns.
+        Results are cached until an entity gains/loses a component.
+
+        names: tuple of str
+
+        returns: tuple (list of entities, dict of lists of indexes by component name)
+        """
+
+        cached = self.queries_cache.get(names)
+        if not cached is None and cached[0] == self.version: return cached[1], cached[2]
+
+        storages = [self.components[name] for name in names]
+        if len(storages) == 0: return [], {}
+
+        smallest = min(storages, key = len) # iterates over the smallest storage, O(its size)
+        entities = [entity for entity in smallest.entities if all(entity in storage.indexes for storage in storages)]
+        indexes = {storage.name: [storage.indexes[entity] for entity in entities] for storage in storages}
+
+        self.queries_cache[names] = (self.version, entities, indexes)
+
+        return entities, indexes
+
+
+    def add_system(self, system: System) -> None:
+        """Adds a system, executed at each tick according to its order."""
+
+        self.systems += [system]
+        self.systems.sort(key = lambda elt: elt.order) # stable sort, keeps the insertion order for equal orders
+
+    def remove_system(self, system: System) -> None:
+        if system in self.systems: self.systems.remove(system)
+
+    def tick(self, dt: float) -> None:
+        """
+        Executes every system once, in their declared order.
+
+        dt: float, time elapsed since the last tick in seconds
+        """
+
+        for system in list(self.systems):
+            entities, indexes = self.query(tuple(system.components))
+
+            if len(system.components) != 0 and len(entities) == 0: continue # nothing to process
+
+            system.process(self, entities, indexes, dt)
+
+    def clear(self) -> None:
+        """Removes every component, registered components and systems are kept."""
+
+        for storage in self.components.values():
+            storage.clear()
+
+        self.version += 1
+        self.queries_cache = {}
@@ -30,6 +30,8 @@ class Entity:
         self.is_shown = False
         self.collision = False
 
+        self.tags = set() # voir self.add_tag
+
     def __init__(self, level_instance: object, pos: tuple):
         """Doit absolument appeler self.initialize(level_instance, pos)."""
 
@@ -62,6 +64,29 @@ class Entity:
         y_coords = tile_scale_ref[1]/2 + tile_scale_ref[1] * self.pos[1]
 
         self.sprite.move((x_coords, y_coords))
+
+    def glide_to(self, new_pos: tuple, duration: float, easing: str = "linear", callback: object = None):
+        """
+        comme set_pos, mais le sprite glisse jusqu'au centre de la case au lieu d'y être téléporté (voir modules/tween.py)
+        la position sur la grille change immédiatement
+
+        new_pos: tuple de 2 ints, coordonnées de la case
+        duration: float, durée du déplacement en secondes
+        easing: str, nom de la courbe d'accélération (clé de tween.EASINGS)
+        callback: fonction appelée sans arguments à l'arrivée
+        """
+
+        if self.collision:
+            if not self.level_instance.check_tile_availible(new_pos): return
+        self.level_instance.move_grid_object(self, self.pos, new_pos)
+
+        self.pos = new_pos
+
+        tile_scale_ref = self.level_instance.tile_scale # optimisation
+        x_coords = tile_scale_ref[0]/2 + tile_scale_ref[0] * self.pos[0]
+        y_coords = tile_scale_ref[1]/2 + tile_scale_ref[1] * self.pos[1]
+
+        self.level_instance.tweens.add(self.sprite, "pos", (x_coords, y_coords), duration, easing, callback)
     
 
     def set_sprite(self, new_model: dict, start_image: str, sprite_scale: tuple, sprite_displacement: tuple = (0, 0)):
@@ -76,11 +101,9 @@ class Entity:
             start_image,
             (0, 0),
             (self.scale[i] * sprite_scale[i] for i in range(2)),
-            sprite_displacement
+            sprite_displacement,
+            self.is_shown
         )
-
-        if self.is_shown: self.sprite.show()
-        else: self.sprite.hide()
     
     
     def show(self):
@@ -89,16 +112,87 @@ class Entity:
         self.is_shown = True
         self.sprite.show()     
 
-    def hide(self):
-        """cache l'entité de l'écran"""
+    def hide(self, keep_item: bool = False):
+        """
+        cache l'entité de l'écran
+
+        keep_item: bool, si True l'image du sprite est seulement cachée sur le canvas (voir Sprite.hide)
+        """
 
         self.is_shown = False
-        self.sprite.hide()
+        self.sprite.hide(keep_item)
     
     def set_collision(self,collision):
         """définis si l'objet a des collisions ou non"""
 
         self.collision = collision
     
+    def add_tag(self, *tags: str):
+        """
+        ajoute des tags à l'entité (ex: "ennemi", "projectile"), le niveau tient un index des entités par tag
+        pour les retrouver sans parcourir tous ses objets (voir Level.find)
+        """
+
+        for tag in tags:
+            if tag in self.tags: continue
+
+            self.tags.add(tag)
+            self.level_instance.update_object_tag(self, tag, True)
+
+    def remove_tag(self, *tags: str):
+        """retire des tags de l'entité"""
+
+        for tag in tags:
+            if not tag in self.tags: continue
+
+            self.tags.discard(tag)
+            self.level_instance.update_object_tag(self, tag, False)
+
+    def has_tag(self, tag: str) -> bool:
+        return tag in self.tags
+
+    def add_component(self, name: str, **values):
+        """
+        ajoute un composant à l'entité (ou modifie ses valeurs), voir modules/ecs.py
+
+        name: str, nom d'un composant déclaré dans le monde du niveau (level_instance.world)
+        values: valeurs des champs du composant
+        """
+
+        self.level_instance.world.add_component(self, name, values)
+
+    def get_component(self, name: str) -> dict:
+        """renvoie une copie des valeurs du composant, None si l'entité ne l'a pas"""
+
+        return self.level_instance.world.get_component(self, name)
+
+    def remove_component(self, name: str) -> bool:
+        """retire un composant de l'entité, renvoie si elle l'avait"""
+
+        return self.level_instance.world.remove_component(self, name)
+
+
+    def get_state(self) -> tuple:
+        """renvoie l'état de l'entité sous forme de tuple (utilisé par les snapshots, voir modules/snapshot.py)"""
+
+        sprite_state = None if self.sprite is None else self.sprite.get_state()
+
+        return (self.pos, self.scale, self.is_shown, self.collision, sprite_state)
+
+    def set_state(self, state: tuple):
+        """
+        restaure un état renvoyé par self.get_state, sans recréer le sprite
+        (la position sur la grille du niveau est restaurée par le snapshot)
+        """
+
+        self.pos, self.scale, self.is_shown, self.collision, sprite_state = state
+
+        if not sprite_state is None and not self.sprite is None: self.sprite.set_state(sprite_state)
+
     def destroy(self):
-        self.hide()
\ No newline at end of file
+        self.hide()
+
+        if not self.sprite is None: self.level_instance.tweens.cancel(self.sprite)
+
+        self.level_instance.world.remove_entity(self)
+        self.level_instance.unindex_object(self)
\ No newline at end of file
@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+
+"""
+Atomic writes of the files created by the game (settings, caches, traces).
+
+The content is written in a temporary file of the same folder, which then replaces the file in a single operation:
+a reader (or the game after a crash) sees the previous file or the complete new one, never a partially written one.
+"""
+
+default_file_mode = 0o644 # permissions of a newly created file
+
+def write_atomically(path: str, write_function: object, binary: bool = False, sync: bool = False) -> None:
+    """
+    Writes a file atomically. On failure the temporary file is removed and the exception is raised.
+
+    path: str, path of the file
+    write_function: function called with the opened temporary file, writes the content
+    binary: bool, if the temporary file is opened in binary mode
+    sync: bool, if the content is flushed to the disk before replacing the file (kept after a system crash)
+    """
+
+    file_descriptor, temp_path = tempfile.mkstemp(prefix = "." + os.path.basename(path) + "_", suffix = ".tmp", dir = os.path.dirname(path) or ".")
+
+    try: # mkstemp creates the file readable by its owner only, it gets the mode of the replaced file
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = default_file_mode
+
+    try:
+        with os.fdopen(file_descriptor, "wb" if binary else "w") as file:
+            write_function(file)
+
+            file.flush()
+            os.chmod(temp_path, mode)
+            if sync: os.fsync(file.fileno())
+
+        os.replace(temp_path, path)
+
+    except:
+        if os.path.exists(temp_path): os.remove(temp_path)
+        raise
@@ -0,0 +1,104 @@
+"""
+A hit mask is the bit-packed alpha channel of an image: one bit per pixel (1 if the pixel is opaque enough), rows
+padded to a whole number of bytes, most significant bit first (the format of the PIL "1" mode).
+
+It is built once per transformed image (see Sprite.set_current_image) and makes pixel-accurate hit tests a
+single bit lookup, and mask/mask overlap tests a few integer operations per row.
+"""
+
+class HitMask:
+    """Bit-packed opacity mask of an image."""
+
+    def __init__(self, data: bytes, size: tuple) -> None:
+        """
+        data: bytes, packed bits (PIL "1" mode)
+        size: tuple of 2 ints, width and height of the image
+        """
+
+        self.data = data
+        self.width, self.height = size
+        self.row_size = (self.width + 7) // 8 # in bytes
+
+        self.rows = None # rows as ints, built on the first overlap test
+
+    def test(self, x: int, y: int) -> bool:
+        """Returns whether the pixel at the given coordinates (relative to the image) is opaque."""
+
+        if x < 0 or y < 0 or x >= self.width or y >= self.height: return False
+
+        return (self.data[y * self.row_size + (x >> 3)] >> (7 - (x & 7))) & 1 == 1
+
+    def get_rows(self) -> list:
+        """Returns the rows of the mask as ints, the first pixel of a row being its most significant bit."""
+
+        if self.rows is None:
+            row_size = self.row_size
+            self.rows = [int.from_bytes(self.data[y * row_size:(y + 1) * row_size], "big") for y in range(self.height)]
+
+        return self.rows
+
+    def overlaps(self, other: object, offset: tuple) -> bool:
+        """
+        Returns whether an opaque pixel of this mask overlaps an opaque pixel of the other one.
+
+        other: HitMask
+        offset: tuple of 2 ints, position of the other mask relative to this one
+        """
+
+        dx, dy = offset
+
+        first_y = max(0, dy)
+        last_y = min(self.height, other.height + dy)
+        if first_y >= last_y or dx >= self.width or dx + other.width <= 0: return False
+
+        rows = self.get_rows()
+        other_rows = other.get_rows()
+
+        # aligns the bits of the other mask's pixels with this mask's ones
+        shift = self.row_size * 8 - other.row_size * 8 - dx
+
+        for y in range(first_y, last_y):
+            other_row = other_rows[y - dy]
+            other_row = other_row << shift if shift >= 0 else other_row >> -shift
+
+            if rows[y] & other_row: return True
+
+        return False
+
+    def overlaps_rect(self, rect: tuple) -> bool:
+        """
+        Returns whether an opaque pixel of the mask is inside of the given rectangle.
+
+        rect: tuple of 4 ints, x0, y0, x1, y1 (x1 and y1 excluded), relative to the mask
+        """
+
+        x0, y0 = max(rect[0], 0), max(rect[1], 0)
+        x1, y1 = min(rect[2], self.width), min(rect[3], self.height)
+        if x0 >= x1 or y0 >= y1: return False
+
+        rows = self.get_rows()
+        rect_bits = ((1 << (x1 - x0)) - 1) << (self.row_size * 8 - x1)
+
+        for y in range(y0, y1):
+            if rows[y] & rect_bits: return True
+
+        return False
+
+
+def build_hit_mask(image: object, threshold: int = 0) -> HitMask:
+    """
+    Builds the hit mask of the given PIL image.
+
+    image: PIL Image
+    threshold: int, pixels with an alpha above it are opaque
+
+    returns: the HitMask, None if the image has no transparency (it's opaque everywhere)
+    """
+
+    if image.mode in ("RGBA", "LA", "PA"): alpha = image.getchannel("A")
+    elif "transparency" in image.info: alpha = image.convert("RGBA").getchannel("A")
+    else: return None
+
+    mask = alpha.point(lambda value: 255 if value > threshold else 0, "1")
+
+    return HitMask(mask.tobytes(), mask.size)
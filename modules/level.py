@@ -1,10 +1,14 @@
 import tkinter as tk
 import threading
 from time import sleep
+from PIL import Image
+
+from modules import camera, chunks, collision, ecs, level_data, replay, snapshot, sprite, trace, tween, work_queue
 
 
 """
-A grid map is a 2D list containing the tiles' entities and sprites in a list.
+A grid map is a 2D grid (indexed [y][x]) containing the tiles' entities and sprites in a list.
+Its rows and tiles are created when first accessed (see GridMap), so large levels don't allocate a list per tile.
 
 IT SHOULD ONLY HAVE ENTITIES.
 """
@@ -15,6 +19,82 @@ IT SHOULD ONLY HAVE ENTITIES.
 funcs_exec_queue = {}
 funcs_exec_queue_availible = {}
 
+# named layers of the canvases: name -> z index, the items of a layer are drawn above the ones of lower layers
+# (see LevelCanvas.add_to_layer), the draw order inside of a layer is the creation order of the items
+default_layers = {"background": 0, "main": 100, "ui": 200}
+
+def get_layer_tag(layer: str) -> str:
+    """Returns the canvas tag of the items of a layer."""
+
+    return "layer:" + layer
+
+def get_grid_index(index: int, size: int) -> int:
+    """Returns the index of a row/tile of the grid map (negative indexes count from the end, like in a list)."""
+
+    if index < 0: index += size
+    if index < 0 or index >= size: raise IndexError("grid map index out of range")
+
+    return index
+
+class GridRow:
+    """Row of a GridMap, the list of a tile is created when the tile is first accessed."""
+
+    __slots__ = ("width", "tiles")
+
+    def __init__(self, width: int) -> None:
+        self.width = width
+        self.tiles = {} # x -> list of the objects on the tile
+
+    def __getitem__(self, x: int) -> list:
+        x = get_grid_index(x, self.width)
+
+        tile = self.tiles.get(x)
+        if tile is None:
+            tile = []
+            self.tiles[x] = tile
+
+        return tile
+
+    def __setitem__(self, x: int, tile: list) -> None:
+        self.tiles[get_grid_index(x, self.width)] = tile
+
+    def __len__(self) -> int:
+        return self.width
+
+    def __iter__(self) -> object:
+        """Yields the tiles of the row, the tiles that were never accessed are yielded as empty tuples."""
+
+        for x in range(self.width):
+            yield self.tiles.get(x, ())
+
+class GridMap:
+    """Grid of the objects on each tile, indexed [y][x] as a list of lists. Rows are created when first accessed."""
+
+    __slots__ = ("dimensions", "rows")
+
+    def __init__(self, dimensions: tuple) -> None:
+        """dimensions: tuple of 2 ints, number of tiles in x and y"""
+
+        self.dimensions = dimensions
+        self.rows = {} # y -> GridRow
+
+    def __getitem__(self, y: int) -> GridRow:
+        y = get_grid_index(y, self.dimensions[1])
+
+        row = self.rows.get(y)
+        if row is None:
+            row = GridRow(self.dimensions[0])
+            self.rows[y] = row
+
+        return row
+
+    def __len__(self) -> int:
+        return self.dimensions[1]
+
+    def __iter__(self) -> object:
+        for y in range(self.dimensions[1]):
+            yield self[y]
+
 class Level:
     """
     Parent class of other levels, allows these to have a predefined template and possibility to override/add
@@ -25,12 +105,15 @@ class Level:
     create(self) - has to call the self.create_render_frame() func
     """
     
-    def initialize(self, game_instance: object, grid_dimensions: tuple) -> None:
+    def initialize(self, game_instance: object, grid_dimensions: tuple, tile_scale: tuple = None, data: object = None) -> None:
         """
         Mandatory function to be executed in the init of any level, makes sure all attributes of the class
         are at least created so that there is no error.
 
         grid_dimensions: tuple of 2 ints, number of tiles of the game grid, x and y
+        tile_scale: tuple of 2 ints, size of a tile in pixels, by default the grid fits the window. If the level
+        is larger than the window, the camera (self.camera) scrolls over it.
+        data: LevelData, walls and tiles of the level (see self.initialize_from_data)
 
         Note: the grid system is used to prevent unecessary for loops when lookings for objects using their coordinates.
         """
@@ -43,15 +126,47 @@ class Level:
         
         self.type = "level"
         self.frame = None
+        self.offscreen_creation = False # if True, the frame isn't shown when created (see self.show_render_frame)
 
-        game_scale = self.game_instance.frame_size
-        tile_scale = (int(game_scale[0] / grid_dimensions[0]), int(game_scale[0] / grid_dimensions[1]))
+        if tile_scale is None:
+            game_scale = self.game_instance.frame_size
+            tile_scale = (int(game_scale[0] / grid_dimensions[0]), int(game_scale[0] / grid_dimensions[1]))
  
         self.tile_scale = tile_scale
         self.grid_dimensions = grid_dimensions
+        self.world_size = (tile_scale[0] * grid_dimensions[0], tile_scale[1] * grid_dimensions[1])
+
+        self.camera = None # created with the render frame
+
+        self.world = ecs.World() # components of the entities and systems executed at each logic tick
+        self.tweens = tween.TweenEngine() # movements of the sprites, advanced at each logic tick
+        self.objects_lock = threading.Lock() # held while self.objects is modified from another thread
+        self.index_lock = threading.Lock() # held while the objects' indexes are modified
+        self.chunk_streamer = None # ChunkStreamer object if the level is streamed (see self.enable_chunk_streaming)
 
         self.init_data()
-        self.walls_map = [[False for _ in range(self.grid_dimensions[0])] for _ in range(self.grid_dimensions[1])]
+
+        self.level_data = data # LevelData object if the level has been initialized from a level data file
+        if data is None:
+            self.walls_map = [[False for _ in range(self.grid_dimensions[0])] for _ in range(self.grid_dimensions[1])]
+            self.tiles_map = None # tiles' models indexes (see modules/level_data.py), [y][x]
+        else: # rows are views of the mapped file, nothing is allocated per tile
+            self.walls_map = data.get_rows(data.walls)
+            self.tiles_map = data.get_rows(data.tiles)
+
+    def initialize_from_data(self, game_instance: object, path: str) -> None:
+        """
+        Can be used instead of self.initialize, takes the grid dimensions, the tiles' scale, the walls and the
+        tiles from a level data file (see modules/level_data.py). The walls_map/tiles_map rows are views of the
+        mapped file and the grid map's tiles are created when accessed, so the loading time doesn't depend on the
+        number of tiles of the level.
+
+        path: str, path of the level data file
+        """
+
+        data = level_data.load_level_data(path)
+
+        self.initialize(game_instance, data.grid_dimensions, data.tile_scale, data)
 
     def init_data(self) -> None:
         """Creates/clears the sounds/binds/objects/grid_map dict."""
@@ -59,7 +174,12 @@ class Level:
         self.sounds = {}
 
         self.objects = [] # stores the entities/UI/sprites
-        self.grid_map = [[[] for _ in range(self.grid_dimensions[0])] for _ in range(self.grid_dimensions[1])]        
+        self.objects_by_type = {} # type -> dict of the objects of this type (used as an ordered set)
+        self.objects_by_tag = {} # tag -> dict of the entities having this tag (used as an ordered set)
+        self.grid_map = GridMap(self.grid_dimensions)
+
+        self.world.clear()
+        self.tweens.clear()
 
     def __init__(self, game_instance: object) -> None:
         """
@@ -109,6 +229,165 @@ class Level:
         return self.walls_map[y][x]
     
 
+    def add_objects(self, objects: list) -> None:
+        """Adds the given objects to self.objects and to the indexes used by self.find (can be called from any thread)."""
+
+        with self.objects_lock:
+            self.objects += objects
+
+        for obj in objects:
+            self.index_object(obj)
+
+    def remove_objects(self, objects: list) -> None:
+        """Removes the given objects from self.objects and from the indexes, doesn't destroy them."""
+
+        removed = set(id(obj) for obj in objects)
+
+        with self.objects_lock:
+            self.objects = [obj for obj in self.objects if not id(obj) in removed]
+
+        for obj in objects:
+            self.unindex_object(obj)
+
+    def index_object(self, obj: object) -> None:
+        """Adds the object to the type and tag indexes, self.add_objects already does it."""
+
+        with self.index_lock:
+            self.objects_by_type.setdefault(obj.type, {})[obj] = None
+
+            for tag in getattr(obj, "tags", ()):
+                self.objects_by_tag.setdefault(tag, {})[obj] = None
+
+    def unindex_object(self, obj: object) -> None:
+        """Removes the object from the type and tag indexes (when it is destroyed or released in a pool)."""
+
+        with self.index_lock:
+            typed = self.objects_by_type.get(obj.type)
+            if typed is None or not obj in typed: return
+
+            del typed[obj]
+
+            for tag in getattr(obj, "tags", ()):
+                tagged = self.objects_by_tag.get(tag)
+                if tagged is None: continue
+
+                tagged.pop(obj, None)
+                if len(tagged) == 0: del self.objects_by_tag[tag]
+
+    def update_object_tag(self, obj: object, tag: str, added: bool) -> None:
+        """Internal function called by Entity.add_tag/remove_tag, keeps the tag index up to date."""
+
+        with self.index_lock:
+            if not obj in self.objects_by_type.get(obj.type, ()): return # not indexed, its tags are indexed when it is
+
+            if added:
+                self.objects_by_tag.setdefault(tag, {})[obj] = None
+                return
+
+            tagged = self.objects_by_tag.get(tag)
+            if tagged is None: return
+
+            tagged.pop(obj, None)
+            if len(tagged) == 0: del self.objects_by_tag[tag]
+
+    def find(self, object_type: str = None, tag: str = None, components: tuple = ()) -> list:
+        """
+        Returns the objects matching every given criterion, in the order they were indexed.
+        Only the smallest set of matching objects (of a criterion) is iterated over, the cost doesn't depend on
+        the number of objects of the level.
+
+        object_type: str, type of the objects ("entity", "sprite", ...), ignored if None
+        tag: str, tag the entities must have (see Entity.add_tag), ignored if None
+        components: tuple of str, components the entities must have (see self.world)
+
+        returns: list of the objects
+        """
+
+        with self.index_lock:
+            criteria = []
+            if not object_type is None: criteria += [self.objects_by_type.get(object_type, {})]
+            if not tag is None: criteria += [self.objects_by_tag.get(tag, {})]
+            for name in components:
+                storage = self.world.components.get(name)
+                criteria += [{} if storage is None else storage.indexes] # entity -> index, used as a set
+
+            if len(criteria) == 0: return list(self.objects)
+
+            criteria.sort(key = len)
+            smallest, others = criteria[0], criteria[1:]
+
+            return [obj for obj in smallest if all(obj in other for other in others)]
+
+    def tick(self, dt: float) -> None:
+        """
+        Logic tick of the level, executed once per frame by the game inside of the tkinter thread.
+        Advances the tweens, then executes the systems of self.world in their declared order.
+
+        dt: float, time elapsed since the last tick in seconds
+        """
+
+        self.tweens.step(dt)
+        self.world.tick(dt)
+
+    def enable_collisions(self, cell_size: tuple = None, pixel_accurate: bool = False) -> object:
+        """
+        Registers the "body" component and adds the collision system to self.world (see modules/collision.py),
+        used by entities moving in pixels.
+
+        cell_size: tuple of 2 ints, size of the broadphase cells in pixels
+        pixel_accurate: bool, if the contacts are refined with the hit masks of the entities' sprites
+
+        returns: the CollisionSystem object (its contacts attribute holds the contact pairs of the last tick)
+        """
+
+        self.world.register_component("body", collision.BODY_FIELDS)
+
+        for system in self.world.systems:
+            if isinstance(system, collision.CollisionSystem): return system
+
+        collision_system = collision.CollisionSystem(self, cell_size, pixel_accurate = pixel_accurate)
+        self.world.add_system(collision_system)
+
+        return collision_system
+
+
+    def enable_chunk_streaming(self, create_function: object, chunk_size: tuple = (16, 16), load_radius: int = 1) -> object:
+        """
+        Makes the level load its objects chunk by chunk around a focus point instead of all at once
+        (see modules/chunks.py). Call self.chunk_streamer.set_focus(tile_pos) when the focus (player, camera, ...) moves.
+
+        create_function: function called in the tkinter thread with the tiles rect of a chunk, returns the created objects,
+        for example: lambda rect: self.create_from_data(models, factories, rect)
+        chunk_size: tuple of 2 ints, size of a chunk in tiles
+        load_radius: int, chunks at this distance (in chunks) of the focus are loaded
+
+        returns: the ChunkStreamer object
+        """
+
+        self.chunk_streamer = chunks.ChunkStreamer(self, create_function, chunk_size, load_radius)
+
+        return self.chunk_streamer
+
+
+    def take_snapshot(self, base: object = None) -> object:
+        """
+        Returns a snapshot of the level's state (see modules/snapshot.py), used for checkpoints/quick-saves/rewind.
+
+        base: Snapshot, if given, only the changes since this snapshot are stored
+        """
+
+        return snapshot.take_snapshot(self, base)
+
+    def restore_snapshot(self, level_snapshot: object) -> None:
+        """
+        Restores a snapshot taken on this level, without recreating its objects.
+
+        level_snapshot: Snapshot
+        """
+
+        snapshot.restore_snapshot(self, level_snapshot)
+    
+
     def add_bind(self, command: str, callback) -> None:
         """
         Adds a bind.
@@ -140,30 +419,140 @@ class Level:
         Function that creates the background frame of a level when called.
         Mandatory.
 
-        Modifies the value of self.frame
+        Modifies the value of self.frame and self.camera
+        When the level is prepared in the background (self.offscreen_creation), the frame is built off-screen and
+        only shown by self.show_render_frame().
         """
         global funcs_exec_queue, funcs_exec_queue_availible
 
         game_inst = self.game_instance # for simplification purposes
 
-        game_inst.is_ingame = True
+        if not self.offscreen_creation: game_inst.is_ingame = True
         tk_thrd_id = self.game_instance.tkinter_thread_id        
         w, h = game_inst.frame_size
 
+        self.frame = None # the frame of a previous creation may still be referenced
+
+        if getattr(game_inst, "headless", False): # rendered without a window (see self.render_thumbnail)
+            self.camera = None
+            self.frame = HeadlessCanvas(tk_thrd_id, (w, h))
+            return
+
         def create_level_canvas(): # ghost func
-            self.frame = LevelCanvas(game_inst.frame, w = w, h = h)
-            self.frame.place(x = 0, y = 0, anchor = "nw")
+            frame = LevelCanvas(game_inst.frame, w = w, h = h)
+            if not self.offscreen_creation: frame.place(x = 0, y = 0, anchor = "nw")
 
-            self.frame.tkinter_thread_id = tk_thrd_id
+            frame.tkinter_thread_id = tk_thrd_id
+            frame.name = "level" # target of the recorded events
+            frame.synchronous_transforms = self.offscreen_creation # the images are ready when the level is swapped in
+
+            # the camera has to exist before self.frame is assigned, sprites created right after register in it
+            self.camera = camera.Camera(frame, self.world_size, (w, h))
+            self.frame = frame
 
         if not threading.get_ident() == game_inst.tkinter_render_thread.ident: # if this func is not executed inside of the tkinter thread
             funcs_exec_queue[tk_thrd_id] += [create_level_canvas] # pushes the function into the exec queue
 
-            while self.frame is None: sleep(0.01) # made to ensure that next calls will be able to use the canvas
+            while self.frame is None: # made to ensure that next calls will be able to use the canvas
+                if not game_inst.is_running: raise RuntimeError("The game stopped before the level's canvas was created.")
+                sleep(0.01)
         else:
             if self.game_instance.debug: print("----- Internal priority request: canvas creation (level)")
             create_level_canvas()
 
+    def show_render_frame(self) -> None:
+        """
+        Shows the frame of a level created off-screen, on top of the other widgets.
+        Internal function called inside of the tkinter main thread.
+        """
+
+        self.frame.place(x = 0, y = 0, anchor = "nw")
+        self.frame.lift()
+
+        self.frame.synchronous_transforms = False
+        self.offscreen_creation = False
+
+    def create_from_data(self, models: dict, factories: dict = None, rect: tuple = None) -> list:
+        """
+        Creates the sprites of the tiles and spawns the entities described by the level data.
+        Has to be called in self.create, after self.create_render_frame().
+
+        models: dict, model dicts by their reference in the level data, tiles use the first image of their model
+        factories: dict, functions by spawn kind, called with the level, the model and the spawn's coordinates
+        (tuple of 2 ints), that return the spawned entity
+        rect: tuple of 4 ints, x0, y0, x1, y1 (excluded) tiles coordinates, only creates the objects inside of it
+        (used to create the level chunk by chunk), the whole grid if None
+
+        returns: the list of the created objects (also added to self.objects)
+        """
+
+        if factories is None: factories = {}
+        if rect is None: rect = (0, 0, self.grid_dimensions[0], self.grid_dimensions[1])
+
+        data = self.level_data
+        names = data.names
+        x0, y0, x1, y1 = rect
+
+        t_w, t_h = self.tile_scale
+
+        created = []
+        for y in range(y0, y1):
+            row = self.tiles_map[y]
+
+            for x in range(x0, x1):
+                model_index = row[x]
+                if model_index == 0: continue # no tile
+
+                model = models[names[model_index - 1]]
+
+                created += [sprite.Sprite(self.frame, model, next(iter(model["images"])), (x * t_w, y * t_h), (t_w, t_h))]
+
+        for kind, model_name, (x, y) in data.get_spawns():
+            if x < x0 or x >= x1 or y < y0 or y >= y1: continue
+
+            spawned_entity = factories[kind](self, models[model_name], (x, y))
+
+            created += [spawned_entity]
+            self.grid_map[y][x] += [spawned_entity]
+
+        self.add_objects(created) # chunks can be created by several threads
+
+        return created
+
+    def render_thumbnail(self, size: tuple) -> object:
+        """
+        Renders the level without a window and returns its thumbnail (PIL image of the given size).
+        Executed by the thumbnails' worker processes with a headless game instance (see modules/thumbnails.py).
+        Overridable function, the default one creates the level and draws its first frame.
+
+        size: tuple of 2 ints
+        """
+
+        if not self.thumbnail is None: return self.thumbnail.resize(size)
+
+        self.prepare()
+        self.create()
+
+        # executes the queued functions (sprites' images), the headless canvas records the sprites to draw
+        tk_thrd_id = self.game_instance.tkinter_thread_id
+        queues = [funcs_exec_queue[tk_thrd_id], sprite.funcs_exec_queue[tk_thrd_id]]
+        while any(len(queue) != 0 for queue in queues):
+            work_queue.execute(queues, float("inf"))
+
+        image = self.frame.render().resize(size)
+
+        self.destroy()
+
+        return image
+
+    def prepare(self) -> None:
+        """
+        Executed in a background thread before self.create() while the current level/menu keeps running.
+        Override this function to load the assets of your level (decode images, load level data, ...).
+        """
+
+        pass
+
     def create(self) -> None:
         """
         Creates the level and its render context.
@@ -178,19 +567,89 @@ class Level:
     def destroy(self) -> None:
         """
         Removes every objects from the level and destroys its frame.
+        The frame is destroyed first: its items are then deleted at once (delete("all")) instead of one by one.
         """
 
         for sound in self.sounds.values():
             sound.stop()
+
+        if not self.chunk_streamer is None: # waits for the chunks being loaded before destroying the objects
+            self.chunk_streamer.shutdown()
+            self.chunk_streamer = None
+
+        if not self.frame is None: self.frame.destroy() # None if the level failed to load before creating it
+
         for obj in self.objects:
             obj.destroy()
 
         self.init_data()
 
-        self.frame.destroy()
-        self.game_instance.is_ingame = False
+        self.camera = None
+        self.frame = None
+        if getattr(self.game_instance, "current_level", None) is self: self.game_instance.is_ingame = False
+
+
+
+class HeadlessCanvas:
+    """
+    Replaces the LevelCanvas of a level rendered without a window (see Level.render_thumbnail).
+    Sprites drawn on it are recorded instead of creating canvas items, self.render composes them on a PIL image.
+    """
+
+    headless = True
+    synchronous_transforms = True # the level is rendered once its creation is over
+
+    def __init__(self, tkinter_thread_id: int, size: tuple) -> None:
+        self.tkinter_thread_id = tkinter_thread_id
+        self.size = size
+
+        self.destroyed = False
+        self.camera = None
+        self.layers = dict(default_layers)
+
+        self.sprites = {} # sprite -> None, in creation order (used as an ordered set)
+        self.sequenced_sprites = [] # sprites which started a sequence, their threads are stopped by self.destroy
+
+    def draw_sprite(self, sprite_ref: object) -> None:
+        """Called by Sprite.change_image, a new sprite is drawn above the others of its layer."""
+
+        if not sprite_ref in self.sprites: self.sprites[sprite_ref] = None
+
+    def render(self) -> object:
+        """Returns the PIL image of the shown sprites."""
+
+        image = Image.new("RGBA", self.size, (0, 0, 0, 255))
+        for sprite_ref in sorted(self.sprites, key = lambda sprite_ref: self.layers.get(sprite_ref.layer, 0)): # stable sort
+            if not sprite_ref.is_shown or sprite_ref.current_image is None: continue
+
+            sprite_image = sprite_ref.current_image.convert("RGBA")
+            x, y = sprite_ref.composed_coordinates
+            image.paste(sprite_image, (int(x), int(y)), sprite_image)
+
+        return image
+
+    # the canvas functions used by the sprites and the level, without effects
+    def bind(self, command: str, callback: object, ref: object) -> None: pass
+    def unbind(self, command: str, ref: object) -> None: pass
+    def set_scroll_region(self, size: tuple) -> None: pass
+    def scroll_to(self, pos: tuple) -> None: pass
+    def set_layer(self, layer: str, z_index: int) -> None: self.layers[layer] = z_index
+    def add_to_layer(self, items: list, layer: str = "main") -> None: pass
+    def move_to_layer(self, item: int, old_layer: str, layer: str) -> None: pass
+
+    def add_sequence(self, sprite_ref: object) -> None:
+        """Called by Sprite.start_sequence, looping sequences would otherwise keep the worker process alive."""
+
+        self.sequenced_sprites += [sprite_ref]
 
+    def destroy(self) -> None:
+        for sprite_ref in self.sequenced_sprites: # the level's objects don't contain every sprite (attributes of the level)
+            sprite_ref.sequence_generation += 1 # the thread exits at its next step
+            sprite_ref.sequence_resume_event.set() # wakes a culled sprite's thread
 
+        self.destroyed = True
+        self.sprites = {}
+        self.sequenced_sprites = []
 
 class LevelCanvas (tk.Canvas):
     """Adds functionnalities to the tkinter canvas class (makes possible the handling of several funcs for the same bind)."""
@@ -203,15 +662,91 @@ class LevelCanvas (tk.Canvas):
         self.configure(border = False)
 
         self.destroyed = False
+        self.headless = False # see HeadlessCanvas
+        self.synchronous_transforms = False # if the sprites' images are transformed in the calling thread (see Sprite.set_current_image)
+        self.name = None # identifies the canvas in the recorded sessions (see modules/replay.py)
+
+        self.camera = None # set by the camera of the level, if one
+        self.scroll_size = (w, h) # size of the scrollregion
+        self.view_offset = (0, 0) # world coordinates of the top left corner of the view
+        self.pending_view_offset = None # view offset waiting to be applied in the tkinter thread
+
+        self.layers = dict(default_layers) # name -> z index
+        self.layers_order = sorted(self.layers, key = self.layers.get) # names of the layers, from the lowest
+
+
+    def set_layer(self, layer: str, z_index: int) -> None:
+        """
+        Adds a layer or changes its z index, the items are reordered in the tkinter thread (one tag_raise per layer).
+
+        layer: str, name of the layer
+        z_index: int, layers with a higher z index are drawn above
+        """
+
+        self.layers[layer] = z_index
+        self.layers_order = sorted(self.layers, key = self.layers.get)
+
+        funcs_exec_queue[self.tkinter_thread_id] += [self.restack_layers]
+
+    def restack_layers(self) -> None:
+        """Internal function called inside of the tkinter main thread, puts the layers in their z order."""
+
+        if self.destroyed: return
+
+        for layer in self.layers_order: # each layer is raised above the previous ones, keeping its items' order
+            self.tag_raise(get_layer_tag(layer))
+
+    def place_in_layer(self, item: int, layer: str) -> None:
+        """
+        Internal function called inside of the tkinter main thread, puts an item (already tagged) on top of its
+        layer: below the lowest item of the layers above.
+        """
+
+        self.tag_raise(item)
+
+        z_index = self.layers[layer]
+        for other_layer in self.layers_order:
+            if self.layers[other_layer] <= z_index: continue
+
+            try:
+                self.tag_lower(item, get_layer_tag(other_layer))
+                return
+            except tk.TclError: # the layer has no item
+                pass
+
+    def add_to_layer(self, items: list, layer: str = "main") -> None:
+        """
+        Adds canvas items (texts, rectangles...) to a layer, on top of it. Has to be called in the tkinter thread.
+        The sprites' items are added to the layer of their sprite (see Sprite.set_layer).
+
+        items: list of ints, ids of the canvas items
+        """
+
+        for item in items:
+            self.addtag_withtag(get_layer_tag(layer), item)
+            self.place_in_layer(item, layer)
+
+    def move_to_layer(self, item: int, old_layer: str, layer: str) -> None:
+        """Moves an item from a layer to another, on top of it. Has to be called in the tkinter thread."""
+
+        self.dtag(item, get_layer_tag(old_layer))
+        self.add_to_layer([item], layer)
 
 
     def event_handler(self, event, command: str) -> None:
         """Handles the execution of several functions for the same bind."""
 
+        replay.record_event(self.name, command, event) # before the coordinates conversion
+
+        if self.view_offset != (0, 0): # converts the window coordinates of the event to world coordinates
+            event.x += self.view_offset[0]
+            event.y += self.view_offset[1]
+
         defined_callbacks = dict(self.binds[command])
 
-        for ref in defined_callbacks:
-            defined_callbacks[ref](event)
+        with trace.span(command, "input", None if not trace.enabled else {"canvas": self.name, "callbacks": len(defined_callbacks)}):
+            for ref in defined_callbacks:
+                defined_callbacks[ref](event)
 
 
     def bind_tk_func(self, command):
@@ -237,6 +772,50 @@ class LevelCanvas (tk.Canvas):
         if ref in self.binds[command]:
             del self.binds[command][ref]
 
+
+    def set_scroll_region(self, size: tuple) -> None:
+        """
+        Sets the size of the world drawn on the canvas (can be larger than the canvas itself).
+
+        size: tuple of 2 ints
+        """
+
+        self.scroll_size = size
+
+        def set_scroll_region_tk_func(): # ghost func
+            if self.destroyed: return
+
+            self.configure(scrollregion = (0, 0, size[0], size[1]))
+
+        funcs_exec_queue[self.tkinter_thread_id] += [set_scroll_region_tk_func]
+
+    def scroll_to_tk_func(self) -> None:
+        """Internal function called inside of the tkinter main thread."""
+
+        new_offset = self.pending_view_offset
+        self.pending_view_offset = None
+
+        if self.destroyed or new_offset is None: return
+
+        self.xview_moveto(new_offset[0] / self.scroll_size[0])
+        self.yview_moveto(new_offset[1] / self.scroll_size[1])
+
+        self.view_offset = new_offset
+
+    def scroll_to(self, pos: tuple) -> None:
+        """
+        Scrolls the view so that its top left corner is at the given world coordinates.
+        Several calls during the same frame are merged into a single view transform.
+
+        pos: tuple of 2 ints
+        """
+
+        already_pending = not self.pending_view_offset is None
+        self.pending_view_offset = pos
+
+        if not already_pending:
+            funcs_exec_queue[self.tkinter_thread_id] += [self.scroll_to_tk_func]
+
     
     def destroy_tk_func(self) -> None:
         """Called inside of the tkinter main thread."""
@@ -246,7 +825,8 @@ class LevelCanvas (tk.Canvas):
 
             super().unbind(command)
         self.binds = {}
-        
+
+        self.delete("all") # bulk teardown, the sprites don't delete their own items once the canvas is destroyed
         super().destroy()
 
     def destroy(self) -> None:
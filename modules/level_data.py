@@ -0,0 +1,215 @@
+import mmap
+import struct
+import sys
+
+
+"""
+Declarative description of a level, stored in a compact binary file so that large maps load without running any code.
+
+A level data holds:
+- "grid_dimensions": tuple of 2 ints, number of tiles in x and y
+- "tile_scale": tuple of 2 ints, size of a tile in pixels
+- "names": list of str, the model references and spawn kinds used by the level
+- "walls": one byte per tile (row after row), 1 if the tile is a wall
+- "tiles": one uint16 per tile (row after row), index in "names" of the tile's model + 1, 0 if there is no tile
+- "spawns": 4 uint16 per spawn, x, y, index of the spawn kind and index of the model in "names"
+
+File layout (little-endian), each section starting on a 4 bytes boundary:
+    header | names (utf-8, separated by null bytes) | walls | tiles | spawns
+
+The loader maps the file in memory and exposes the walls/tiles as memoryviews of it, nothing is parsed per tile.
+"""
+
+MAGIC = b"INFL"
+VERSION = 1
+
+# magic, version, grid x, grid y, tile x, tile y, number of names, number of spawns, size of the names section
+HEADER = struct.Struct("<4sHHHHHHII")
+SPAWN_FIELDS = 4 # x, y, kind, model
+
+NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+class LevelData:
+    """Content of a level data file, walls/tiles/spawns are flat buffers indexed row after row."""
+
+    def __init__(self, grid_dimensions: tuple, tile_scale: tuple, names: list = None, walls: object = None, tiles: object = None, spawns: object = None) -> None:
+        """
+        Creates an empty (editable) level data if the buffers aren't given.
+
+        grid_dimensions/tile_scale: tuples of 2 ints
+        names: list of str
+        walls: buffer of grid x * grid y bytes
+        tiles: buffer of grid x * grid y uint16
+        spawns: buffer of 4 uint16 per spawn
+        """
+
+        self.grid_dimensions = grid_dimensions
+        self.tile_scale = tile_scale
+
+        tiles_count = grid_dimensions[0] * grid_dimensions[1]
+
+        self.names = [] if names is None else names
+        self.names_indexes = {name: index for index, name in enumerate(self.names)}
+
+        self.walls = memoryview(bytearray(tiles_count)) if walls is None else walls
+        self.tiles = memoryview(bytearray(tiles_count * 2)).cast("H") if tiles is None else tiles
+        self.spawns = [] if spawns is None else spawns # list of ints while editing, memoryview once loaded
+
+        self.file_map = None # mmap of the file the data was loaded from, kept alive as long as the views are
+
+
+    def get_name_index(self, name: str) -> int:
+        """Returns the index of the given name in the names table, adds it if needed."""
+
+        if not name in self.names_indexes:
+            self.names_indexes[name] = len(self.names)
+            self.names += [name]
+
+        return self.names_indexes[name]
+
+    def set_wall(self, coords: tuple, is_wall: bool = True) -> None:
+        """coords: tuple of 2 ints, x and y"""
+
+        self.walls[coords[1] * self.grid_dimensions[0] + coords[0]] = int(is_wall)
+
+    def set_tile(self, coords: tuple, model_name: str) -> None:
+        """
+        Sets the model of the tile at the given coordinates, None removes it.
+
+        coords: tuple of 2 ints, x and y
+        model_name: str, reference of the model in the level's models
+        """
+
+        value = 0 if model_name is None else self.get_name_index(model_name) + 1
+        self.tiles[coords[1] * self.grid_dimensions[0] + coords[0]] = value
+
+    def add_spawn(self, kind: str, model_name: str, coords: tuple) -> None:
+        """
+        Adds an entity spawn.
+
+        kind: str, name of the factory that creates the entity
+        model_name: str, reference of the model in the level's models
+        coords: tuple of 2 ints, x and y
+        """
+
+        self.spawns = list(self.spawns)
+        self.spawns += [coords[0], coords[1], self.get_name_index(kind), self.get_name_index(model_name)]
+
+
+    def get_rows(self, buffer: object) -> list:
+        """Returns the given flat buffer as a list of rows (views of the buffer, no copy), indexed [y][x]."""
+
+        w, h = self.grid_dimensions
+
+        return [buffer[y * w:(y + 1) * w] for y in range(h)]
+
+    def get_spawns(self) -> list:
+        """Returns the spawns as a list of tuples (kind, model name, (x, y))."""
+
+        spawns = []
+        for i in range(0, len(self.spawns), SPAWN_FIELDS):
+            x, y, kind, model = self.spawns[i:i + SPAWN_FIELDS]
+            spawns += [(self.names[kind], self.names[model], (x, y))]
+
+        return spawns
+
+    def release(self) -> None:
+        """
+        Drops the buffers of the level data.
+        The file mapping is closed once the views still used elsewhere (walls_map of a level, ...) are gone.
+        """
+
+        self.walls = None
+        self.tiles = None
+        self.spawns = None
+        self.file_map = None
+
+
+def align(size: int) -> int:
+    """Returns the given size rounded up to the next 4 bytes boundary."""
+
+    return (size + 3) & ~3
+
+def to_little_endian(values: object) -> bytes:
+    """Returns the given uint16 values (buffer or list of ints) as little-endian bytes."""
+
+    if isinstance(values, memoryview) and NATIVE_LITTLE_ENDIAN: return values.tobytes()
+
+    return struct.pack("<{}H".format(len(values)), *values)
+
+def save_level_data(path: str, level_data: LevelData) -> None:
+    """
+    Writes the given level data into a binary file.
+
+    path: str, path of the file
+    level_data: LevelData
+    """
+
+    names = b"\0".join(name.encode("utf-8") for name in level_data.names)
+    spawns_count = len(level_data.spawns) // SPAWN_FIELDS
+
+    sections = [
+        HEADER.pack(
+            MAGIC, VERSION,
+            level_data.grid_dimensions[0], level_data.grid_dimensions[1],
+            level_data.tile_scale[0], level_data.tile_scale[1],
+            len(level_data.names), spawns_count, len(names)
+        ),
+        names,
+        bytes(level_data.walls),
+        to_little_endian(level_data.tiles),
+        to_little_endian(level_data.spawns) if spawns_count != 0 else b""
+    ]
+
+    with open(path, "wb") as file:
+        for section in sections:
+            file.write(section)
+            file.write(b"\0" * (align(len(section)) - len(section))) # padding, keeps the uint16 sections aligned
+
+def load_level_data(path: str, use_mmap: bool = True) -> LevelData:
+    """
+    Loads a level data file.
+    The file is mapped in memory (copy on write, so the level can still modify its walls/tiles) and the
+    walls/tiles/spawns are views of the mapping: loading doesn't depend on the number of tiles.
+
+    path: str, path of the file
+    use_mmap: bool, if False the file is read in a single call instead of being mapped
+
+    returns: the LevelData object
+    """
+
+    with open(path, "rb") as file:
+        if use_mmap: buffer = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_COPY)
+        else: buffer = bytearray(file.read())
+
+    view = memoryview(buffer)
+
+    magic, version, grid_x, grid_y, tile_x, tile_y, names_count, spawns_count, names_size = HEADER.unpack_from(view, 0)
+    if magic != MAGIC: raise ValueError("\"{}\" isn't a level data file.".format(path))
+    if version != VERSION: raise ValueError("Unsupported level data version ({}).".format(version))
+
+    tiles_count = grid_x * grid_y
+
+    offset = align(HEADER.size)
+    names = bytes(view[offset:offset + names_size]).decode("utf-8").split("\0") if names_count != 0 else []
+
+    offset += align(names_size)
+    walls = view[offset:offset + tiles_count]
+
+    offset += align(tiles_count)
+    tiles = view[offset:offset + tiles_count * 2]
+
+    offset += align(tiles_count * 2)
+    spawns = view[offset:offset + spawns_count * SPAWN_FIELDS * 2]
+
+    if NATIVE_LITTLE_ENDIAN:
+        tiles = tiles.cast("H")
+        spawns = spawns.cast("H")
+    else: # the views can't be used as is, decodes them
+        tiles = memoryview(bytearray(struct.pack("={}H".format(tiles_count), *struct.unpack("<{}H".format(tiles_count), tiles)))).cast("H")
+        spawns = list(struct.unpack("<{}H".format(spawns_count * SPAWN_FIELDS), spawns))
+
+    level_data = LevelData((grid_x, grid_y), (tile_x, tile_y), names, walls, tiles, spawns)
+    if use_mmap: level_data.file_map = buffer
+
+    return level_data
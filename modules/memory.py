@@ -0,0 +1,214 @@
+import tracemalloc
+
+from modules import sprite
+
+
+"""
+Memory accounting of the live game: bytes held by the models' source images, by their transformed copies (see
+sprite.transformed_images_cache), by the PhotoImages created from them, and the canvas items not owned by a sprite.
+
+The sizes are estimates computed from the images' dimensions: PIL images take width * height * bands bytes, a
+PhotoImage keeps a 32 bits copy of each pixel in Tk. These buffers aren't allocated by Python, so tracemalloc
+doesn't see them; its snapshots (see take_snapshot, Game.change_level) show the Python objects created by a level.
+"""
+
+photo_image_pixel_size = 4 # bytes per pixel of a PhotoImage
+
+def get_image_size(image: object) -> int:
+    """Returns the estimated size in bytes of a PIL image, 0 for an asset that hasn't been loaded (see assets.LazyImage)."""
+
+    if image is None: return 0
+    if hasattr(image, "is_loaded") and not image.is_loaded(): return 0
+
+    width, height = image.size
+
+    return width * height * len(image.getbands())
+
+def get_photo_image_size(transformed: object) -> int:
+    """Returns the estimated size in bytes of the PhotoImage of a TransformedImage, 0 if it hasn't been created."""
+
+    if transformed is None or transformed.tk_image is None: return 0
+
+    width, height = transformed.image.size
+
+    return width * height * photo_image_pixel_size
+
+def get_model_name(model: dict) -> str:
+    """Returns a name identifying a model in the reports: the file of its first image, or its images' names."""
+
+    for image in model["images"].values():
+        path = getattr(image, "path", None) or getattr(image, "filename", None) # LazyImage or loaded PIL image
+        if path: return path
+
+    return "model ({})".format(", ".join(model["images"]))
+
+def get_level_sprites(level_object: object) -> list:
+    """Returns the sprites of a level's objects (the entities' sprites and the sprites added directly)."""
+
+    with level_object.objects_lock:
+        objects = list(level_object.objects)
+
+    sprites = []
+    for obj in objects:
+        if obj.type == "sprite": sprites += [obj]
+        elif not getattr(obj, "sprite", None) is None: sprites += [obj.sprite]
+
+    return sprites
+
+def get_sprites_report(sprites: list, models: dict) -> dict:
+    """
+    Returns the totals of the given sprites and adds their models to the models dict (model's id -> report).
+    A transformed image is shared by the sprites showing it, it's counted once per group of sprites.
+    """
+
+    transformed_images = {} # id -> TransformedImage
+    sprites_entries = []
+
+    for sprite_object in sprites:
+        model = sprite_object.model
+        model_entry = models.get(id(model))
+        if model_entry is None:
+            model_entry = {"name": get_model_name(model), "sprites": 0, "source_bytes": sum(get_image_size(image) for image in model["images"].values())}
+            models[id(model)] = model_entry
+
+        model_entry["sprites"] += 1
+
+        transformed = sprite_object.current_transformed_image
+        image_bytes = 0 if transformed is None else get_image_size(transformed.image)
+        photo_bytes = get_photo_image_size(transformed)
+
+        if not transformed is None: transformed_images[id(transformed)] = transformed
+
+        sprites_entries += [{
+            "id": sprite_object.id,
+            "model": model_entry["name"],
+            "image": sprite_object.current_image_name,
+            "image_bytes": image_bytes,
+            "photo_bytes": photo_bytes
+        }]
+
+    sprites_entries.sort(key = lambda entry: -(entry["image_bytes"] + entry["photo_bytes"]))
+
+    return {
+        "sprites": len(sprites),
+        "image_bytes": sum(get_image_size(transformed.image) for transformed in transformed_images.values()),
+        "photo_bytes": sum(get_photo_image_size(transformed) for transformed in transformed_images.values()),
+        "largest_sprites": sprites_entries[:10]
+    }
+
+def get_transformed_cache_report() -> dict:
+    """Returns the totals of sprite.transformed_images_cache (every transformed copy kept, shown or not)."""
+
+    with sprite.transformed_images_cache_lock:
+        entries = [transformed for cached in sprite.transformed_images_cache.values() for transformed in cached.values()]
+
+    return {
+        "images": len(entries),
+        "image_bytes": sum(get_image_size(transformed.image) for transformed in entries),
+        "photo_images": sum(1 for transformed in entries if not transformed.tk_image is None),
+        "photo_bytes": sum(get_photo_image_size(transformed) for transformed in entries)
+    }
+
+def get_canvas_report(canvas: object, sprites: list) -> dict:
+    """
+    Returns the number of items of a canvas and how many aren't owned by one of the given sprites (texts, or items
+    leaked by sprites which didn't delete them). Has to be called in the tkinter thread.
+    """
+
+    items = canvas.find_all()
+    owned = {sprite_object.canvas_id for sprite_object in sprites if sprite_object.parent_canvas is canvas}
+
+    return {"items": len(items), "sprite_items": len(owned), "unowned_items": sum(1 for item in items if not item in owned)}
+
+def get_report(game_instance: object, include_canvases: bool = False) -> dict:
+    """
+    Walks the game and returns the memory report (dict): totals of the menu and of each loaded level, the models
+    used by their sprites, the transformed images cache and optionally the canvases' items.
+
+    include_canvases: bool, if the canvases' items are counted, the function then has to be called in the tkinter
+    thread (see Game.queue_function)
+    """
+
+    models = {}
+    report = {"levels": {}, "menu": None, "models": [], "transformed_cache": get_transformed_cache_report(), "canvases": {}}
+    canvases_sprites = []
+
+    for file_name, level_object in dict.items(game_instance.levels): # only the loaded levels (see game.LevelsDict)
+        if level_object is None: continue
+
+        level_sprites = get_level_sprites(level_object)
+        report["levels"][file_name] = get_sprites_report(level_sprites, models)
+
+        if include_canvases and not level_object.frame is None and not level_object.frame.headless:
+            canvases_sprites += [(file_name, level_object.frame, level_sprites)]
+
+    menu_objects = dict(game_instance.menu_objects)
+    menu_sprites = [obj for obj in menu_objects.values() if getattr(obj, "type", None) == "sprite"]
+    report["menu"] = get_sprites_report(menu_sprites, models)
+
+    if include_canvases:
+        for name, obj in menu_objects.items():
+            if getattr(obj, "type", None) == "sprite" or not hasattr(obj, "find_all"): continue
+
+            canvases_sprites += [(name, obj, menu_sprites)]
+
+        for name, canvas, sprites in canvases_sprites:
+            if not canvas.destroyed: report["canvases"][name] = get_canvas_report(canvas, sprites)
+
+    report["models"] = sorted(models.values(), key = lambda entry: -entry["source_bytes"])
+
+    cache = report["transformed_cache"]
+    report["total_bytes"] = sum(entry["source_bytes"] for entry in report["models"]) + cache["image_bytes"] + cache["photo_bytes"]
+
+    return report
+
+def format_report(report: dict) -> str:
+    """Returns the report as text."""
+
+    def megabytes(value: int) -> str:
+        return "{:.2f} MB".format(value / 1048576)
+
+    cache = report["transformed_cache"]
+    lines = [
+        "----- memory report -----",
+        "total (estimated): {}".format(megabytes(report["total_bytes"])),
+        "transformed images: {} ({}), photo images: {} ({})".format(
+            cache["images"], megabytes(cache["image_bytes"]), cache["photo_images"], megabytes(cache["photo_bytes"])
+        )
+    ]
+
+    for name, entry in [("menu", report["menu"])] + list(report["levels"].items()):
+        lines += ["{}: {} sprites, images {}, photo images {}".format(name, entry["sprites"], megabytes(entry["image_bytes"]), megabytes(entry["photo_bytes"]))]
+
+    lines += ["models:"]
+    for entry in report["models"]:
+        lines += ["    {}: {} ({} sprites)".format(entry["name"], megabytes(entry["source_bytes"]), entry["sprites"])]
+
+    for name, entry in report["canvases"].items():
+        lines += ["canvas {}: {} items, {} not owned by a sprite".format(name, entry["items"], entry["unowned_items"])]
+
+    return "\n".join(lines)
+
+
+def start_tracking(frames: int = 1) -> None:
+    """Starts tracemalloc, frames: int, number of frames kept for each allocation's traceback."""
+
+    if not tracemalloc.is_tracing(): tracemalloc.start(frames)
+
+def stop_tracking() -> None:
+    tracemalloc.stop()
+
+def is_tracking() -> bool:
+    return tracemalloc.is_tracing()
+
+def take_snapshot() -> object:
+    """Returns a tracemalloc snapshot, None if tracemalloc isn't tracing."""
+
+    if not tracemalloc.is_tracing(): return None
+
+    return tracemalloc.take_snapshot()
+
+def compare_snapshots(before: object, after: object, limit: int = 10) -> list:
+    """Returns the lines describing the largest allocations differences (by source line) between 2 snapshots."""
+
+    return [str(statistic) for statistic in after.compare_to(before, "lineno")[:limit]]
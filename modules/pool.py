@@ -0,0 +1,239 @@
+import threading
+
+from modules import sprite
+
+
+"""
+Pools of sprites and entities, used by levels that spawn many short-lived objects (projectiles, effects...).
+
+A released object isn't destroyed: its canvas item is only hidden and it keeps its id, its cached transformed image
+and its PhotoImage. Acquiring it again moves it and shows it, which costs a couple of canvas calls instead of a new
+canvas item and a new image.
+
+The bulk functions (spawn_many/release_many) update all of the objects with a single function queued in the
+tkinter thread instead of one per object.
+"""
+
+class SpritePool:
+    """Recycles sprites sharing a model, an image and a scale."""
+
+    def __init__(self, parent_canvas: object, model: dict, image_name: str, scale: tuple, displacement: tuple = (0, 0), max_size: int = None) -> None:
+        """
+        parent_canvas: canvas of the sprites
+        model: dict, model of the sprites
+        image_name: str, image of the sprites when they are acquired
+        scale/displacement: tuples of 2 ints, see Sprite
+        max_size: int, max number of released sprites kept, the other ones are destroyed (no limit if None)
+        """
+
+        self.parent_canvas = parent_canvas
+        self.model = model
+        self.image_name = image_name
+        self.scale = scale
+        self.displacement = displacement
+        self.max_size = max_size
+
+        self.free = [] # released sprites, ready to be acquired
+        self.lock = threading.Lock()
+
+    def create_sprite(self, pos: tuple) -> object:
+        """Internal function, creates a new hidden sprite."""
+
+        return sprite.Sprite(self.parent_canvas, self.model, self.image_name, pos, self.scale, self.displacement, False)
+
+    def reserve(self, count: int) -> None:
+        """Creates sprites in advance so that the next acquisitions don't create any (call it while loading)."""
+
+        self.release_many([self.create_sprite((0, 0)) for _ in range(count)])
+
+    def take(self, pos: tuple) -> object:
+        """Internal function, returns a free (or new) sprite moved to the given position and marked as shown."""
+
+        with self.lock:
+            sprite_ref = self.free.pop() if len(self.free) != 0 else None
+
+        if sprite_ref is None: sprite_ref = self.create_sprite(pos)
+        else:
+            sprite_ref.current_image_name = self.image_name
+            sprite_ref.move(pos) # hidden, nothing is queued
+
+        sprite_ref.show(queued = False)
+
+        return sprite_ref
+
+    def acquire(self, pos: tuple) -> object:
+        """
+        Returns a shown sprite at the given position, recycled if possible.
+
+        pos: tuple of 2 ints
+        """
+
+        sprite_ref = self.take(pos)
+        sprite.queue_sprites_update(self.parent_canvas.tkinter_thread_id, [sprite_ref])
+
+        return sprite_ref
+
+    def spawn_many(self, positions: list) -> list:
+        """
+        Acquires a sprite for each of the given positions, their canvas items are updated by a single queued function.
+
+        positions: list of tuples of 2 ints
+
+        returns: the list of the sprites
+        """
+
+        sprites = [self.take(pos) for pos in positions]
+        sprite.queue_sprites_update(self.parent_canvas.tkinter_thread_id, sprites)
+
+        return sprites
+
+    def release(self, sprite_ref: object) -> None:
+        """Hides the sprite and keeps it for a next acquisition."""
+
+        self.release_many([sprite_ref])
+
+    def release_many(self, sprites: list) -> None:
+        """Hides the given sprites and keeps them for next acquisitions."""
+
+        for sprite_ref in sprites:
+            sprite_ref.hide(keep_item = True)
+
+        with self.lock:
+            self.free += sprites
+
+            extra = []
+            if not self.max_size is None and len(self.free) > self.max_size:
+                extra = self.free[self.max_size:]
+                del self.free[self.max_size:]
+
+        for sprite_ref in extra:
+            sprite_ref.destroy()
+
+    def destroy(self) -> None:
+        """Destroys the released sprites (the acquired ones are left to their owner)."""
+
+        with self.lock:
+            free = self.free
+            self.free = []
+
+        for sprite_ref in free:
+            sprite_ref.destroy()
+
+
+class EntityPool:
+    """Recycles entities created by the same function."""
+
+    def __init__(self, level_instance: object, create_function: object, max_size: int = None) -> None:
+        """
+        level_instance: Level
+        create_function: function called with the level and the tile coordinates (tuple of 2 ints), returns a new
+        shown entity with its sprite (usually the entity's class)
+        max_size: int, max number of released entities kept, the other ones are destroyed (no limit if None)
+
+        The entities stay in level_instance.objects while they are released (hidden, off the grid and out of the
+        level's indexes), they are destroyed with the level. Their components are removed when they are released.
+        """
+
+        self.level_instance = level_instance
+        self.create_function = create_function
+        self.max_size = max_size
+
+        self.free = []
+        self.lock = threading.Lock()
+
+    def create_entity(self, pos: tuple) -> object:
+        """Internal function, creates a new entity and adds it to the level's objects."""
+
+        entity_ref = self.create_function(self.level_instance, pos)
+        self.level_instance.add_objects([entity_ref])
+
+        return entity_ref
+
+    def reserve(self, count: int) -> None:
+        """Creates entities in advance so that the next acquisitions don't create any (call it while loading)."""
+
+        self.release_many([self.create_entity((0, 0)) for _ in range(count)])
+
+    def take(self, pos: tuple) -> tuple:
+        """
+        Internal function, returns a tuple (entity, recycled), a free (or new) entity placed on the given tile.
+        A recycled entity is marked as shown but its sprite's canvas item still has to be updated.
+        """
+
+        with self.lock:
+            entity_ref = self.free.pop() if len(self.free) != 0 else None
+
+        if entity_ref is None: return (self.create_entity(pos), False)
+
+        level_instance = self.level_instance
+        entity_ref.pos = pos
+        level_instance.grid_map[pos[1]][pos[0]] += [entity_ref]
+        level_instance.index_object(entity_ref)
+
+        # same coordinates as Entity.set_pos
+        tile_scale_ref = level_instance.tile_scale
+        entity_ref.sprite.move((tile_scale_ref[0]/2 + tile_scale_ref[0] * pos[0], tile_scale_ref[1]/2 + tile_scale_ref[1] * pos[1]))
+
+        entity_ref.is_shown = True
+        entity_ref.sprite.show(queued = False)
+
+        return (entity_ref, True)
+
+    def acquire(self, pos: tuple) -> object:
+        """
+        Returns a shown entity on the given tile, recycled if possible.
+
+        pos: tuple of 2 ints, tile coordinates
+        """
+
+        return self.spawn_many([pos])[0]
+
+    def spawn_many(self, positions: list) -> list:
+        """
+        Acquires an entity for each of the given tiles, the recycled ones are updated by a single queued function.
+
+        positions: list of tuples of 2 ints, tiles coordinates
+
+        returns: the list of the entities
+        """
+
+        taken = [self.take(pos) for pos in positions]
+
+        recycled_sprites = [entity_ref.sprite for entity_ref, recycled in taken if recycled]
+        sprite.queue_sprites_update(self.level_instance.frame.tkinter_thread_id, recycled_sprites)
+
+        return [entity_ref for entity_ref, _ in taken]
+
+    def release(self, entity_ref: object) -> None:
+        """Hides the entity, removes it from the grid and keeps it for a next acquisition."""
+
+        self.release_many([entity_ref])
+
+    def release_many(self, entities: list) -> None:
+        """Hides the given entities, removes them from the grid and keeps them for next acquisitions."""
+
+        level_instance = self.level_instance
+
+        for entity_ref in entities:
+            x, y = entity_ref.pos
+            tile = level_instance.grid_map[y][x]
+            if entity_ref in tile: tile.remove(entity_ref)
+
+            level_instance.world.remove_entity(entity_ref)
+            level_instance.unindex_object(entity_ref)
+            entity_ref.hide(keep_item = True)
+
+        with self.lock:
+            self.free += entities
+
+            extra = []
+            if not self.max_size is None and len(self.free) > self.max_size:
+                extra = self.free[self.max_size:]
+                del self.free[self.max_size:]
+
+        if len(extra) == 0: return
+
+        for entity_ref in extra:
+            entity_ref.destroy()
+
+        level_instance.remove_objects(extra)
@@ -0,0 +1,77 @@
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+
+"""
+Startup profiler: measures the time spent in each import, asset loading and level initialization, and the
+milestones of the startup (time to first frame).
+
+The clock starts when this module is imported, main.py imports it first. Sections are grouped by category
+("import", "asset", "level_init", ...), the durations of sections with the same name are added up.
+"""
+
+start_time = perf_counter()
+
+sections = {} # category -> dict of section name -> [total duration in seconds, count]
+milestones = {} # name -> time since the start in seconds
+lock = threading.Lock() # assets and levels can be loaded by several threads
+
+enabled = True
+
+def add_duration(category: str, name: str, duration: float) -> None:
+    """Adds the given duration (in seconds) to a section."""
+
+    if not enabled: return
+
+    with lock:
+        entry = sections.setdefault(category, {}).setdefault(name, [0.0, 0])
+        entry[0] += duration
+        entry[1] += 1
+
+@contextmanager
+def section(category: str, name: str):
+    """
+    Context manager measuring the time spent in its block.
+
+    category: str, group of the section ("import", "asset", "level_init", ...)
+    name: str, name of the section (module, file, level...)
+    """
+
+    section_start = perf_counter()
+    try:
+        yield
+    finally:
+        add_duration(category, name, perf_counter() - section_start)
+
+def mark(name: str) -> float:
+    """Records a milestone (only the first time), returns the time since the start in seconds."""
+
+    elapsed = perf_counter() - start_time
+
+    with lock:
+        if not name in milestones: milestones[name] = elapsed
+
+    return milestones[name]
+
+def get_report() -> str:
+    """Returns the report of the measures, as text."""
+
+    with lock:
+        lines = ["----- startup report -----"]
+
+        for name, elapsed in milestones.items():
+            lines += ["{}: {:.1f} ms".format(name, elapsed * 1000)]
+
+        for category, entries in sections.items():
+            total = sum(duration for duration, _ in entries.values())
+            lines += ["{} ({:.1f} ms):".format(category, total * 1000)]
+
+            for name, (duration, count) in sorted(entries.items(), key = lambda item: -item[1][0]):
+                suffix = "" if count == 1 else " ({} times)".format(count)
+                lines += ["    {}: {:.1f} ms{}".format(name, duration * 1000, suffix)]
+
+    return "\n".join(lines)
+
+def print_report() -> None:
+    print(get_report())
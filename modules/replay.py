@@ -0,0 +1,152 @@
+import json
+from types import SimpleNamespace
+
+from modules import clock, entity, sprite
+
+
+"""
+Recording and replay of play sessions, used as repeatable performance benchmarks.
+
+A recording is a JSON lines file: a header, then one line per frame with the frame's duration (dt) and the input
+events received during that frame, with their target (a named canvas, or "window" for the binds of the game's
+window). A replay feeds the same events to the same targets at the same frames, with a virtual clock advanced by
+the recorded durations (see modules/clock.py): animations progress the same way, and frames aren't paced, so the
+replay runs faster than real time. Ids of the sprites/entities are reset when a recording or a replay starts.
+
+While replaying, the levels are created in the tkinter thread (Game.change_level) and the background preloads
+(levels' imports, next thumbnails page) are skipped. Some work still runs on real time and can land on other
+frames than in the recording: the thumbnails' generation and loading, the chunks streamed by the levels' worker
+threads, and the sequences' threads, which wake up on the virtual time but run concurrently with the frames (a
+culled sprite's sequence polls its resume event every 0.1s of real time). The replayed frames and events are the
+same, the frames' content may slightly differ.
+
+Both modes collect the duration of each frame (FrameStats).
+"""
+
+recording_version = 1
+
+# attributes of the tkinter events kept in the recordings
+event_attributes = ("x", "y", "x_root", "y_root", "keysym", "keycode", "char", "num", "delta", "state")
+
+current_recorder = None # Recorder of the session being recorded, if one
+
+def reset_ids() -> None:
+    """Resets the ids counters of the sprites and entities, so that a replay creates objects with the same ids."""
+
+    sprite.id_increment = 1
+    entity.id_increment = 1
+
+def record_event(target: str, command: str, event: object) -> None:
+    """Records an input event if a session is being recorded (called by the event handlers)."""
+
+    if not current_recorder is None and not target is None: current_recorder.record_event(target, command, event)
+
+
+class FrameStats:
+    """Durations of the computed frames (without the pause between frames)."""
+
+    def __init__(self, budget: float = 0.05) -> None:
+        """budget: float, duration of a frame at the target frame rate, in seconds"""
+
+        self.budget = budget
+        self.durations = []
+
+    def add(self, duration: float) -> None:
+        self.durations += [duration]
+
+    def get_summary(self) -> dict:
+        """Returns the stats of the frames: count, mean, percentiles and max (in milliseconds), frames over budget."""
+
+        if len(self.durations) == 0: return {"frames": 0}
+
+        ordered = sorted(self.durations)
+        count = len(ordered)
+
+        def percentile(value: float) -> float:
+            return ordered[min(int(count * value), count - 1)] * 1000
+
+        return {
+            "frames": count,
+            "mean_ms": sum(ordered) / count * 1000,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": ordered[-1] * 1000,
+            "over_budget": sum(1 for duration in ordered if duration > self.budget)
+        }
+
+
+class Recorder:
+    """Writes the frames and input events of a session in a file."""
+
+    def __init__(self, path: str, frame_size: tuple) -> None:
+        self.path = path
+        self.file = open(path, "w")
+        self.file.write(json.dumps({"version": recording_version, "frame_size": frame_size}) + "\n")
+
+        self.frame_dt = 0 # duration of the current frame
+        self.events = [] # events of the current frame
+        self.stats = FrameStats()
+
+    def record_event(self, target: str, command: str, event: object) -> None:
+        values = {name: getattr(event, name) for name in event_attributes if isinstance(getattr(event, name, None), (int, float, str))}
+
+        self.events += [[target, command, values]]
+
+    def begin_frame(self, dt: float) -> None:
+        """Called at the start of each frame with its duration."""
+
+        self.frame_dt = dt
+
+    def end_frame(self) -> None:
+        """
+        Called once the frame's events have been handled, writes the frame.
+        The events received after it (while the idle game waits for an event, see Game.wait_for_work) are written
+        with the next frame.
+        """
+
+        self.file.write(json.dumps({"dt": self.frame_dt, "events": self.events}) + "\n")
+        self.events = []
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class Replayer:
+    """Reads a recording and gives its frames back one by one."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "r") as file:
+            lines = file.read().splitlines()
+
+        header = json.loads(lines[0])
+        if header.get("version") != recording_version: raise ValueError("Unsupported recording version: {}".format(header.get("version")))
+
+        self.frame_size = tuple(header["frame_size"])
+        self.frames = [json.loads(line) for line in lines[1:] if line != ""]
+        self.frame_index = 0
+
+        self.clock = clock.VirtualClock()
+        self.stats = FrameStats()
+
+    def is_finished(self) -> bool:
+        return self.frame_index >= len(self.frames)
+
+    def next_frame(self) -> tuple:
+        """
+        Advances the virtual clock to the next frame.
+
+        returns: tuple (dt of the frame, list of its events (target, command, event object)), None when the
+        recording is over
+        """
+
+        if self.is_finished(): return None
+
+        frame = self.frames[self.frame_index]
+        self.frame_index += 1
+
+        self.clock.advance(frame["dt"])
+
+        events = [(target, command, SimpleNamespace(**values)) for target, command, values in frame["events"]]
+
+        return (frame["dt"], events)
@@ -0,0 +1,127 @@
+import pickle
+
+
+"""
+A snapshot is the state of a running level: the state of each of its objects (see Entity/Sprite.get_state), the
+content of its grid and its walls. It can be restored on the same level without recreating any sprite, only the
+objects whose state changed are updated.
+
+A snapshot taken with a base only stores what changed since that base (delta), which keeps checkpoints/rewind
+buffers small. Removed entries of a delta are stored as None.
+
+Objects are identified by their type and their id, objects created after a snapshot are left untouched when it's
+restored and objects destroyed since then are skipped.
+"""
+
+class Snapshot:
+    """State of a level, full or relative to a base snapshot."""
+
+    def __init__(self, objects: dict, grid: dict, walls: dict, base: object = None) -> None:
+        """
+        objects: dict, (type, id) -> state tuple
+        grid: dict, (x, y) -> tuple of the keys of the objects on the tile (only non empty tiles)
+        walls: dict, y -> bytes of the row
+        base: Snapshot, the snapshot this one is relative to, None if it's a full snapshot
+        """
+
+        self.objects = objects
+        self.grid = grid
+        self.walls = walls
+        self.base = base
+
+    def resolve(self) -> tuple:
+        """Returns the full (objects, grid, walls) dicts of the snapshot, merged with its bases."""
+
+        if self.base is None: return (self.objects, self.grid, self.walls)
+
+        objects, grid, walls = (dict(data) for data in self.base.resolve())
+        for full, delta in ((objects, self.objects), (grid, self.grid), (walls, self.walls)):
+            for key, value in delta.items():
+                if value is None: full.pop(key, None)
+                else: full[key] = value
+
+        return (objects, grid, walls)
+
+    def dumps(self) -> bytes:
+        """Serializes the snapshot (with its bases), used for quick-saves."""
+
+        return pickle.dumps(self, protocol = pickle.HIGHEST_PROTOCOL)
+
+
+def loads(data: bytes) -> Snapshot:
+    """Deserializes a snapshot returned by Snapshot.dumps."""
+
+    return pickle.loads(data)
+
+
+def get_object_key(obj: object) -> tuple:
+    """Returns the key identifying the given object in a snapshot."""
+
+    return (obj.type, obj.id)
+
+def get_delta(full: dict, base: dict) -> dict:
+    """Returns the entries of the full dict that are different from the base one, removed entries are set to None."""
+
+    delta = {key: value for key, value in full.items() if base.get(key) != value}
+    for key in base:
+        if not key in full: delta[key] = None
+
+    return delta
+
+def take_snapshot(level_instance: object, base: Snapshot = None) -> Snapshot:
+    """
+    Takes a snapshot of the given level.
+
+    level_instance: Level
+    base: Snapshot, if given the returned snapshot only contains the changes since this one
+
+    returns: the Snapshot object
+    """
+
+    objects = {get_object_key(obj): obj.get_state() for obj in level_instance.objects}
+
+    grid = {}
+    for y, row in enumerate(level_instance.grid_map):
+        for x, tile in enumerate(row):
+            if len(tile) != 0: grid[(x, y)] = tuple(get_object_key(obj) for obj in tile)
+
+    walls = {y: bytes(row) for y, row in enumerate(level_instance.walls_map)}
+
+    if base is None: return Snapshot(objects, grid, walls)
+
+    base_objects, base_grid, base_walls = base.resolve()
+
+    return Snapshot(get_delta(objects, base_objects), get_delta(grid, base_grid), get_delta(walls, base_walls), base)
+
+def restore_snapshot(level_instance: object, snapshot: Snapshot) -> None:
+    """
+    Restores the given snapshot on the level, only the objects/tiles/rows that differ are modified.
+
+    level_instance: Level
+    snapshot: Snapshot, taken on the same level
+    """
+
+    objects, grid, walls = snapshot.resolve()
+
+    live_objects = {get_object_key(obj): obj for obj in level_instance.objects}
+
+    for key, state in objects.items():
+        obj = live_objects.get(key)
+        if obj is None: continue # destroyed since the snapshot
+
+        if obj.get_state() != state: obj.set_state(state)
+
+    grid_map = level_instance.grid_map
+    for y, row in enumerate(grid_map):
+        for x, tile in enumerate(row):
+            keys = grid.get((x, y), ())
+            if len(tile) == 0 and len(keys) == 0: continue
+
+            row[x] = [live_objects[key] for key in keys if key in live_objects]
+
+    walls_map = level_instance.walls_map
+    for y, data in walls.items():
+        if bytes(walls_map[y]) == data: continue
+
+        if isinstance(walls_map[y], memoryview): walls_map[y][:] = data # rows mapped from a level data file
+        else: walls_map[y] = [bool(value) for value in data]
@@ -1,8 +1,12 @@
 import tkinter
 import threading
-from time import sleep
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk, ImageOps
 
+from modules import clock, hitmask, trace
+
 
 """A "model" is a dict containing 2 main keys:
 - "images": dict of tuples with keys being the name of the image and containing :
@@ -23,15 +27,131 @@ funcs_exec_queue_availible = {}
 # var used to make sure two sprites don't have the same idea
 id_increment = 1
 
+# cache of the transformed (resized/mirrored/flipped) copies of the models' images, shared by all sprites
+# id of the source image -> OrderedDict of (scale, mirrored, flipped) -> TransformedImage, least recently used first
+transformed_images_cache = {}
+transformed_images_cache_lock = threading.Lock()
+transformed_images_per_source = 16 # max number of transformed copies kept per source image
+
+# images missing from the cache are transformed by a pool of threads (PIL releases the GIL while resizing), the
+# tkinter thread only creates the PhotoImages (see Sprite.set_current_image)
+transform_workers = 2
+transform_executor = None # created on the first transform
+transform_executor_lock = threading.Lock()
+
+class TransformedImage:
+    """Transformed copy of a model's image, with the data derived from it (built lazily and cached with it)."""
+
+    def __init__(self, image: object) -> None:
+        self.image = image
+
+        self.hit_mask = None
+        self.hit_mask_built = False
+
+        self.tk_image = None # PhotoImage of the image, created in the tkinter thread and shared by the sprites
+
+    def get_tk_image(self) -> object:
+        """Returns the PhotoImage of the image, created on the first call. Has to be called in the tkinter thread."""
+
+        if self.tk_image is None: self.tk_image = ImageTk.PhotoImage(image = self.image)
+
+        return self.tk_image
+
+    def get_hit_mask(self) -> object:
+        """Returns the HitMask of the image (None if it has no transparency), built on the first call."""
+
+        if not self.hit_mask_built:
+            self.hit_mask = hitmask.build_hit_mask(self.image)
+            self.hit_mask_built = True
+
+        return self.hit_mask
+
+def find_transformed_image(source_image: object, scale: tuple, mirrored: bool, flipped: bool) -> TransformedImage:
+    """Returns the transformed copy of the given image if it's in the cache, None otherwise."""
+
+    with transformed_images_cache_lock:
+        entries = transformed_images_cache.get(id(source_image))
+        if entries is None: return None
+
+        transformed = entries.get((scale, mirrored, flipped))
+        if not transformed is None: entries.move_to_end((scale, mirrored, flipped))
+
+        return transformed
+
+def get_transformed_image(source_image: object, scale: tuple, mirrored: bool, flipped: bool) -> TransformedImage:
+    """
+    Returns the transformed copy of the given image, from the cache if it has already been computed.
+
+    source_image: PIL Image, image of a model
+    scale: tuple of 2 ints
+    mirrored/flipped: bools
+    """
+    global transformed_images_cache
+
+    source_id = id(source_image)
+    key = (scale, mirrored, flipped)
+
+    transformed = find_transformed_image(source_image, scale, mirrored, flipped)
+    if not transformed is None: return transformed
+
+    new_image = source_image.resize(scale) # creates a resized copy of the original image
+    if mirrored: new_image = ImageOps.mirror(new_image)
+    if flipped: new_image = ImageOps.flip(new_image)
+    if not new_image.mode in ("RGB", "RGBA"): new_image = new_image.convert("RGBA") # converted here rather than by the PhotoImage
+
+    transformed = TransformedImage(new_image)
+
+    with transformed_images_cache_lock:
+        entries = transformed_images_cache.get(source_id)
+        if entries is None:
+            entries = OrderedDict()
+            transformed_images_cache[source_id] = entries
+
+            # the entry is dropped with the source image, so that its id can't be reused by another image
+            weakref.finalize(source_image, transformed_images_cache.pop, source_id, None)
+
+        entries[key] = transformed
+        if len(entries) > transformed_images_per_source: entries.popitem(last = False)
+
+    return transformed
+
+def get_transform_executor() -> ThreadPoolExecutor:
+    global transform_executor
+
+    with transform_executor_lock:
+        if transform_executor is None:
+            transform_executor = ThreadPoolExecutor(max_workers = transform_workers, thread_name_prefix = "sprite_transforms")
+
+        return transform_executor
+
+def update_sprites(sprites: list) -> None:
+    """Internal function executed in the tkinter thread, updates the canvas items of the given sprites."""
+
+    for sprite in sprites:
+        sprite.change_image()
+
+def queue_sprites_update(tkinter_thread_id: int, sprites: list) -> None:
+    """
+    Queues a single function updating the canvas items of the given sprites, used after modifying many sprites
+    with queued = False (see Sprite.set_current_image).
+    """
+    global funcs_exec_queue
+
+    if len(sprites) == 0: return
+
+    funcs_exec_queue[tkinter_thread_id] += [lambda: update_sprites(sprites)]
+
 class Sprite:
     """Visual object, contains all data of the TKinter widget and useful methods for it to be used with."""
 
-    def __init__(self, parent_canvas: object, model: dict, current_image_name: str, pos: tuple, scale: tuple, displacement: tuple = (0, 0)) -> object:
+    def __init__(self, parent_canvas: object, model: dict, current_image_name: str, pos: tuple, scale: tuple, displacement: tuple = (0, 0), shown: bool = True, layer: str = "main") -> object:
         """
         parent_canvas: TKinter frame, basically anything that withstand the creation of labels
         model: dict, made as described above
         current_image_name: str
         pos/scale/displacement: tuples of 2 positive ints
+        shown: bool, if False the sprite is created hidden (no canvas item is created)
+        layer: str, name of the canvas layer in which the sprite is drawn (see level.default_layers)
         """
         global id_increment
 
@@ -44,7 +164,10 @@ class Sprite:
         self.parent_canvas = parent_canvas
         self.model = model
         self.current_image = None
+        self.current_transformed_image = None # TransformedImage of the current image
         self.current_tk_image = None
+        self.image_request = None # (source image's id, scale, mirrored, flipped) of the image being transformed, if one
+        self.image_lock = threading.Lock()
         
         self.current_image_name = current_image_name
 
@@ -52,20 +175,28 @@ class Sprite:
         self.flipped = False
 
         self.displacement = displacement # relative pos, kind of displacement
-        self.scale = scale
+        self.scale = tuple(int(value) for value in scale)
 
         self.global_pos = pos
         self.composed_coordinates = (0, 0)
 
-        self.is_shown = True
+        self.is_shown = shown
+        self.is_culled = False # True when the sprite is outside of the camera's viewport
+        self.layer = layer
         self.click_callback = None
         self.hover_callback = None
         self.is_hovered = False
+        self.pixel_accurate = True # if the hit tests ignore the transparent pixels of the image
 
         self.sequence_thread = None
         self.stop_current_sequence = False # flag used to stop the currently playing sequence
         self.current_sequence = None # name of the sequence playing (str), None otherwise
         self.sequence_time_factor = 1
+        self.sequence_index = 0 # index of the current instruction of the playing sequence (published by its thread)
+        self.sequence_jump = None # index the playing sequence has to jump to, if one (see self.set_sequence_state)
+        self.sequence_generation = 0 # incremented at each start, lets a replaced sequence thread know it has to exit
+        self.sequence_resume_event = threading.Event() # cleared while the sprite is culled, pauses the sequence
+        self.sequence_resume_event.set()
 
         self.canvas_id = None
 
@@ -84,21 +215,39 @@ class Sprite:
         self.set_current_image(current_image_name)
 
     def change_image(self) -> None:
-        """Internal func that deletes the sprite's widget to recreate it with a different appearance."""
+        """
+        Internal func that updates the sprite's canvas item with its current appearance and position.
+        The item is only created the first time, after that it is moved and its image is swapped.
+        """
 
         if self.parent_canvas.destroyed: return
+        if not self.is_shown or self.is_culled: return
+        if self.current_transformed_image is None: return # the first image is still being transformed
 
-        if not self.canvas_id is None: self.parent_canvas.delete(self.canvas_id)
-        if not self.is_shown: return
+        with trace.span("change_image", "sprite"): self.update_canvas_item()
 
-        self.current_tk_image = ImageTk.PhotoImage(image = self.current_image)
+    def update_canvas_item(self) -> None:
+        """Internal function of change_image."""
 
-        self.canvas_id = self.parent_canvas.create_image(
-            self.composed_coordinates[0],
-            self.composed_coordinates[1],
-            anchor = "nw",
-            image = self.current_tk_image
-        )
+        if self.parent_canvas.headless: # the level is rendered without a window (see Level.render_thumbnail)
+            self.parent_canvas.draw_sprite(self)
+            return
+
+        self.current_tk_image = self.current_transformed_image.get_tk_image()
+
+        if self.canvas_id is None:
+            self.canvas_id = self.parent_canvas.create_image(
+                self.composed_coordinates[0],
+                self.composed_coordinates[1],
+                anchor = "nw",
+                image = self.current_tk_image
+            )
+            self.parent_canvas.add_to_layer([self.canvas_id], self.layer)
+
+            return
+
+        self.parent_canvas.coords(self.canvas_id, self.composed_coordinates[0], self.composed_coordinates[1])
+        self.parent_canvas.itemconfigure(self.canvas_id, image = self.current_tk_image, state = "normal")
 
     def mirror_image(self, mirror: bool) -> None:
         """Mirrors the sprite."""
@@ -112,32 +261,93 @@ class Sprite:
 
         self.set_current_image(self.current_image_name)
         
-    def set_current_image(self, new_image_name: str) -> None:
+    def set_current_image(self, new_image_name: str, queued: bool = True) -> None:
         """
         Calls the change_image func and makes it execute in the tkinter thread of the game.
+        If the transformed image isn't in the cache, it's computed by the transforms' pool: the sprite keeps showing
+        its previous image until the new one is ready, then change_image is queued. Sprites of a level created
+        off-screen or headless are transformed in the calling thread (see LevelCanvas.synchronous_transforms).
         
         new_image_name: str, key of the "images" dict contained in a model dict
+        queued: bool, if False change_image isn't queued, the caller has to execute it in the tkinter thread
+        (used to update many sprites with a single queued function)
         """
         global funcs_exec_queue, funcs_exec_queue_availible
 
         self.current_image_name = new_image_name
 
-        new_image = self.model["images"][new_image_name].resize(self.scale) # creates a resized copy of the original image
-        if self.mirrored: new_image = ImageOps.mirror(new_image)
-        if self.flipped: new_image = ImageOps.flip(new_image)
+        if self.is_culled: return # the image is prepared when the sprite enters the viewport again
+
+        source_image = self.model["images"][new_image_name]
+        transformed = find_transformed_image(source_image, self.scale, self.mirrored, self.flipped)
+
+        if transformed is None and not self.parent_canvas.synchronous_transforms:
+            request = (id(source_image), self.scale, self.mirrored, self.flipped)
+
+            with self.image_lock:
+                is_requested = self.image_request == request # the sprite can move while its image is transformed
+                self.image_request = request
 
-        self.current_image = new_image
+            if not is_requested: get_transform_executor().submit(self.prepare_image, source_image, request)
 
-        if not self.is_shown: return
+            if self.current_transformed_image is None: return
+
+        else:
+            if transformed is None: transformed = get_transformed_image(source_image, self.scale, self.mirrored, self.flipped)
+
+            with self.image_lock:
+                self.image_request = None # a pending transform is now stale
+                self.current_transformed_image = transformed
+                self.current_image = transformed.image
+
+        if not self.is_shown or not queued: return
 
         # puts in the funcs queue a function that changes the sprite model
         funcs_exec_queue[self.main_thread_id] += [self.change_image]
 
 
+    def prepare_image(self, source_image: object, request: tuple) -> None:
+        """Internal function executed by the transforms' pool, a result replaced by a newer request is dropped."""
+
+        if self.image_request != request: return
+
+        transformed = get_transformed_image(source_image, request[1], request[2], request[3])
+
+        with self.image_lock:
+            if self.image_request != request: return
+
+            self.image_request = None
+            self.current_transformed_image = transformed
+            self.current_image = transformed.image
+
+        if self.is_shown and not self.is_culled: funcs_exec_queue[self.main_thread_id] += [self.change_image]
+
+    def set_layer(self, layer: str) -> None:
+        """
+        Moves the sprite on top of the given layer of its canvas (see LevelCanvas.set_layer), its item is kept.
+
+        layer: str, name of the layer
+        """
+        global funcs_exec_queue
+
+        old_layer = self.layer
+        self.layer = layer
+
+        if old_layer == layer or self.canvas_id is None: return # the item is created in the right layer
+
+        id_ref = self.canvas_id
+
+        def set_layer_tk_func(): # ghost func
+            if self.parent_canvas.destroyed or self.canvas_id != id_ref: return
+
+            self.parent_canvas.move_to_layer(id_ref, old_layer, layer)
+
+        funcs_exec_queue[self.main_thread_id] += [set_layer_tk_func]
+
     def set_scale(self, new_scale: tuple) -> None:
         """new_scale: tuple of 2 positive ints"""
 
-        self.scale = new_scale
+        self.scale = tuple(int(value) for value in new_scale)
 
         self.set_current_image(self.current_image_name)
 
@@ -152,11 +362,12 @@ class Sprite:
 
         self.move(self.global_pos)
 
-    def move(self, new_global_pos: tuple):
+    def move(self, new_global_pos: tuple, queued: bool = True):
         """
         Moves the widget on its parent in the tkinter window.
 
         new_global_pos: tuple of 2 positive ints
+        queued: bool, see set_current_image
         """
         
         self.global_pos = new_global_pos
@@ -166,7 +377,37 @@ class Sprite:
 
         self.composed_coordinates = (ng_x, ng_y)
 
-        self.set_current_image(self.current_image_name)
+        if not self.parent_canvas.camera is None: self.parent_canvas.camera.update_sprite(self)
+
+        self.set_current_image(self.current_image_name, queued)
+
+    def set_culled(self, culled: bool, refresh: bool = True) -> None:
+        """
+        Called by the camera when the sprite leaves/enters the viewport.
+        A culled sprite keeps its state but has no canvas item and its sequence is paused.
+
+        culled: bool, whether the sprite is outside of the viewport
+        refresh: bool, if the image has to be recreated when the sprite becomes visible again
+        """
+        global funcs_exec_queue
+
+        if culled == self.is_culled: return
+        self.is_culled = culled
+
+        if not culled:
+            self.sequence_resume_event.set()
+            if refresh: self.set_current_image(self.current_image_name)
+
+            return
+
+        self.sequence_resume_event.clear()
+
+        if self.canvas_id is None: return
+
+        id_ref = self.canvas_id
+        self.canvas_id = None
+
+        funcs_exec_queue[self.main_thread_id] += [lambda: self.delete_canvas_item(id_ref)]
 
     def is_in_boundaries(self, pos: tuple) -> bool:
         """
@@ -179,7 +420,39 @@ class Sprite:
         s_x, s_y = self.composed_coordinates # sprite's x and y coordinates
         ss_x, ss_y = self.scale # sprite's x and y scale
 
-        return (x >= s_x and x <= s_x + ss_x) and (y >= s_y and y <= s_y + ss_y)
+        if not ((x >= s_x and x <= s_x + ss_x) and (y >= s_y and y <= s_y + ss_y)): return False
+        if not self.pixel_accurate or self.current_transformed_image is None: return True
+
+        mask = self.current_transformed_image.get_hit_mask()
+        if mask is None: return True # the image is opaque
+
+        return mask.test(int(x - s_x), int(y - s_y))
+
+    def overlaps(self, other: object) -> bool:
+        """
+        Returns whether the sprite overlaps the other one, ignoring the transparent pixels of both images.
+
+        other: Sprite
+        """
+
+        s_x, s_y = self.composed_coordinates
+        o_x, o_y = other.composed_coordinates
+        ss_x, ss_y = self.scale
+        os_x, os_y = other.scale
+
+        if o_x >= s_x + ss_x or o_x + os_x <= s_x or o_y >= s_y + ss_y or o_y + os_y <= s_y: return False # bounding boxes
+        if self.current_transformed_image is None or other.current_transformed_image is None: return True
+
+        mask = self.current_transformed_image.get_hit_mask()
+        other_mask = other.current_transformed_image.get_hit_mask()
+
+        if mask is None and other_mask is None: return True
+        if mask is None: # this image is opaque, checks the pixels of the other one it covers
+            return other_mask.overlaps_rect((int(s_x - o_x), int(s_y - o_y), int(s_x - o_x + ss_x), int(s_y - o_y + ss_y)))
+        if other_mask is None:
+            return mask.overlaps_rect((int(o_x - s_x), int(o_y - s_y), int(o_x - s_x + os_x), int(o_y - s_y + os_y)))
+
+        return mask.overlaps(other_mask, (int(o_x - s_x), int(o_y - s_y)))
 
 
     def set_click_callback(self, new_callback) -> None:
@@ -244,70 +517,136 @@ class Sprite:
         self.parent_canvas.unbind("<Motion>", self)
 
 
-    def show(self) -> None:
-        """Makes the widget reappear on the TK window"""
+    def show(self, queued: bool = True) -> None:
+        """
+        Makes the widget reappear on the TK window
+
+        queued: bool, see set_current_image
+        """
 
         self.is_shown = True
 
-        self.set_current_image(self.current_image_name)
+        self.set_current_image(self.current_image_name, queued)
 
-    def hide(self) -> None:
-        """Makes the widget disappear from the TK window. (Destroys it)"""
+    def hide(self, keep_item: bool = False) -> None:
+        """
+        Makes the widget disappear from the TK window. (Destroys it)
+
+        keep_item: bool, if True the canvas item is only hidden (not destroyed) so that showing the sprite again
+        is cheap, used by the pools (see modules/pool.py)
+        """
         global funcs_exec_queue, funcs_exec_queue_availible
 
         if not self.hover_callback is None: self.hover_callback[1]() # calls the hover released func if defined
 
-        if self.canvas_id is None: return
-
         self.is_shown = False
         self.stop_sequence()
 
+        if self.canvas_id is None: return
+
+        if keep_item:
+            if not self.parent_canvas.destroyed:
+                id_ref = self.canvas_id
+                funcs_exec_queue[self.main_thread_id] += [lambda: self.hide_canvas_item(id_ref)]
+
+            return
+
         id_ref = self.canvas_id
         self.canvas_id = None
 
-        funcs_exec_queue[self.main_thread_id] += [lambda: self.parent_canvas.delete(id_ref)]
+        if self.parent_canvas.destroyed: return # all of the canvas' items are deleted with it
+
+        funcs_exec_queue[self.main_thread_id] += [lambda: self.delete_canvas_item(id_ref)]
+
+    def hide_canvas_item(self, canvas_id: int) -> None:
+        """Internal func, hides an item of the parent canvas unless the sprite has been shown again since."""
+
+        if self.parent_canvas.destroyed or self.is_shown or self.canvas_id != canvas_id: return
+
+        self.parent_canvas.itemconfigure(canvas_id, state = "hidden")
 
+    def delete_canvas_item(self, canvas_id: int) -> None:
+        """Internal func, deletes an item of the parent canvas if it still exists."""
 
-    def play_sequence(self, sequence_name: str) -> None:
+        if self.parent_canvas.destroyed: return
+
+        self.parent_canvas.delete(canvas_id)
+
+
+    def play_sequence(self, sequence_name: str, generation: int = None) -> None:
         """
         Executes the sequence, as described in the model dict description.
+        Starts at self.sequence_index, self.sequence_jump can be set while the sequence plays to jump in it.
+        The index is kept by the thread: a replaced thread waking up doesn't modify the one of the new sequence.
 
         sequence_name: str, name of the sequece in the "sequences" dict of the model dict
+        generation: int, value of self.sequence_generation when the sequence was started
         """
 
-        index = 0
+        if generation is None: generation = self.sequence_generation
+
         sequence_ref = self.model["sequences"][sequence_name]
         sequence_len = len(sequence_ref)
 
+        trace.instant("sequence " + sequence_name, "sequence", {"sprite": self.id})
+
+        index = self.sequence_index
+
         # repeats if the sequence is a loop or until its end, also checks if the sequence should keep executing
-        while (sequence_ref[0] or index < sequence_len) and (not self.stop_current_sequence):
-            if index >= sequence_len: index = 0
+        while True:
+            if generation != self.sequence_generation or self.stop_current_sequence: break
+
+            jump = self.sequence_jump
+            if not jump is None:
+                self.sequence_jump = None
+                index = jump
+
+            if index >= sequence_len:
+                if not sequence_ref[0]: break
+                index = 0
+
+            self.sequence_index = index # published for self.get_state
+
+            if self.is_culled: # paused while the sprite is outside of the viewport
+                self.sequence_resume_event.wait(0.1)
+                continue
             
             instr = sequence_ref[index]
             if isinstance(instr, int): # if the instruction is a delay
-                sleep(instr/1000 / self.sequence_time_factor)
+                clock.sleep(instr/1000 / self.sequence_time_factor) # virtual time when a session is replayed
             elif isinstance(instr, tuple): # if the instruction is a model swap
-                self.set_displacement(instr[1])
-                self.set_current_image(instr[0])
+                with trace.span("sequence step", "sequence", None if not trace.enabled else {"sprite": self.id, "image": instr[0]}):
+                    self.set_displacement(instr[1])
+                    self.set_current_image(instr[0])
 
             index += 1
 
+        if generation != self.sequence_generation: return # another sequence replaced this one
+
         self.stop_current_sequence = False # resets the flag
         self.current_sequence = None
 
-    def start_sequence(self, sequence_name: str) -> None:
+    def start_sequence(self, sequence_name: str, start_index: int = 0) -> None:
         """
         Triggers the start of the execution of a sequence in a new thread.
 
         sequence_name: str, name of the sequence to be started from the "sequences" dict in the model dict
+        start_index: int, index of the instruction the sequence starts at
         """
 
         if not self.current_sequence is None: return # if a sequence is already running
 
         self.current_sequence = sequence_name
         self.stop_current_sequence = False # make sure the flag is reset before the start of the sequence
+        self.sequence_index = start_index
+        self.sequence_jump = None
+
+        self.sequence_generation += 1
+        generation = self.sequence_generation
 
-        self.sequence_thread = threading.Thread(name = str(self.id)+"_"+self.current_sequence, target = lambda: self.play_sequence(sequence_name))
+        if self.parent_canvas.headless: self.parent_canvas.add_sequence(self) # stopped when the headless level is destroyed
+
+        self.sequence_thread = threading.Thread(name = str(self.id)+"_"+self.current_sequence, target = lambda: self.play_sequence(sequence_name, generation))
         self.sequence_thread.start() # no need for internal queue since all of the sprite's render func are called in the main thread
 
     def stop_sequence(self) -> None:
@@ -317,7 +656,67 @@ class Sprite:
             self.stop_current_sequence = True # triggers the stop sequence flag
 
 
+    def set_sequence_state(self, sequence_name: str, index: int) -> None:
+        """
+        Makes the sprite play the given sequence from the given index, without waiting for the current one to end.
+
+        sequence_name: str, name of the sequence, None stops the current one
+        index: int, index of the instruction in the sequence
+        """
+
+        if sequence_name is None:
+            self.stop_sequence()
+            return
+
+        if sequence_name == self.current_sequence and not self.stop_current_sequence: # jumps in the playing sequence
+            self.sequence_jump = index
+            return
+
+        self.current_sequence = None # the thread of the previous sequence exits as soon as it sees the new generation
+        self.start_sequence(sequence_name, index)
+
+
+    def get_state(self) -> tuple:
+        """Returns the state of the sprite as a tuple (used by snapshots, see modules/snapshot.py)."""
+
+        return (
+            self.global_pos,
+            self.displacement,
+            tuple(self.scale),
+            self.current_image_name,
+            self.mirrored,
+            self.flipped,
+            self.is_shown,
+            self.current_sequence,
+            self.sequence_index
+        )
+
+    def set_state(self, state: tuple) -> None:
+        """
+        Restores a state returned by self.get_state, reuses the sprite instead of recreating it.
+
+        state: tuple
+        """
+
+        global_pos, displacement, scale, image_name, mirrored, flipped, is_shown, sequence_name, sequence_index = state
+
+        self.displacement = displacement
+        self.scale = scale
+        self.current_image_name = image_name
+        self.mirrored = mirrored
+        self.flipped = flipped
+
+        if is_shown: self.is_shown = True
+        elif self.is_shown: self.hide()
+
+        self.move(global_pos) # also recreates the image, once
+
+        if is_shown: self.set_sequence_state(sequence_name, sequence_index)
+
+
     def destroy(self) -> None:
         """Pretty much self explanatory."""
 
-        self.hide()
\ No newline at end of file
+        self.hide()
+
+        if not self.parent_canvas.camera is None: self.parent_canvas.camera.remove_sprite(self)
\ No newline at end of file
@@ -0,0 +1,194 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+
+
+"""
+Text rendering for in-game texts (dialogues, HUD counters, translated texts of the levels).
+
+The glyphs of each font (ttf file and size) are rasterized once, on first use, into the pages of a glyph atlas.
+A string is laid out from the glyphs' metrics and its alpha mask is composed from the atlas, without rasterizing
+the font again. The rendered strings are kept in a LRU cache, so a text redrawn at each frame (a counter, a timer)
+only costs a cache lookup once its values have been seen.
+
+Kerning isn't applied: glyphs are placed by their advance.
+"""
+
+atlas_page_size = (512, 512)
+rendered_texts_cache_size = 256 # max number of rendered strings kept
+
+@lru_cache(maxsize = None)
+def get_font(path: str, size: int) -> object:
+    """Returns the font of the given ttf file and size, loaded once."""
+
+    return ImageFont.truetype(path, size)
+
+
+class Glyph:
+    """Position of a rasterized character in the atlas and its metrics."""
+
+    def __init__(self, page: int, box: tuple, offset: tuple, advance: float) -> None:
+        """
+        page: int, index of the atlas page containing the glyph
+        box: tuple of 4 ints, x0, y0, x1, y1 of the glyph in its page
+        offset: tuple of 2 ints, position of the glyph relative to the pen (top of the line)
+        advance: float, horizontal distance to the next glyph
+        """
+
+        self.page = page
+        self.box = box
+        self.offset = offset
+        self.advance = advance
+
+class GlyphAtlas:
+    """Glyphs of a font, rasterized on first use into pages ("L" mode images, packed in shelves)."""
+
+    def __init__(self, font_path: str, size: int) -> None:
+        self.font = get_font(font_path, size)
+
+        ascent, descent = self.font.getmetrics()
+        self.line_height = ascent + descent
+
+        self.glyphs = {} # character -> Glyph
+        self.pages = []
+
+        # shelf packing: glyphs are put from left to right on the current shelf, a new shelf starts below it
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+
+        self.lock = threading.Lock()
+
+    def add_page(self) -> None:
+        self.pages += [Image.new("L", atlas_page_size, 0)]
+
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+
+    def get_glyph(self, character: str) -> Glyph:
+        """Returns the glyph of the character, rasterizes it the first time."""
+
+        glyph = self.glyphs.get(character)
+        if not glyph is None: return glyph
+
+        with self.lock:
+            if character in self.glyphs: return self.glyphs[character]
+
+            x0, y0, x1, y1 = self.font.getbbox(character)
+            width, height = max(x1 - x0, 0), max(y1 - y0, 0)
+            page_w, page_h = atlas_page_size
+
+            if len(self.pages) == 0: self.add_page()
+
+            if self.shelf_x + width > page_w: # next shelf
+                self.shelf_x = 0
+                self.shelf_y += self.shelf_height + 1
+                self.shelf_height = 0
+
+            if self.shelf_y + height > page_h: self.add_page()
+
+            x, y = self.shelf_x, self.shelf_y
+            if width != 0 and height != 0:
+                ImageDraw.Draw(self.pages[-1]).text((x - x0, y - y0), character, font = self.font, fill = 255)
+
+            self.shelf_x += width + 1
+            self.shelf_height = max(self.shelf_height, height)
+
+            glyph = Glyph(len(self.pages) - 1, (x, y, x + width, y + height), (x0, y0), self.font.getlength(character))
+            self.glyphs[character] = glyph
+
+        return glyph
+
+    def get_text_size(self, text: str) -> tuple:
+        """Returns the size of the laid out text (lines are separated by "\\n")."""
+
+        lines = text.split("\n")
+        width = max(sum(self.get_glyph(character).advance for character in line) for line in lines)
+
+        return (int(width + 0.5), self.line_height * len(lines))
+
+    def render_mask(self, text: str) -> object:
+        """Returns the alpha mask ("L" mode image) of the laid out text."""
+
+        mask = Image.new("L", self.get_text_size(text), 0)
+
+        for line_index, line in enumerate(text.split("\n")):
+            pen_x = 0
+            pen_y = line_index * self.line_height
+
+            for character in line:
+                glyph = self.get_glyph(character)
+
+                x0, y0, x1, y1 = glyph.box
+                if x1 != x0 and y1 != y0:
+                    glyph_mask = self.pages[glyph.page].crop(glyph.box)
+                    mask.paste(glyph_mask, (int(pen_x + glyph.offset[0]), pen_y + glyph.offset[1]), glyph_mask)
+
+                pen_x += glyph.advance
+
+        return mask
+
+
+atlases = {} # (font path, size) -> GlyphAtlas
+atlases_lock = threading.Lock()
+
+rendered_texts = OrderedDict() # (text, font, color) -> PIL image, least recently used first
+rendered_texts_lock = threading.Lock()
+
+def get_atlas(font: tuple) -> GlyphAtlas:
+    """Returns the atlas of the given font (tuple containing a path to the ttf file and its size)."""
+
+    atlas = atlases.get(font)
+    if not atlas is None: return atlas
+
+    with atlases_lock:
+        if not font in atlases: atlases[font] = GlyphAtlas(font[0], font[1])
+
+        return atlases[font]
+
+def render_text(text: str, font: tuple, color: tuple = (255, 255, 255)) -> object:
+    """
+    Returns the image of the given text (RGBA, transparent background), from the cache if already rendered.
+    The returned image is shared, copy it before modifying it.
+
+    text: str, lines are separated by "\\n"
+    font: tuple, containing a path to the ttf file and its size
+    color: tuple of 3 ints
+    """
+
+    key = (text, font, color)
+
+    with rendered_texts_lock:
+        image = rendered_texts.get(key)
+        if not image is None:
+            rendered_texts.move_to_end(key)
+            return image
+
+    mask = get_atlas(font).render_mask(text)
+    image = Image.new("RGBA", mask.size, tuple(color) + (0,))
+    image.putalpha(mask)
+
+    with rendered_texts_lock:
+        rendered_texts[key] = image
+        if len(rendered_texts) > rendered_texts_cache_size: rendered_texts.popitem(last = False)
+
+    return image
+
+def draw_text(image: object, text: str, x: int, y: int, font: tuple, color: tuple = (255, 255, 255)) -> None:
+    """
+    Draws the text centered on the given coordinates of the image.
+
+    image: Image, pil image object
+    """
+
+    text_image = render_text(text, font, color)
+    t_w, t_h = text_image.size
+
+    image.paste(text_image, (int(x - t_w / 2), int(y - t_h / 2)), text_image)
+
+def create_text_model(text: str, font: tuple, color: tuple = (255, 255, 255)) -> dict:
+    """Returns a model (see modules/sprite.py) with the rendered text as "main" image, used to display a text with a sprite."""
+
+    return {"images": {"main": render_text(text, font, color)}, "sequences": {}}
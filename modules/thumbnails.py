@@ -0,0 +1,191 @@
+import hashlib
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+from modules import files, level, sprite, work_queue
+
+
+"""
+Thumbnails of the levels, used by the level select screen.
+
+A thumbnail is generated by a worker process: the level's file is imported there and the level is rendered
+without a window with a headless game instance (see Level.render_thumbnail). Generated thumbnails are written on
+the disk, keyed by the hash of the level's file and the size, so they are only generated again when the level
+changes. Images used by a level aren't part of the hash, the cache folder can be deleted to regenerate them.
+"""
+
+thumbnails_version = 1 # increment it when the rendering changes, invalidates the thumbnails written on the disk
+
+class HeadlessGame:
+    """Minimal game instance given to the levels rendered in a worker process."""
+
+    headless = True
+
+    def __init__(self, frame_size: tuple, settings: dict) -> None:
+        self.frame_size = frame_size
+        self.settings = settings
+
+        self.debug = False
+        self.is_ingame = False
+        self.tkinter_thread_id = 0 # no tkinter thread, the queued functions are executed by Level.render_thumbnail
+
+        level.funcs_exec_queue[self.tkinter_thread_id] = work_queue.WorkQueue()
+        sprite.funcs_exec_queue[self.tkinter_thread_id] = work_queue.WorkQueue()
+
+    def queue_function(self, function: object, priority: str = "input") -> None:
+        function()
+
+    def queue_function_postprocess(self, function: object, priority: str = "render") -> None:
+        function()
+
+
+def generate_thumbnail(levels_path: str, file_name: str, size: tuple, frame_size: tuple, settings: dict, path: str) -> str:
+    """
+    Executed by a worker process, renders a level and writes its thumbnail.
+
+    levels_path: str, folder of the levels' files
+    file_name: str, name of the level's file (without extension)
+    size: tuple of 2 ints, size of the thumbnail
+    frame_size: tuple of 2 ints, size of the game's window
+    settings: dict, settings given to the level (language, ...)
+    path: str, path of the PNG file to write
+
+    returns: the path of the thumbnail
+    """
+
+    if not levels_path in sys.path: sys.path.append(levels_path)
+
+    level_object = __import__(file_name).CLevel(HeadlessGame(frame_size, settings))
+    image = level_object.render_thumbnail(size)
+
+    files.write_atomically(path, lambda file: image.save(file, "PNG"), binary = True)
+
+    return path
+
+
+class ThumbnailGenerator:
+    """Generates the thumbnails of the levels in a pool of processes, and caches them in memory and on the disk."""
+
+    def __init__(self, game_instance: object, cache_path: str, size: tuple = (120, 120), workers: int = 2) -> None:
+        """
+        game_instance: Game
+        cache_path: str, folder in which the thumbnails are written
+        size: tuple of 2 ints, size of the thumbnails
+        workers: int, number of worker processes
+        """
+
+        self.game_instance = game_instance
+        self.cache_path = cache_path
+        self.size = size
+        self.workers = workers
+
+        self.levels_path = os.path.realpath("levels")
+
+        self.images = {} # level's file name -> PIL image
+        self.hashes = {} # path of a level's file -> (modification time, hash of the file)
+        self.pending = {} # level's file name -> list of the callbacks waiting for its thumbnail
+        self.lock = threading.Lock()
+
+        self.executor = None # created on the first generation
+
+    def get_level_hash(self, file_name: str) -> str:
+        """Returns the hash of a level's file, only computed again when the file is modified."""
+
+        path = os.path.join(self.levels_path, file_name + ".py")
+        modification_time = os.stat(path).st_mtime_ns
+
+        cached = self.hashes.get(path)
+        if not cached is None and cached[0] == modification_time: return cached[1]
+
+        with open(path, "rb") as file:
+            level_hash = hashlib.sha1(file.read()).hexdigest()
+
+        self.hashes[path] = (modification_time, level_hash)
+
+        return level_hash
+
+    def get_thumbnail_path(self, file_name: str) -> str:
+        level_hash = self.get_level_hash(file_name)
+
+        key = "{}_{}_{}x{}_{}".format(file_name, level_hash, self.size[0], self.size[1], thumbnails_version)
+
+        return os.path.join(self.cache_path, key + ".png")
+
+    def load_image(self, path: str) -> object:
+        image = Image.open(path)
+        image.load()
+
+        return image
+
+    def get_thumbnail(self, file_name: str) -> object:
+        """Returns the thumbnail of the level if it's in memory, None otherwise."""
+
+        return self.images.get(file_name)
+
+    def request(self, file_name: str, callback: object) -> None:
+        """
+        Calls the callback with the level's file name and its thumbnail (PIL image, None if it couldn't be
+        generated), immediately if it's in memory, otherwise from another thread once loaded or generated.
+        """
+
+        with self.lock:
+            is_cached = file_name in self.images
+            if is_cached: image = self.images[file_name]
+            elif file_name in self.pending: # already requested
+                self.pending[file_name] += [callback]
+                return
+            else: self.pending[file_name] = [callback]
+
+        if is_cached:
+            callback(file_name, image)
+            return
+
+        path = self.get_thumbnail_path(file_name)
+
+        if os.path.exists(path):
+            threading.Thread(target = lambda: self.finish(file_name, path, None), name = "thumbnail_loading", daemon = True).start()
+            return
+
+        if self.executor is None: # spawned: forking would copy the game's threads and tkinter state in the workers
+            self.executor = ProcessPoolExecutor(max_workers = self.workers, mp_context = multiprocessing.get_context("spawn"))
+        os.makedirs(self.cache_path, exist_ok = True)
+
+        future = self.executor.submit(
+            generate_thumbnail,
+            self.levels_path,
+            file_name,
+            self.size,
+            self.game_instance.frame_size,
+            dict(self.game_instance.settings),
+            path
+        )
+        future.add_done_callback(lambda future: self.finish(file_name, path, future))
+
+    def finish(self, file_name: str, path: str, future: object) -> None:
+        """Internal function, loads a generated/cached thumbnail and calls the callbacks waiting for it."""
+
+        try:
+            if not future is None: future.result() # raises the exception of the worker, if one
+            image = self.load_image(path)
+
+        except Exception as exception:
+            if self.game_instance.debug: print("Thumbnail of \"{}\" couldn't be generated: {}".format(file_name, exception))
+            image = None
+
+        with self.lock:
+            self.images[file_name] = image
+            callbacks = self.pending.pop(file_name, [])
+
+        for callback in callbacks:
+            callback(file_name, image)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+
+        if not self.executor is None:
+            self.executor.shutdown(wait = False, cancel_futures = True)
+            self.executor = None
@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter
+
+from modules import files
+
+
+"""
+Tracing of the frames and of the threads' activity, exported as Chrome trace events (JSON), readable with
+chrome://tracing or https://ui.perfetto.dev (one track per thread).
+
+Tracing is disabled by default, the traced functions then only check the enabled flag. Once started, the events
+are kept in a ring buffer: only the last events are kept, so the tracing can stay enabled during long sessions and
+the buffer can be exported when a long frame happens (see Game.start_trace).
+"""
+
+default_buffer_size = 200000 # max number of events kept
+
+enabled = False
+start_time = perf_counter()
+
+events = deque(maxlen = default_buffer_size) # tuples (phase, name, category, ts, dur, thread id, args)
+thread_names = {} # thread id -> name, exported as metadata events
+
+
+def start(buffer_size: int = default_buffer_size) -> None:
+    """Clears the buffer and starts tracing."""
+    global enabled, events, start_time
+
+    events = deque(maxlen = buffer_size)
+    thread_names.clear()
+    start_time = perf_counter()
+
+    enabled = True
+
+def stop() -> None:
+    global enabled
+
+    enabled = False
+
+def get_timestamp() -> float:
+    """Returns the time since the start of the trace, in microseconds."""
+
+    return (perf_counter() - start_time) * 1000000
+
+def get_thread_id() -> int:
+    thread_id = threading.get_ident()
+
+    if not thread_id in thread_names: thread_names[thread_id] = threading.current_thread().name
+
+    return thread_id
+
+
+class Span:
+    """Context manager adding a complete event ("X") for the duration of its block."""
+
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name: str, category: str, args: dict) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> "Span":
+        self.start = get_timestamp()
+        return self
+
+    def __exit__(self, *exception) -> None:
+        start = self.start
+        events.append(("X", self.name, self.category, start, get_timestamp() - start, get_thread_id(), self.args))
+
+class NullSpan:
+    """Context manager returned when tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        pass
+
+null_span = NullSpan()
+
+def span(name: str, category: str = "game", args: dict = None) -> object:
+    """
+    Returns a context manager tracing its block.
+
+    name: str, name of the event
+    category: str, category of the event ("frame", "queue", "sprite", "input"...)
+    args: dict, values shown with the event
+    """
+
+    if not enabled: return null_span
+
+    return Span(name, category, args)
+
+def instant(name: str, category: str = "game", args: dict = None) -> None:
+    """Adds an instant event ("i") on the calling thread's track."""
+
+    if enabled: events.append(("i", name, category, get_timestamp(), 0, get_thread_id(), args))
+
+def complete(name: str, category: str, start: float, end: float, args: dict = None) -> None:
+    """Adds a complete event from perf_counter values, for blocks that can't use span."""
+
+    if enabled: events.append(("X", name, category, (start - start_time) * 1000000, (end - start) * 1000000, get_thread_id(), args))
+
+def counter(name: str, values: dict) -> None:
+    """Adds a counter event ("C"), values: dict of series name -> number."""
+
+    if enabled: events.append(("C", name, "counter", get_timestamp(), 0, get_thread_id(), values))
+
+
+def copy_buffer() -> tuple:
+    """Returns copies of the events and of the threads' names, taken while other threads keep tracing."""
+
+    while True:
+        try: return (list(events), dict(thread_names))
+        except RuntimeError: pass # modified during the copy, retries
+
+def get_trace() -> dict:
+    """Returns the content of the buffer as a Chrome trace (dict of the JSON object format)."""
+
+    process_id = os.getpid()
+    buffered_events, names = copy_buffer()
+    trace_events = []
+
+    for thread_id, name in names.items():
+        trace_events += [{"ph": "M", "name": "thread_name", "pid": process_id, "tid": thread_id, "args": {"name": name}}]
+
+    for phase, name, category, timestamp, duration, thread_id, args in buffered_events:
+        event = {"ph": phase, "name": name, "cat": category, "ts": timestamp, "pid": process_id, "tid": thread_id}
+
+        if phase == "X": event["dur"] = duration
+        elif phase == "i": event["s"] = "t"
+        if not args is None: event["args"] = args
+
+        trace_events += [event]
+
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+def export(path: str) -> None:
+    """Writes the content of the buffer in a JSON file."""
+
+    trace = get_trace()
+
+    files.write_atomically(path, lambda file: json.dump(trace, file))
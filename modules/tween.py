@@ -0,0 +1,180 @@
+import threading
+from array import array
+
+from modules import sprite
+
+
+"""
+Tweens: interpolations of a sprite's position, scale or displacement driven by the frame clock.
+
+Every active tween of a level is stored in the columns of its TweenEngine (one array per value, like the components
+of modules/ecs.py) and they are all advanced by a single step per frame (see Level.tick), in the tkinter thread.
+The sprites modified during a step are updated at once at the end of it, each sprite only once even if several of
+its properties are animated.
+
+A tween replaces the previous tween of the same property of the same sprite.
+"""
+
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: t * (2 - t),
+    "ease_in_out": lambda t: 2 * t * t if t < 0.5 else -1 + (4 - 2 * t) * t,
+    "ease_in_cubic": lambda t: t * t * t,
+    "ease_out_cubic": lambda t: 1 - (1 - t) ** 3,
+    "smoothstep": lambda t: t * t * (3 - 2 * t)
+}
+
+PROPERTIES = ("pos", "scale", "displacement")
+
+class TweenEngine:
+    """Active tweens of a level."""
+
+    def __init__(self) -> None:
+        self.targets = [] # (sprite, property) of each tween
+        self.indexes = {} # (sprite, property) -> index in the columns
+
+        self.start_x = array("d")
+        self.start_y = array("d")
+        self.delta_x = array("d")
+        self.delta_y = array("d")
+        self.elapsed = array("d")
+        self.duration = array("d")
+        self.easings = [] # easing function of each tween
+        self.callbacks = [] # function called when the tween is over (or None)
+
+        self.lock = threading.Lock() # tweens can be added from any thread
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def get_value(self, sprite_ref: object, property_name: str) -> tuple:
+        """Returns the current value of an animatable property of the sprite."""
+
+        if property_name == "pos": return sprite_ref.global_pos
+        if property_name == "scale": return sprite_ref.scale
+        return sprite_ref.displacement
+
+    def add(self, sprite_ref: object, property_name: str, end: tuple, duration: float, easing: str = "linear", callback: object = None, start: tuple = None) -> None:
+        """
+        Animates a property of the sprite.
+
+        sprite_ref: Sprite
+        property_name: str, "pos", "scale" or "displacement"
+        end: tuple of 2 numbers, value of the property at the end of the tween
+        duration: float, in seconds
+        easing: str, key of EASINGS
+        callback: function called without arguments when the tween is over (not if it's cancelled)
+        start: tuple of 2 numbers, value at the start of the tween, the current value if None
+        """
+
+        if not property_name in PROPERTIES: raise ValueError("Unknown tween property: {}".format(property_name))
+
+        if start is None: start = self.get_value(sprite_ref, property_name)
+        key = (sprite_ref, property_name)
+
+        with self.lock:
+            index = self.indexes.get(key)
+            if index is None:
+                index = len(self.targets)
+                self.indexes[key] = index
+                self.targets += [key]
+
+                for column in (self.start_x, self.start_y, self.delta_x, self.delta_y, self.elapsed, self.duration):
+                    column.append(0)
+                self.easings += [None]
+                self.callbacks += [None]
+
+            self.start_x[index] = start[0]
+            self.start_y[index] = start[1]
+            self.delta_x[index] = end[0] - start[0]
+            self.delta_y[index] = end[1] - start[1]
+            self.elapsed[index] = 0
+            self.duration[index] = duration
+            self.easings[index] = EASINGS[easing]
+            self.callbacks[index] = callback
+
+    def cancel(self, sprite_ref: object, property_name: str = None) -> None:
+        """Stops the tweens of the sprite (only the one of the given property if not None), where they are."""
+
+        properties = PROPERTIES if property_name is None else (property_name,)
+
+        with self.lock:
+            for name in properties:
+                index = self.indexes.get((sprite_ref, name))
+                if not index is None: self.remove(index)
+
+    def remove(self, index: int) -> None:
+        """Internal function, removes a tween, the last one is moved in its place (the lock has to be held)."""
+
+        del self.indexes[self.targets[index]]
+
+        last_index = len(self.targets) - 1
+        if index != last_index:
+            self.targets[index] = self.targets[last_index]
+            self.indexes[self.targets[index]] = index
+
+            for column in (self.start_x, self.start_y, self.delta_x, self.delta_y, self.elapsed, self.duration, self.easings, self.callbacks):
+                column[index] = column[last_index]
+
+        self.targets.pop()
+        for column in (self.start_x, self.start_y, self.delta_x, self.delta_y, self.elapsed, self.duration, self.easings, self.callbacks):
+            column.pop()
+
+    def clear(self) -> None:
+        """Stops every tween."""
+
+        with self.lock:
+            self.targets = []
+            self.indexes = {}
+
+            for column in (self.start_x, self.start_y, self.delta_x, self.delta_y, self.elapsed, self.duration):
+                del column[:]
+            self.easings = []
+            self.callbacks = []
+
+
+    def step(self, dt: float) -> None:
+        """
+        Advances every tween, executed once per frame in the tkinter thread.
+
+        dt: float, time elapsed since the last step in seconds
+        """
+
+        with self.lock:
+            if len(self.targets) == 0: return
+
+            # local references, avoids the attribute lookups in the loop
+            targets, easings = self.targets, self.easings
+            start_x, start_y, delta_x, delta_y = self.start_x, self.start_y, self.delta_x, self.delta_y
+            elapsed, duration = self.elapsed, self.duration
+
+            modified = {} # sprite -> None, keeps the order of the tweens
+            finished = []
+
+            for i in range(len(targets)):
+                elapsed[i] += dt
+                progress = 1 if elapsed[i] >= duration[i] else elapsed[i] / duration[i]
+                if progress == 1: finished += [i]
+
+                k = easings[i](progress)
+                value = (start_x[i] + delta_x[i] * k, start_y[i] + delta_y[i] * k)
+
+                sprite_ref, property_name = targets[i]
+                if property_name == "pos": sprite_ref.global_pos = value
+                elif property_name == "scale": sprite_ref.scale = (int(value[0]), int(value[1]))
+                else: sprite_ref.displacement = value
+
+                modified[sprite_ref] = None
+
+            callbacks = [self.callbacks[i] for i in finished]
+            for i in reversed(finished): # indexes are sorted, removing from the end keeps the others valid
+                self.remove(i)
+
+        # a single move per sprite applies its new position, displacement and scale
+        for sprite_ref in modified:
+            sprite_ref.move(sprite_ref.global_pos, queued = False)
+        sprite.update_sprites(modified)
+
+        for callback in callbacks:
+            if not callback is None: callback()
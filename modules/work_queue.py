@@ -0,0 +1,98 @@
+from collections import deque
+from time import perf_counter
+
+from modules import trace
+
+
+"""
+Queues of the functions executed in the tkinter thread (see Game.update_frame).
+
+Each queued function has a priority class, executed in this order:
+- "input": reactions to the player and the game's own requests (menus), always executed in the frame
+- "render": canvas updates (sprites' images, level canvases)
+- "load": work that has to wait for the render work queued before it (swapping a loaded level)
+- "background": work that can wait (thumbnails, reports)
+
+The functions other than "input" are executed while the frame's time budget isn't exceeded, the remaining ones are
+executed in the next frames: a burst of work (a level queuing hundreds of sprites) no longer freezes a frame.
+"""
+
+priorities = ("input", "render", "load", "background")
+
+class WorkQueue:
+    """Functions waiting to be executed in the tkinter thread, by priority class."""
+
+    def __init__(self, default_priority: str = "render", wake_callback: object = None) -> None:
+        """
+        default_priority: str, priority of the functions added with += (queue += [function])
+        wake_callback: function called after a function is queued (wakes the idle tkinter thread, see Game.wake)
+        """
+
+        self.default_priority = default_priority
+        self.wake_callback = wake_callback
+        self.queues = {priority: deque() for priority in priorities} # deques: appended from any thread without lock
+
+    def __iadd__(self, functions: list) -> "WorkQueue":
+        for function in functions:
+            self.queues[self.default_priority].append(function)
+
+        if not self.wake_callback is None: self.wake_callback()
+
+        return self
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def add(self, function: object, priority: str = None) -> None:
+        """Queues a function with the given priority (the queue's default priority if None)."""
+
+        self.queues[self.default_priority if priority is None else priority].append(function)
+
+        if not self.wake_callback is None: self.wake_callback()
+
+    def count(self, priority: str) -> int:
+        return len(self.queues[priority])
+
+    def pop(self, priority: str) -> object:
+        """Returns the oldest function of the given priority, None if there is none."""
+
+        try: return self.queues[priority].popleft()
+        except IndexError: return None
+
+    def clear(self) -> None:
+        for queue in self.queues.values():
+            queue.clear()
+
+def execute(queues: list, budget: float, debug: bool = False) -> int:
+    """
+    Executes the functions of the given WorkQueues, by priority then in the order of the queues. Only the functions
+    queued before the call are executed, the ones they queue wait for the next call.
+
+    budget: float, time in seconds after which only the "input" functions are executed (at least one function is
+    executed, so that the work always progresses)
+
+    returns: the number of executed functions
+    """
+
+    deadline = perf_counter() + budget
+    executed = 0
+
+    pending = [[queue.count(priority) for priority in priorities] for queue in queues] # snapshot of the queues
+
+    for priority_index, priority in enumerate(priorities):
+        with trace.span(priority, "queue"):
+            for queue_index, queue in enumerate(queues):
+                for _ in range(pending[queue_index][priority_index]):
+                    if priority != "input" and executed != 0 and perf_counter() >= deadline:
+                        if debug: print("Frame budget exceeded, remaining functions are delayed.")
+                        return executed # the lower priorities wait for the next frames
+
+                    function = queue.pop(priority)
+                    if function is None: break
+
+                    if debug: print(function)
+                    function()
+
+                    executed += 1
+
+    return executed
@@ -0,0 +1,10 @@
+import os
+import sys
+
+
+# the engine's modules are imported from the repository's root. The tests are imported with
+# --import-mode=importlib (see pytest.ini): tests/ isn't put on sys.path, its modules folder would shadow the engine's
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# manual test scripts (tkinter windows, endless loops), executed on import
+collect_ignore = ["test_copy.py", "test_maxime.py", "test_sprite.py", "test3", "modules"]
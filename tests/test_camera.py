@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+from modules import level
+from modules.camera import Camera
+
+
+class StubCanvas:
+    """Records the calls made by the camera on its canvas."""
+
+    def __init__(self) -> None:
+        self.camera = None
+        self.scroll_region = None
+        self.scrolls = []
+
+    def set_scroll_region(self, size: tuple) -> None:
+        self.scroll_region = size
+
+    def scroll_to(self, pos: tuple) -> None:
+        self.scrolls += [pos]
+
+class StubSprite:
+    def __init__(self, pos: tuple, scale: tuple = (10, 10)) -> None:
+        self.composed_coordinates = pos
+        self.scale = scale
+        self.is_culled = False
+        self.refreshes = 0
+
+    def set_culled(self, culled: bool, refresh: bool = True) -> None:
+        if culled == self.is_culled: return
+
+        self.is_culled = culled
+        if not culled and refresh: self.refreshes += 1
+
+def create_camera() -> Camera:
+    return Camera(StubCanvas(), (1000, 1000), (100, 100))
+
+def test_update_sprite_cells() -> None:
+    camera = create_camera()
+    assert camera.canvas.camera is camera
+    assert camera.canvas.scroll_region == (1000, 1000)
+
+    sprite = StubSprite((95, 5))
+    camera.update_sprite(sprite)
+
+    assert camera.sprites_cells[sprite] == (0, 0, 1, 0) # overlaps 2 cells
+    assert camera.cells == {(0, 0): {sprite}, (1, 0): {sprite}}
+    assert not sprite.is_culled
+
+    sprite.composed_coordinates = (250, 350)
+    camera.update_sprite(sprite)
+
+    assert camera.sprites_cells[sprite] == (2, 3, 2, 3)
+    assert camera.cells == {(2, 3): {sprite}} # empty cells are removed
+    assert sprite.is_culled
+    assert sprite.refreshes == 0 # the image is refreshed by Sprite.move
+
+    camera.remove_sprite(sprite)
+    assert camera.cells == {} and camera.sprites_cells == {}
+
+def test_move_to_culling() -> None:
+    camera = create_camera()
+
+    near, far = StubSprite((50, 50)), StubSprite((520, 20))
+    camera.update_sprite(near)
+    camera.update_sprite(far)
+    assert not near.is_culled and far.is_culled
+
+    camera.move_to((480, 0))
+
+    assert camera.pos == (480, 0)
+    assert camera.canvas.scrolls == [(480, 0)]
+    assert near.is_culled and not far.is_culled
+    assert far.refreshes == 1
+
+    camera.move_to((5000, -20)) # clamped to the world
+    assert camera.pos == (900, 0)
+
+    camera.move_to((900, 0)) # same position, nothing is scrolled
+    assert camera.canvas.scrolls == [(480, 0), (900, 0)]
+
+def test_move_to_only_checks_nearby_cells() -> None:
+    camera = create_camera()
+
+    distant = StubSprite((800, 800))
+    camera.update_sprite(distant)
+    assert distant.is_culled
+
+    distant.is_culled = False # not in the cells around the viewports, left untouched
+    camera.move_to((100, 0))
+
+    assert not distant.is_culled
+
+def test_event_handler_view_offset() -> None:
+    received = []
+    canvas = SimpleNamespace(name = None, view_offset = (300, 40), binds = {"<Button-1>": {"ref": received.append}})
+
+    event = SimpleNamespace(x = 10, y = 20)
+    level.LevelCanvas.event_handler(canvas, event, "<Button-1>")
+
+    assert received == [event]
+    assert (event.x, event.y) == (310, 60) # window coordinates converted to world coordinates
@@ -0,0 +1,106 @@
+from time import sleep
+
+from modules import level, work_queue
+from modules.chunks import ChunkStreamer
+
+
+class StubGame:
+    def __init__(self) -> None:
+        self.queue = work_queue.WorkQueue("load")
+
+    def queue_function(self, function: object, priority: str = "input") -> None:
+        self.queue.add(function, priority)
+
+class StubLevel:
+    def __init__(self, grid_dimensions: tuple) -> None:
+        self.grid_dimensions = grid_dimensions
+        self.grid_map = level.GridMap(grid_dimensions)
+        self.game_instance = StubGame()
+        self.objects = []
+
+    def remove_objects(self, objects: list) -> None:
+        self.objects = [obj for obj in self.objects if not obj in objects]
+
+class StateObject:
+    type = "entity"
+
+    def __init__(self, pos: tuple) -> None:
+        self.pos = pos
+        self.state = ("created", pos)
+        self.destroyed = False
+
+    def get_state(self) -> tuple:
+        return self.state
+
+    def set_state(self, state: tuple) -> None:
+        self.state = state
+
+    def destroy(self) -> None:
+        self.destroyed = True
+
+def create_streamer(max_stored_chunks: int = 64) -> tuple:
+    level_instance = StubLevel((40, 10))
+
+    def create(rect: tuple) -> list:
+        obj = StateObject((rect[0], rect[1]))
+        level_instance.grid_map[rect[1]][rect[0]] += [obj]
+        level_instance.objects += [obj]
+
+        return [obj]
+
+    streamer = ChunkStreamer(level_instance, create, (10, 10), 0, max_stored_chunks)
+
+    return level_instance, streamer
+
+def run_until_done(level_instance: object, streamer: ChunkStreamer) -> None:
+    """Executes the queued functions as the tkinter thread would, until the chunks are loaded/unloaded."""
+
+    for _ in range(500):
+        work_queue.execute([level_instance.game_instance.queue], float("inf"))
+
+        with streamer.lock:
+            if len(streamer.pending) == 0 and len(level_instance.game_instance.queue) == 0: return
+
+        sleep(0.005)
+
+    assert False, "chunks still pending"
+
+def check_round_trip(max_stored_chunks: int) -> None:
+    level_instance, streamer = create_streamer(max_stored_chunks)
+
+    try:
+        streamer.set_focus((0, 0))
+        run_until_done(level_instance, streamer)
+
+        assert list(streamer.loaded) == [(0, 0)]
+        first = streamer.loaded[(0, 0)][0]
+        first.state = ("modified", 1)
+
+        streamer.set_focus((35, 0)) # 3 chunks away, (0, 0) is unloaded
+        run_until_done(level_instance, streamer)
+
+        assert set(streamer.loaded) == {(3, 0)}
+        assert first.destroyed
+        assert level_instance.grid_map[0][0] == [] # removed from the grid
+        assert not first in level_instance.objects
+
+        streamer.set_focus((15, 0)) # (3, 0) stays loaded, one chunk further than the load radius
+        run_until_done(level_instance, streamer)
+        streamer.set_focus((5, 5))
+        run_until_done(level_instance, streamer)
+
+        assert set(streamer.loaded) == {(0, 0), (1, 0)}
+        reloaded = streamer.loaded[(0, 0)][0]
+        assert not reloaded is first
+        assert reloaded.state == ("modified", 1) # restored
+        assert streamer.loaded[(1, 0)][0].state == ("created", (10, 0)) # never unloaded, created state
+    finally:
+        streamer.shutdown()
+
+def test_unload_reload_state() -> None:
+    check_round_trip(64)
+
+def test_unload_reload_state_from_disk() -> None:
+    """The serialized chunks over max_stored_chunks are written in a temporary folder."""
+
+    check_round_trip(0)
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from modules.collision import CollisionSystem
+
+
+def create_system(walls: list) -> CollisionSystem:
+    """walls: list of str, a row of tiles per string ("#" is a wall), tiles of 10x10 pixels"""
+
+    walls_map = [[tile == "#" for tile in row] for row in walls]
+    level_instance = SimpleNamespace(grid_dimensions = (len(walls[0]), len(walls)), tile_scale = (10, 10), walls_map = walls_map)
+
+    return CollisionSystem(level_instance, sync_sprites = False)
+
+def test_sweep_stops_at_wall() -> None:
+    system = create_system([
+        ".....#....",
+    ])
+
+    # box of 8 pixels at x = 20 moving right, the wall starts at x = 50
+    assert system.sweep_axis(20, 8, 10, 0, 10, 10, 10, True) == (30, False)
+    assert system.sweep_axis(20, 8, 30, 0, 10, 10, 10, True) == (42, True)
+
+    # moving left, from the other side of the wall
+    assert system.sweep_axis(70, 8, -25, 0, 10, 10, 10, True) == (60, True)
+
+def test_sweep_tile_boundaries() -> None:
+    system = create_system([
+        "....#.....",
+    ])
+
+    # the leading edge ends exactly on the wall's tile boundary: touching isn't entering
+    assert system.sweep_axis(22, 8, 10, 0, 10, 10, 10, True) == (32, False)
+    assert system.sweep_axis(22, 8, 10.5, 0, 10, 10, 10, True) == (32, True)
+
+    # a box exactly filling a tile, already against the wall
+    assert system.sweep_axis(30, 10, 5, 0, 10, 10, 10, True) == (30, True)
+    assert system.sweep_axis(50, 10, -5, 0, 10, 10, 10, True) == (50, True)
+
+def test_sweep_no_tunneling() -> None:
+    """A movement much larger than a tile still stops at the first thin wall crossed."""
+
+    system = create_system([
+        "..........",
+        "...#......",
+        "..........",
+    ])
+
+    assert system.sweep_axis(0, 5, 500, 12, 6, 10, 10, True) == (25, True)
+    assert system.sweep_axis(0, 5, 500, 22, 6, 10, 10, True) == (95, True) # stopped by the level's border
+
+    # vertical movement, the box straddles the wall's column
+    assert system.sweep_axis(0, 5, 100, 28, 4, 10, 10, False) == (5, True)
+    assert system.sweep_axis(0, 5, 100, 40, 4, 10, 10, False) == (25, True)
+
+def test_sweep_other_axis_rows() -> None:
+    """Every row overlapped by the box on the other axis is checked."""
+
+    system = create_system([
+        "..........",
+        ".....#....",
+    ])
+
+    assert system.sweep_axis(0, 5, 80, 5, 6, 10, 10, True) == (45, True) # overlaps rows 0 and 1
+    assert system.sweep_axis(0, 5, 80, 0, 10, 10, 10, True) == (80, False) # only row 0
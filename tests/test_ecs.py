@@ -0,0 +1,85 @@
+from modules.ecs import ComponentStorage, System, World
+
+
+def test_swap_remove() -> None:
+    storage = ComponentStorage("position", {"x": "d", "y": "d", "name": None})
+
+    for entity in ("a", "b", "c", "d"):
+        storage.add(entity, {"x": ord(entity), "name": entity})
+
+    assert storage.remove("b")
+    assert not storage.remove("b")
+
+    # the last component is moved in the removed one's place
+    assert storage.entities == ["a", "d", "c"]
+    assert storage.indexes == {"a": 0, "d": 1, "c": 2}
+    assert list(storage.columns["x"]) == [ord("a"), ord("d"), ord("c")]
+    assert storage.columns["name"] == ["a", "d", "c"]
+    assert storage.get("d", "y") == 0 # missing fields default to 0
+
+    assert storage.remove("c") # last element, nothing is moved
+    assert storage.entities == ["a", "d"]
+    assert len(storage) == 2
+
+def test_add_existing_updates() -> None:
+    storage = ComponentStorage("health", {"value": "i"})
+
+    storage.add("a", {"value": 3})
+    storage.add("a", {"value": 5})
+
+    assert len(storage) == 1
+    assert storage.get("a", "value") == 5
+
+def test_query_cache_invalidation() -> None:
+    world = World()
+    world.register_component("position", {"x": "d"})
+    world.register_component("velocity", {"x": "d"})
+
+    world.add_component("a", "position", {})
+    world.add_component("b", "position", {})
+    world.add_component("b", "velocity", {})
+
+    entities, indexes = world.query(("position", "velocity"))
+    assert entities == ["b"]
+    assert indexes == {"position": [1], "velocity": [0]}
+    assert world.query(("position", "velocity"))[0] is entities # cached
+
+    world.add_component("b", "velocity", {"x": 2}) # update, the query stays valid
+    assert world.query(("position", "velocity"))[0] is entities
+
+    world.add_component("a", "velocity", {})
+    entities, indexes = world.query(("position", "velocity"))
+    assert sorted(entities) == ["a", "b"]
+
+    world.remove_component("b", "position") # "a" is swapped at index 0 of the positions
+    entities, indexes = world.query(("position", "velocity"))
+    assert entities == ["a"]
+    assert indexes == {"position": [0], "velocity": [1]}
+
+    world.remove_entity("a")
+    assert world.query(("position", "velocity")) == ([], {"position": [], "velocity": []})
+
+def test_systems_order() -> None:
+    calls = []
+
+    class Recorder(System):
+        def __init__(self, name: str, order: int) -> None:
+            self.name = name
+            self.order = order
+
+        def process(self, world: object, entities: list, indexes: dict, dt: float) -> None:
+            calls.append((self.name, list(entities), dt))
+
+    world = World()
+    world.register_component("position", {"x": "d"})
+    world.add_component("a", "position", {})
+
+    moving = Recorder("moving", 1)
+    moving.components = ("position",)
+    world.add_system(moving)
+    world.add_system(Recorder("first", 0))
+    world.add_system(Recorder("second", 0))
+
+    world.tick(0.5)
+
+    assert calls == [("first", [], 0.5), ("second", [], 0.5), ("moving", ["a"], 0.5)]
@@ -0,0 +1,31 @@
+import os
+
+from modules import files
+
+
+def test_write_atomically(tmp_path: object) -> None:
+    path = tmp_path / "data.txt"
+
+    files.write_atomically(str(path), lambda file: file.write("first"))
+    assert path.read_text() == "first"
+    assert os.stat(path).st_mode & 0o777 == files.default_file_mode
+
+    os.chmod(path, 0o600)
+    files.write_atomically(str(path), lambda file: file.write(b"second"), binary = True, sync = True)
+    assert path.read_text() == "second"
+    assert os.stat(path).st_mode & 0o777 == 0o600 # the mode of the replaced file is kept
+
+def test_failed_write_keeps_file(tmp_path: object) -> None:
+    path = tmp_path / "data.txt"
+    path.write_text("previous")
+
+    def failing_write(file: object) -> None:
+        file.write("partial")
+        raise OSError("disk full")
+
+    try: files.write_atomically(str(path), failing_write)
+    except OSError: pass
+    else: assert False, "OSError not raised"
+
+    assert path.read_text() == "previous"
+    assert os.listdir(tmp_path) == ["data.txt"] # the temporary file is removed
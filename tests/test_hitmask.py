@@ -0,0 +1,77 @@
+from modules.hitmask import HitMask
+
+
+def create_mask(rows: list) -> HitMask:
+    """Returns the mask of the given rows ("#" opaque, "." transparent)."""
+
+    width = len(rows[0])
+    row_size = (width + 7) // 8
+
+    data = b"".join(int(row.replace("#", "1").replace(".", "0").ljust(row_size * 8, "0"), 2).to_bytes(row_size, "big") for row in rows)
+
+    return HitMask(data, (width, len(rows)))
+
+def test_test() -> None:
+    mask = create_mask([
+        "#.........",
+        ".........#",
+        "....#....."
+    ])
+
+    assert mask.test(0, 0)
+    assert mask.test(9, 1) # second byte of the row
+    assert mask.test(4, 2)
+    assert not mask.test(1, 0)
+    assert not mask.test(8, 1)
+    assert not mask.test(-1, 0) and not mask.test(10, 1) and not mask.test(0, 3) # outside of the mask
+
+def test_overlaps_shifts() -> None:
+    mask = create_mask([
+        "..........",
+        "...##.....",
+        "...##.....",
+        ".........."
+    ])
+    dot = create_mask(["#"])
+
+    assert mask.overlaps(dot, (3, 1))
+    assert mask.overlaps(dot, (4, 2))
+    assert not mask.overlaps(dot, (5, 1))
+    assert not mask.overlaps(dot, (2, 2))
+    assert not mask.overlaps(dot, (3, 3))
+
+def test_overlaps_wider_mask() -> None:
+    """The other mask has more bytes per row than this one (negative shift)."""
+
+    mask = create_mask([
+        "#...",
+        "...#"
+    ])
+    bar = create_mask(["................#"])
+
+    assert mask.overlaps(bar, (-16, 0))
+    assert mask.overlaps(bar, (-13, 1))
+    assert not mask.overlaps(bar, (-15, 0))
+    assert not mask.overlaps(bar, (-16, 1))
+
+def test_overlaps_outside() -> None:
+    mask = create_mask(["####", "####"])
+    other = create_mask(["##", "##"])
+
+    assert mask.overlaps(other, (-1, -1))
+    assert mask.overlaps(other, (3, 1))
+    assert not mask.overlaps(other, (4, 0))
+    assert not mask.overlaps(other, (-2, 0))
+    assert not mask.overlaps(other, (0, 2))
+    assert not mask.overlaps(other, (0, -2))
+
+def test_overlaps_rect() -> None:
+    mask = create_mask([
+        "..........",
+        ".........#"
+    ])
+
+    assert mask.overlaps_rect((9, 1, 10, 2))
+    assert mask.overlaps_rect((5, 0, 20, 20)) # clipped to the mask
+    assert not mask.overlaps_rect((0, 0, 9, 2))
+    assert not mask.overlaps_rect((0, 0, 10, 1))
@@ -0,0 +1,107 @@
+from modules import entity, level, level_data
+
+
+def test_grid_map() -> None:
+    grid_map = level.GridMap((3, 2))
+
+    assert grid_map.rows == {} # nothing is allocated before the first access
+    assert len(grid_map) == 2 and len(grid_map[0]) == 3
+
+    grid_map[1][2] += ["entity"]
+    assert grid_map[1][2] == ["entity"]
+    assert grid_map[-1][-1] == ["entity"] # negative indexes, like lists
+
+    grid_map[0][1] = ["other"]
+    assert [list(row) for row in grid_map] == [[(), ["other"], ()], [(), (), ["entity"]]]
+
+    for index in (3, -4):
+        try: grid_map[0][index]
+        except IndexError: continue
+
+        assert False, "IndexError not raised"
+
+def test_initialize_from_data(tmp_path: object) -> None:
+    data = level_data.LevelData((400, 300), (16, 16))
+    data.set_wall((399, 299))
+    data.set_tile((1, 2), "grass")
+
+    path = str(tmp_path / "level.infl")
+    level_data.save_level_data(path, data)
+
+    level_object = object.__new__(level.Level)
+    level_object.initialize_from_data(None, path)
+
+    assert level_object.grid_dimensions == (400, 300)
+    assert level_object.world_size == (6400, 4800)
+    assert level_object.walls_map[299][399] == 1 and level_object.walls_map[0][0] == 0
+    assert level_object.tiles_map[2][1] == 1
+    assert level_object.grid_map.rows == {}
+
+    level_object.init_data()
+    assert len(level_object.grid_map) == 300
+
+class StubSprite:
+    """Sprite of the entities of the find tests, hidden when they're destroyed."""
+
+    type = "sprite"
+
+    def hide(self, keep_item: bool = False) -> None:
+        pass
+
+def create_level() -> object:
+    level_object = object.__new__(level.Level)
+    level_object.initialize(None, (10, 10), (16, 16))
+    level_object.world.register_component("body", {"x": "d"})
+
+    return level_object
+
+def create_entity(level_object: object, *tags: str) -> object:
+    entity_ref = entity.Entity(level_object, (0, 0))
+    entity_ref.sprite = StubSprite()
+    entity_ref.add_tag(*tags)
+
+    return entity_ref
+
+def test_find() -> None:
+    level_object = create_level()
+
+    enemy, projectile, both = create_entity(level_object, "enemy"), create_entity(level_object, "projectile"), create_entity(level_object, "enemy", "projectile")
+    sprite_ref = StubSprite()
+    level_object.add_objects([enemy, projectile, both, sprite_ref])
+    both.add_component("body", x = 1)
+
+    assert level_object.find("entity") == [enemy, projectile, both]
+    assert level_object.find("sprite") == [sprite_ref]
+    assert level_object.find(tag = "enemy") == [enemy, both]
+    assert level_object.find("entity", "projectile", ("body",)) == [both]
+    assert level_object.find(tag = "unknown") == []
+    assert level_object.find() == [enemy, projectile, both, sprite_ref]
+
+def test_find_after_retag() -> None:
+    level_object = create_level()
+
+    entity_ref = create_entity(level_object, "enemy")
+    level_object.add_objects([entity_ref])
+
+    entity_ref.remove_tag("enemy")
+    entity_ref.add_tag("ally")
+
+    assert level_object.find(tag = "enemy") == []
+    assert level_object.find(tag = "ally") == [entity_ref]
+    assert not "enemy" in level_object.objects_by_tag # empty tags are removed
+
+def test_find_after_destroy() -> None:
+    level_object = create_level()
+
+    destroyed, kept = create_entity(level_object, "enemy"), create_entity(level_object, "enemy")
+    level_object.add_objects([destroyed, kept])
+    destroyed.add_component("body")
+
+    destroyed.destroy()
+
+    assert level_object.find("entity") == [kept]
+    assert level_object.find(tag = "enemy") == [kept]
+    assert level_object.find(components = ("body",)) == []
+
+    destroyed.add_tag("projectile") # tags of an object that isn't indexed aren't indexed
+    assert level_object.find(tag = "projectile") == []
@@ -0,0 +1,71 @@
+from modules import level_data
+
+
+def create_level_data() -> object:
+    data = level_data.LevelData((5, 3), (32, 32))
+
+    data.set_wall((0, 0))
+    data.set_wall((4, 2))
+    data.set_tile((1, 0), "grass")
+    data.set_tile((2, 1), "rock")
+    data.set_tile((3, 2), "grass")
+    data.add_spawn("player", "hero", (2, 2))
+    data.add_spawn("enemy", "slime", (4, 0))
+
+    return data
+
+def check_round_trip(tmp_path: object, use_mmap: bool) -> None:
+    data = create_level_data()
+
+    path = str(tmp_path / "level.infl")
+    level_data.save_level_data(path, data)
+    loaded = level_data.load_level_data(path, use_mmap)
+
+    assert loaded.grid_dimensions == (5, 3)
+    assert loaded.tile_scale == (32, 32)
+    assert loaded.names == data.names
+    assert bytes(loaded.walls) == bytes(data.walls)
+    assert list(loaded.tiles) == list(data.tiles)
+    assert loaded.get_spawns() == [("player", "hero", (2, 2)), ("enemy", "slime", (4, 0))]
+
+    rows = loaded.get_rows(loaded.walls)
+    assert rows[0][0] == 1 and rows[2][4] == 1 and rows[1][1] == 0
+
+    loaded.release()
+
+def test_round_trip_mmap(tmp_path: object) -> None:
+    check_round_trip(tmp_path, True)
+
+def test_round_trip_read(tmp_path: object) -> None:
+    check_round_trip(tmp_path, False)
+
+def test_loaded_walls_are_writable(tmp_path: object) -> None:
+    """The file is mapped copy on write: the level modifies its walls without modifying the file."""
+
+    path = str(tmp_path / "level.infl")
+    level_data.save_level_data(path, create_level_data())
+
+    loaded = level_data.load_level_data(path)
+    loaded.walls[1] = 1
+    loaded.release()
+
+    assert level_data.load_level_data(path, False).walls[1] == 0
+
+def test_empty_level(tmp_path: object) -> None:
+    path = str(tmp_path / "empty.infl")
+    level_data.save_level_data(path, level_data.LevelData((2, 2), (16, 16)))
+
+    loaded = level_data.load_level_data(path, False)
+
+    assert loaded.names == []
+    assert loaded.get_spawns() == []
+    assert list(loaded.tiles) == [0, 0, 0, 0]
+
+def test_invalid_file(tmp_path: object) -> None:
+    path = tmp_path / "invalid.infl"
+    path.write_bytes(b"\0" * 64)
+
+    try: level_data.load_level_data(str(path), False)
+    except ValueError: return
+
+    assert False, "ValueError not raised"
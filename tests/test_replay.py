@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+from modules import replay
+
+
+def test_round_trip(tmp_path: object) -> None:
+    path = str(tmp_path / "session.jsonl")
+
+    recorder = replay.Recorder(path, (800, 600))
+
+    recorder.begin_frame(0.05)
+    recorder.record_event("window", "<KeyPress>", SimpleNamespace(keysym = "a", keycode = 65, x = 0, state = None))
+    recorder.record_event("main_canvas", "<Button-1>", SimpleNamespace(x = 10, y = 20, num = 1, widget = object()))
+    recorder.end_frame()
+
+    recorder.begin_frame(0.06)
+    recorder.end_frame()
+    recorder.close()
+
+    replayer = replay.Replayer(path)
+
+    assert replayer.frame_size == (800, 600)
+    assert replayer.clock.now() == 0
+
+    dt, events = replayer.next_frame()
+    assert dt == 0.05
+    assert [(target, command) for target, command, event in events] == [("window", "<KeyPress>"), ("main_canvas", "<Button-1>")]
+    assert vars(events[0][2]) == {"keysym": "a", "keycode": 65, "x": 0} # attributes that aren't numbers/str are dropped
+    assert vars(events[1][2]) == {"x": 10, "y": 20, "num": 1}
+    assert replayer.clock.now() == 0.05
+
+    dt, events = replayer.next_frame()
+    assert (dt, events) == (0.06, [])
+    assert abs(replayer.clock.now() - 0.11) < 1e-9
+
+    assert replayer.is_finished()
+    assert replayer.next_frame() is None
+
+def test_event_between_frames(tmp_path: object) -> None:
+    """An event waking the idle game is handled after end_frame, it's written with the next frame."""
+
+    path = str(tmp_path / "session.jsonl")
+
+    recorder = replay.Recorder(path, (800, 600))
+
+    recorder.begin_frame(0.05)
+    recorder.end_frame()
+
+    recorder.record_event("main_canvas", "<Button-1>", SimpleNamespace(x = 1, y = 2))
+
+    recorder.begin_frame(3.0)
+    recorder.end_frame()
+    recorder.close()
+
+    replayer = replay.Replayer(path)
+
+    assert replayer.next_frame() == (0.05, [])
+
+    dt, events = replayer.next_frame()
+    assert dt == 3.0
+    assert [(target, command, vars(event)) for target, command, event in events] == [("main_canvas", "<Button-1>", {"x": 1, "y": 2})]
+
+def test_unsupported_version(tmp_path: object) -> None:
+    path = tmp_path / "session.jsonl"
+    path.write_text("{\"version\": 0, \"frame_size\": [1, 1]}\n")
+
+    try: replay.Replayer(str(path))
+    except ValueError: return
+
+    assert False, "ValueError not raised"
+
+def test_frame_stats() -> None:
+    stats = replay.FrameStats(budget = 0.05)
+
+    assert stats.get_summary() == {"frames": 0}
+
+    for duration in (0.01, 0.02, 0.03, 0.1):
+        stats.add(duration)
+
+    summary = stats.get_summary()
+    assert summary["frames"] == 4
+    assert summary["over_budget"] == 1
+    assert abs(summary["max_ms"] - 100) < 1e-9
@@ -0,0 +1,100 @@
+import json
+from time import sleep
+
+import pytest
+
+from infold import settings
+
+
+@pytest.fixture
+def settings_file(tmp_path: object, monkeypatch: object) -> object:
+    """Points the settings module to a temporary file, with short delays."""
+
+    path = tmp_path / "settings.json"
+    saved_settings = dict(settings.current_settings)
+
+    monkeypatch.setattr(settings, "settings_path", str(path))
+    monkeypatch.setattr(settings, "save_delay", 0.05)
+    monkeypatch.setattr(settings, "save_max_delay", 0.2)
+    monkeypatch.setattr(settings, "save_retry_delay", 0.01)
+
+    yield path
+
+    settings.flush_settings() # nothing is left for the exit's flush, which would write the real file
+    settings.current_settings.clear()
+    settings.current_settings.update(saved_settings)
+
+def count_writes(monkeypatch: object) -> list:
+    """Returns the list of the written data, filled by the writer thread."""
+
+    writes = []
+    write_settings_file = settings.write_settings_file
+
+    def write(data: str) -> None:
+        writes.append(data)
+        write_settings_file(data)
+
+    monkeypatch.setattr(settings, "write_settings_file", write)
+
+    return writes
+
+def test_migration(settings_file: object) -> None:
+    settings_file.write_text(json.dumps({"language": "EN", "username": "player"}))
+
+    settings.read_settings()
+    settings.flush_settings()
+
+    assert settings.current_settings["version"] == settings.settings_version
+    assert settings.current_settings["language"] == "EN" # kept
+    assert settings.current_settings["progression"] == settings.settings_base["progression"] # added
+
+    assert json.loads(settings_file.read_text()) == settings.current_settings
+
+def test_corrupted_file(settings_file: object) -> None:
+    settings_file.write_text("{")
+
+    settings.read_settings()
+    settings.flush_settings()
+
+    assert settings.current_settings == settings.settings_base
+    assert json.loads(settings_file.read_text()) == settings.settings_base
+
+def test_debounce(settings_file: object, monkeypatch: object) -> None:
+    writes = count_writes(monkeypatch)
+
+    for value in range(5): # a burst of changes is written once
+        settings.current_settings["username"] = str(value)
+        settings.save_settings()
+        sleep(0.01)
+
+    sleep(0.2)
+
+    assert len(writes) == 1
+    assert json.loads(settings_file.read_text())["username"] == "4"
+
+def test_max_delay(settings_file: object, monkeypatch: object) -> None:
+    writes = count_writes(monkeypatch)
+
+    for _ in range(25): # changes never stop for save_delay, they're written every save_max_delay
+        settings.save_settings()
+        sleep(0.02)
+
+    assert len(writes) >= 2
+
+def test_failed_write_is_retried(settings_file: object, monkeypatch: object) -> None:
+    writes = count_writes(monkeypatch)
+    write = settings.write_settings_file
+
+    def failing_write(data: str) -> None:
+        monkeypatch.setattr(settings, "write_settings_file", write) # only the first write fails
+        raise OSError("disk full")
+
+    monkeypatch.setattr(settings, "write_settings_file", failing_write)
+
+    settings.current_settings["username"] = "retried"
+    settings.save_settings()
+    sleep(0.3)
+
+    assert settings.writer_thread.is_alive()
+    assert len(writes) == 1
+    assert json.loads(settings_file.read_text())["username"] == "retried"
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+from modules import snapshot
+
+
+class StateObject:
+    """Object with a state, as the entities/sprites of a level."""
+
+    type = "entity"
+
+    def __init__(self, id: int, state: tuple) -> None:
+        self.id = id
+        self.state = state
+        self.set_state_calls = 0
+
+    def get_state(self) -> tuple:
+        return self.state
+
+    def set_state(self, state: tuple) -> None:
+        self.state = state
+        self.set_state_calls += 1
+
+def create_level() -> object:
+    objects = [StateObject(1, (0, 0)), StateObject(2, (5, 5)), StateObject(3, (9, 9))]
+
+    grid_map = [[[], []], [[], []]]
+    grid_map[0][0] = [objects[0]]
+    grid_map[1][1] = [objects[1], objects[2]]
+
+    walls_map = [[False, True], [False, False]]
+
+    return SimpleNamespace(objects = objects, grid_map = grid_map, walls_map = walls_map)
+
+def test_delta_contains_changes() -> None:
+    level = create_level()
+    base = snapshot.take_snapshot(level)
+
+    level.objects[0].state = (1, 0)
+    level.grid_map[0][0] = []
+    level.grid_map[0][1] = [level.objects[0]]
+    level.walls_map[1] = [True, False]
+
+    delta = snapshot.take_snapshot(level, base)
+
+    assert delta.base is base
+    assert delta.objects == {("entity", 1): (1, 0)}
+    assert delta.grid == {(0, 0): None, (1, 0): (("entity", 1),)}
+    assert delta.walls == {1: bytes([1, 0])}
+
+def test_delta_apply() -> None:
+    level = create_level()
+    base = snapshot.take_snapshot(level)
+
+    level.objects[0].state = (1, 0)
+    level.grid_map[0][0] = []
+    level.grid_map[0][1] = [level.objects[0]]
+    level.walls_map[0] = [True, True]
+    delta = snapshot.take_snapshot(level, base)
+
+    level.objects[0].state = (7, 7)
+    level.objects[2].state = (3, 3)
+    level.grid_map[0][1] = []
+    level.grid_map[1][0] = [level.objects[2]]
+    level.walls_map[0] = [False, False]
+
+    snapshot.restore_snapshot(level, delta)
+
+    assert [obj.state for obj in level.objects] == [(1, 0), (5, 5), (9, 9)]
+    assert level.objects[1].set_state_calls == 0 # unchanged objects aren't restored
+    assert level.grid_map == [[[], [level.objects[0]]], [[], [level.objects[1], level.objects[2]]]]
+    assert level.walls_map[0] == [True, True]
+
+    snapshot.restore_snapshot(level, base)
+
+    assert [obj.state for obj in level.objects] == [(0, 0), (5, 5), (9, 9)]
+    assert level.grid_map[0] == [[level.objects[0]], []]
+    assert level.walls_map[0] == [False, True]
+
+def test_chained_deltas() -> None:
+    level = create_level()
+    base = snapshot.take_snapshot(level)
+
+    level.objects[1].state = (6, 5)
+    first = snapshot.take_snapshot(level, base)
+
+    level.objects[1].state = (7, 5)
+    level.objects[2].state = (8, 8)
+    second = snapshot.take_snapshot(level, first)
+
+    objects, grid, walls = second.resolve()
+    assert objects == {("entity", 1): (0, 0), ("entity", 2): (7, 5), ("entity", 3): (8, 8)}
+
+    loaded = snapshot.loads(second.dumps())
+    assert loaded.resolve() == second.resolve()
+
+def test_destroyed_objects_are_skipped() -> None:
+    level = create_level()
+    base = snapshot.take_snapshot(level)
+
+    removed = level.objects.pop()
+    level.grid_map[1][1] = [level.objects[1]]
+    level.objects[0].state = (4, 4)
+
+    snapshot.restore_snapshot(level, base)
+
+    assert level.objects[0].state == (0, 0)
+    assert level.grid_map[1][1] == [level.objects[1]]
+    assert removed.set_state_calls == 0
@@ -0,0 +1,25 @@
+import os
+from types import SimpleNamespace
+
+from modules import thumbnails
+
+
+def test_level_hash_is_memoized(tmp_path: object) -> None:
+    level_file = tmp_path / "LTest.py"
+    level_file.write_text("level = 1")
+
+    generator = thumbnails.ThumbnailGenerator(SimpleNamespace(), str(tmp_path / "cache"))
+    generator.levels_path = str(tmp_path)
+
+    first_path = generator.get_thumbnail_path("LTest")
+    generator.hashes[str(level_file)] = (os.stat(level_file).st_mtime_ns, "cached") # the file isn't read again
+
+    assert generator.get_thumbnail_path("LTest") != first_path
+    assert "_cached_" in generator.get_thumbnail_path("LTest")
+
+    level_file.write_text("level = 2")
+    os.utime(level_file, ns = (0, 1)) # modified: hashed again
+
+    second_path = generator.get_thumbnail_path("LTest")
+    assert not "_cached_" in second_path
+    assert second_path != first_path
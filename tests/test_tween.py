@@ -0,0 +1,66 @@
+from modules import sprite
+from modules.tween import TweenEngine
+
+
+class StubSprite:
+    def __init__(self) -> None:
+        self.global_pos = (0, 0)
+        self.scale = (10, 10)
+        self.displacement = (0, 0)
+        self.moves = 0
+        self.updates = 0
+
+    def move(self, pos: tuple, queued: bool = True) -> None:
+        self.moves += 1
+
+    def change_image(self) -> None:
+        self.updates += 1
+
+def test_step_removes_finished_tweens() -> None:
+    engine = TweenEngine()
+    sprites = [StubSprite() for _ in range(5)]
+    finished = []
+
+    for index, sprite_ref in enumerate(sprites):
+        duration = 1 if index % 2 == 0 else 3 # the 1st, 3rd and 5th tweens end at the first step
+        engine.add(sprite_ref, "pos", (100, 100 + index), duration, callback = lambda index = index: finished.append(index))
+
+    engine.step(1)
+
+    assert sorted(finished) == [0, 2, 4]
+    assert len(engine) == 2
+    assert sorted(engine.indexes[(sprite_ref, "pos")] for sprite_ref in (sprites[1], sprites[3])) == [0, 1]
+    assert [sprite_ref.global_pos for sprite_ref in sprites[::2]] == [(100, 100), (100, 102), (100, 104)]
+
+    engine.step(2) # the remaining tweens were moved in the removed ones' places and still progress
+
+    assert sorted(finished) == [0, 1, 2, 3, 4]
+    assert len(engine) == 0
+    assert sprites[3].global_pos == (100, 103)
+
+def test_single_update_per_sprite() -> None:
+    engine = TweenEngine()
+    sprite_ref = StubSprite()
+
+    engine.add(sprite_ref, "pos", (10, 10), 2)
+    engine.add(sprite_ref, "scale", (20, 20), 2)
+    engine.step(1)
+
+    assert sprite_ref.global_pos == (5, 5)
+    assert sprite_ref.scale == (15, 15)
+    assert (sprite_ref.moves, sprite_ref.updates) == (1, 1)
+
+def test_replace_and_cancel() -> None:
+    engine = TweenEngine()
+    sprite_ref = StubSprite()
+
+    engine.add(sprite_ref, "pos", (10, 0), 1)
+    engine.add(sprite_ref, "pos", (0, 10), 1) # replaces the previous one
+    assert len(engine) == 1
+
+    engine.step(0.5)
+    assert sprite_ref.global_pos == (0, 5)
+
+    engine.cancel(sprite_ref)
+    engine.step(0.5)
+    assert len(engine) == 0 and sprite_ref.global_pos == (0, 5)
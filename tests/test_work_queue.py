@@ -0,0 +1,70 @@
+from time import sleep
+
+from modules import work_queue
+
+
+def test_priority_order() -> None:
+    calls = []
+    first, second = work_queue.WorkQueue(), work_queue.WorkQueue()
+
+    first.add(lambda: calls.append("first background"), "background")
+    first += [lambda: calls.append("first render")]
+    second.add(lambda: calls.append("second load"), "load")
+    second.add(lambda: calls.append("second input"), "input")
+    first.add(lambda: calls.append("first input"), "input")
+
+    assert work_queue.execute([first, second], 1) == 5
+    assert calls == ["first input", "second input", "first render", "second load", "first background"]
+    assert len(first) == 0 and len(second) == 0
+
+def test_budget() -> None:
+    calls = []
+    queue = work_queue.WorkQueue()
+
+    for index in range(3):
+        queue.add(lambda index = index: (calls.append(index), sleep(0.01)), "render")
+    queue.add(lambda: calls.append("input"), "input")
+
+    # the input functions are executed even once the budget is exceeded, the other ones wait
+    assert work_queue.execute([queue], 0) == 1
+    assert calls == ["input"]
+
+    assert work_queue.execute([queue], 0) == 1 # at least one function per call
+    assert calls == ["input", 0]
+
+    assert work_queue.execute([queue], 1) == 2
+    assert calls == ["input", 0, 1, 2]
+
+def test_snapshot() -> None:
+    """Functions queued by the executed ones wait for the next call."""
+
+    calls = []
+    queue = work_queue.WorkQueue()
+
+    def queue_more():
+        calls.append("queued")
+        queue.add(lambda: calls.append("input"), "input")
+        queue.add(lambda: calls.append("render"), "render")
+
+    queue.add(queue_more, "input")
+
+    assert work_queue.execute([queue], 1) == 1
+    assert calls == ["queued"]
+    assert len(queue) == 2
+
+    assert work_queue.execute([queue], 1) == 2
+    assert calls == ["queued", "input", "render"]
+
+def test_wake_callback() -> None:
+    wakes = []
+    queue = work_queue.WorkQueue("load", lambda: wakes.append(True))
+
+    queue += [lambda: None]
+    queue.add(lambda: None)
+
+    assert len(wakes) == 2
+    assert queue.count("load") == 2
+    assert queue.pop("input") is None
+
+    queue.clear()
+    assert len(queue) == 0